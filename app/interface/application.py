@@ -16,6 +16,13 @@ class FramesPort(Protocol):
     cur_frame: int
     playing: bool
     frame_cache_radius: int
+    frame_cache_max_mb: int
+    frame_decode_backend: str
+    frame_decode_workers: int
+    frame_proxy_store: str
+    frame_mipmaps: bool
+    frame_build_proxies: bool
+    frame_open_videos_directly: bool
 
     def set_frame(self, frame: int) -> int: ...
 
@@ -1,14 +1,21 @@
 import threading
 from collections import defaultdict
 from enum import Enum, auto
-from typing import Any, Callable, Protocol
+from typing import TYPE_CHECKING, Any, Callable, Protocol
 
 from app.interface.music import SongMetadata
 from app.interface.sequences import SequenceState
 
+if TYPE_CHECKING:
+    from utils.video_frame_source import VideoFrameIndex
+
 
 class Event(Enum):
     FramesLoaded = auto()
+    FramesExtracting = auto()
+    VideoIndexed = auto()
+    MediaLoadProgress = auto()
+    MediaLoadFinished = auto()
     SongIdentified = auto()
     SequencesChanged = auto()
     DetectionsUpdated = auto()
@@ -18,6 +25,21 @@ class Event(Enum):
 class EventsListener(Protocol):
     def on_frames_loaded(self, path: str) -> None: ...
 
+    def on_frames_extracting(self, path: str, available_frames: int, total_frames: int) -> None:
+        """Frames [0, available_frames) of ``path`` are on disk; FramesLoaded follows when done.
+
+        ``available_frames == 0`` means the extraction stopped without producing a sequence.
+        """
+        ...
+
+    def on_video_indexed(self, video_path: str, index: "VideoFrameIndex") -> None:
+        """The keyframe index of a video being loaded is ready, before its extraction starts."""
+        ...
+
+    def on_media_load_progress(self, path: str, percent: int) -> None: ...
+
+    def on_media_load_finished(self, path: str) -> None: ...
+
     def on_song_identified(self, song: SongMetadata) -> None: ...
 
     def on_sequences_changed(self, state: "SequenceState") -> None: ...
@@ -108,6 +130,10 @@ class EventBus:
 
     def connect(self, listener: EventsListener) -> None:
         self.on(Event.FramesLoaded, listener.on_frames_loaded)
+        self.on(Event.FramesExtracting, listener.on_frames_extracting)
+        self.on(Event.VideoIndexed, listener.on_video_indexed)
+        self.on(Event.MediaLoadProgress, listener.on_media_load_progress)
+        self.on(Event.MediaLoadFinished, listener.on_media_load_finished)
         self.on(Event.SongIdentified, listener.on_song_identified)
         self.on(Event.SequencesChanged, listener.on_sequences_changed)
         self.on(Event.DetectionsUpdated, listener.on_detections_updated)
@@ -115,6 +141,10 @@ class EventBus:
 
     def disconnect(self, listener: EventsListener) -> None:
         self.off(Event.FramesLoaded, listener.on_frames_loaded)
+        self.off(Event.FramesExtracting, listener.on_frames_extracting)
+        self.off(Event.VideoIndexed, listener.on_video_indexed)
+        self.off(Event.MediaLoadProgress, listener.on_media_load_progress)
+        self.off(Event.MediaLoadFinished, listener.on_media_load_finished)
         self.off(Event.SongIdentified, listener.on_song_identified)
         self.off(Event.SequencesChanged, listener.on_sequences_changed)
         self.off(Event.DetectionsUpdated, listener.on_detections_updated)
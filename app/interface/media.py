@@ -9,3 +9,13 @@ class MediaPort(Protocol):
         on_progress: Callable[[int], None] | None = None,
         should_cancel: Callable[[], bool] | None = None,
     ) -> None: ...
+
+    def load_in_background(self, path: str) -> None:
+        """Load ``path`` on a worker thread, canceling any load still running.
+
+        Progress arrives as Event.MediaLoadProgress and the end of the load,
+        successful or not, as Event.MediaLoadFinished.
+        """
+        ...
+
+    def cancel_load(self) -> None: ...
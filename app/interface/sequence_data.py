@@ -47,3 +47,7 @@ class SequenceDataPort(Protocol):
     def previous_bookmark_frame(self, frames_folder_path: str, current_frame: int) -> int | None: ...
 
     def next_bookmark_frame(self, frames_folder_path: str, current_frame: int) -> int | None: ...
+
+    def flush(self) -> None:
+        """Write changes still waiting to be saved."""
+        ...
@@ -1,6 +1,8 @@
 from dataclasses import dataclass
 from typing import Protocol
 
+import numpy as np
+
 
 @dataclass(frozen=True)
 class BoundingBox:
@@ -45,3 +47,19 @@ class TrackDetectorPort(Protocol):
     def load_detections(self, frames_folder_path: str) -> None: ...
 
     def detections_for_frame(self, frame_index: int) -> list[PersonDetection]: ...
+
+    def detection_boxes_for_frame(self, frame_index: int) -> tuple[np.ndarray, np.ndarray]:
+        """(N x 4 relative boxes as x, y, width, height; N confidences) of a frame.
+
+        Views into the loaded detections, valid until ``detections_revision``
+        changes; callers must not modify them.
+        """
+        ...
+
+    def detections_revision(self) -> int:
+        """Changes whenever the loaded detections change."""
+        ...
+
+    def flush(self) -> None:
+        """Save detections still waiting to be merged into the sequence's detections file."""
+        ...
@@ -1,7 +1,10 @@
 import shutil
+import threading
 from collections.abc import Callable
 from pathlib import Path
 
+import numpy as np
+
 from app.interface.event_bus import EventBus, Event
 from app.interface.music import MusicPort, SongMetadata, SongStatus
 from app.interface.sequence_data import Bookmark, SequenceDataPort
@@ -13,12 +16,61 @@ from app.track_app.sections.video_manager.manager import VIDEO_SUFFIXES
 from app.track_app.sections.video_manager.sequence_data_service import SequenceDataService
 from app.track_app.sections.video_manager.sequence_metadata_store import SequenceMetadataStore
 from app.track_app.sections.video_manager import sequence_file_store
+from utils.proxy_atlas import ATLAS_FILE_NAME
+from utils.video_frame_source import load_video_index, video_index_path
 
 
 class MediaAdapter:
     def __init__(self, app: DanceTrackerApp, events: EventBus):
         self._app = app
         self._events = events
+        self._load_lock = threading.Lock()
+        self._load_thread: threading.Thread | None = None
+        self._load_cancel: threading.Event | None = None
+
+    def load_in_background(self, path: str) -> None:
+        """Run ``load`` on a worker thread; a newer load cancels and then waits for the previous one.
+
+        Progress and completion are emitted on the event bus, whose
+        dispatcher delivers them on the listener's thread.
+        """
+        with self._load_lock:
+            if self._load_cancel is not None:
+                self._load_cancel.set()
+            cancel = threading.Event()
+            thread = threading.Thread(
+                target=self._load_worker,
+                args=(path, cancel, self._load_thread),
+                name="media-load",
+                daemon=True,
+            )
+            self._load_cancel = cancel
+            self._load_thread = thread
+        thread.start()
+
+    def cancel_load(self) -> None:
+        with self._load_lock:
+            if self._load_cancel is not None:
+                self._load_cancel.set()
+
+    def _load_worker(self, path: str, cancel: threading.Event, previous: threading.Thread | None) -> None:
+        if previous is not None:
+            previous.join()
+        last_percent = -1
+
+        def on_progress(percent: int) -> None:
+            nonlocal last_percent
+            if percent != last_percent:
+                last_percent = percent
+                self._events.emit(Event.MediaLoadProgress, path, percent)
+
+        try:
+            if not cancel.is_set():
+                self.load(path, on_progress=on_progress, should_cancel=cancel.is_set)
+        except Exception as err:
+            print(f"Error loading {path}: {err}")
+        finally:
+            self._events.emit(Event.MediaLoadFinished, path)
 
     def load(
         self,
@@ -33,7 +85,9 @@ class MediaAdapter:
             return
 
         if self._app.video_manager.is_video(path):
-            self._identify_song(path)
+            self._identify_song_in_background(path, should_cancel)
+            if self._app.states_manager.config.frame_open_videos_directly:
+                self._index_video(path, should_cancel)
             path = self._extract_video(path, on_progress=on_progress, should_cancel=should_cancel)
 
         if not path:
@@ -45,6 +99,16 @@ class MediaAdapter:
 
         self._events.emit(Event.FramesLoaded, path)
 
+    def _index_video(self, path: str, should_cancel: Callable[[], bool] | None = None) -> None:
+        """Build (or read) the keyframe index here so the UI can open the video without scanning it."""
+        try:
+            index = load_video_index(path)
+        except (OSError, ValueError) as err:
+            print(f"Cannot index {path}: {err}")
+            return
+        if should_cancel is None or not should_cancel():
+            self._events.emit(Event.VideoIndexed, path, index)
+
     def _resolve_input_path(self, path: str) -> str | None:
         """Pure path resolution: returns the frames dir or video path to load, no side effects."""
         if not SequenceMetadataStore.is_sequence_metadata(path):
@@ -68,7 +132,22 @@ class MediaAdapter:
 
         return None
 
-    def _identify_song(self, video_path: str) -> None:
+    def _identify_song_in_background(
+        self, video_path: str, should_cancel: Callable[[], bool] | None = None
+    ) -> None:
+        """Identify the song alongside extraction; the result arrives later as Event.SongIdentified.
+
+        The result of a load canceled in the meantime is dropped, so a slow
+        lookup cannot overwrite the song of a newer load.
+        """
+        threading.Thread(
+            target=self._identify_song,
+            args=(video_path, should_cancel),
+            name="song-identify",
+            daemon=True,
+        ).start()
+
+    def _identify_song(self, video_path: str, should_cancel: Callable[[], bool] | None = None) -> None:
         try:
             song = self._app.music_identifier.identify_from_video(video_path)
         except Exception as err:
@@ -77,6 +156,8 @@ class MediaAdapter:
                 provider="music_identifier",
                 message=f"Error identifying song: {err}",
             )
+        if should_cancel is not None and should_cancel():
+            return
         self._events.emit(Event.SongIdentified, song)
 
     def _extract_video(
@@ -85,12 +166,22 @@ class MediaAdapter:
         on_progress: Callable[[int], None] | None = None,
         should_cancel: Callable[[], bool] | None = None,
     ) -> str | None:
+        extracting_path: str | None = None
+
+        def on_frames_available(frames_path: str, available_frames: int, total_frames: int) -> None:
+            nonlocal extracting_path
+            extracting_path = frames_path
+            self._events.emit(Event.FramesExtracting, frames_path, available_frames, total_frames)
+
         result = self._app.video_manager.extract_frames(
             path,
             on_progress=on_progress,
             should_cancel=should_cancel,
+            on_frames_available=on_frames_available,
         )
         if not result:
+            if extracting_path is not None:
+                self._events.emit(Event.FramesExtracting, extracting_path, 0, 0)
             return None
 
         frames_path, video_info = result
@@ -132,21 +223,15 @@ class MusicAdapter:
         if not frames_folder.is_dir():
             return None
 
-        for metadata_path in sorted(frames_folder.parent.glob("*.dance_tracker.json")):
-            metadata = SequenceMetadataStore.read(str(metadata_path))
-            if not metadata:
-                continue
-
-            frames_value = metadata.get("frames") or metadata.get("frames_path")
-            resolved_frames = sequence_file_store.resolve_path(frames_value, metadata_path.parent)
-            if resolved_frames != frames_folder:
-                continue
-
-            video_value = sequence_file_store.video_path_from_metadata(metadata)
-            resolved_video = sequence_file_store.resolve_path(video_value, metadata_path.parent)
-            if resolved_video and self._app.video_manager.is_video(str(resolved_video)):
-                return str(resolved_video)
+        metadata_path = sequence_file_store.find_metadata_for_frames(frames_folder)
+        metadata = sequence_file_store.read(metadata_path) if metadata_path is not None else None
+        if not metadata:
+            return None
 
+        video_value = sequence_file_store.video_path_from_metadata(metadata)
+        resolved_video = sequence_file_store.resolve_path(video_value, metadata_path.parent)
+        if resolved_video and self._app.video_manager.is_video(str(resolved_video)):
+            return str(resolved_video)
         return None
 
 
@@ -212,7 +297,10 @@ class SequencesAdapter:
             if legacy_low_frames.is_dir():
                 shutil.rmtree(legacy_low_frames, ignore_errors=True)
 
+            (folder.parent / ATLAS_FILE_NAME).unlink(missing_ok=True)
+
         if video_file and video_file.exists():
+            video_index_path(video_file).unlink(missing_ok=True)
             video_file.unlink(missing_ok=True)
 
         self.remove(folder_path)
@@ -285,6 +373,34 @@ class FramesAdapter:
     def frame_cache_radius(self) -> int:
         return self._state.config.frame_cache_radius
 
+    @property
+    def frame_cache_max_mb(self) -> int:
+        return self._state.config.frame_cache_max_mb
+
+    @property
+    def frame_decode_backend(self) -> str:
+        return self._state.config.frame_decode_backend
+
+    @property
+    def frame_decode_workers(self) -> int:
+        return self._state.config.frame_decode_workers
+
+    @property
+    def frame_proxy_store(self) -> str:
+        return self._state.config.frame_proxy_store
+
+    @property
+    def frame_mipmaps(self) -> bool:
+        return self._state.config.frame_mipmaps
+
+    @property
+    def frame_build_proxies(self) -> bool:
+        return self._state.config.frame_build_proxies
+
+    @property
+    def frame_open_videos_directly(self) -> bool:
+        return self._state.config.frame_open_videos_directly
+
     def set_frame(self, frame: int) -> int:
         return self._state.set_frame(frame)
 
@@ -364,6 +480,9 @@ class SequenceDataAdapter:
     def next_bookmark_frame(self, frames_folder_path: str, current_frame: int) -> int | None:
         return self._service.next_bookmark_frame(frames_folder_path, current_frame)
 
+    def flush(self) -> None:
+        self._service.flush()
+
 
 class TrackDetectorAdapter:
     def __init__(self, app: DanceTrackerApp, events: EventBus):
@@ -391,6 +510,15 @@ class TrackDetectorAdapter:
     def detections_for_frame(self, frame_index: int) -> list[PersonDetection]:
         return self._service.detections_for_frame(frame_index)
 
+    def detection_boxes_for_frame(self, frame_index: int) -> tuple[np.ndarray, np.ndarray]:
+        return self._service.detection_boxes_for_frame(frame_index)
+
+    def detections_revision(self) -> int:
+        return self._service.detections_revision()
+
+    def flush(self) -> None:
+        self._service.flush()
+
 
 class AppAdapter:
     def __init__(self, app: DanceTrackerApp, events: EventBus, prefs: SequencePreferencesPort):
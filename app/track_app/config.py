@@ -3,6 +3,17 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Config(BaseSettings):
     frame_cache_radius: int = 25
+    frame_cache_max_mb: int = 2048
+    frame_decode_backend: str = "thread"
+    frame_decode_workers: int = 0
+    frame_proxy_store: str = "decoded"
+    frame_mipmaps: bool = True
+    frame_build_proxies: bool = True
+    frame_open_videos_directly: bool = True
+    pack_extracted_frames: bool = False
+    pack_proxy_atlas: bool = False
+    extract_workers: int = 0
+    extract_processes: int = 1
     audd_api_token: str = ""
     audio_sample_seconds: int = 20
     max_recent_folders: int = 5
@@ -20,7 +20,13 @@ class DanceTrackerApp:
     def __init__(self, cfg: Config):
         self.cfg = cfg
         self.states_manager = ReviewState(total_frames=1200, fps=30, layers=default_layers(), config=cfg)
-        self.video_manager = VideoManager()
+        self.video_manager = VideoManager(
+            pack_frames=cfg.pack_extracted_frames,
+            workers=cfg.extract_workers,
+            processes=cfg.extract_processes,
+            mipmaps=cfg.frame_mipmaps,
+            proxy_atlas=cfg.pack_proxy_atlas,
+        )
         self.sequence_metadata = SequenceMetadataStore()
         self.music_identifier: MusicIdentifierPort = MusicIdentifierService(
             extractor=AudioExtractor(sample_seconds=cfg.audio_sample_seconds),
@@ -0,0 +1,68 @@
+"""Append-only journal of single-frame detection updates.
+
+Layout (little endian)::
+
+    magic "DTDJOURN" | version u16 | row size u16
+    record: frame u32 | row count u32 | detector name 64s (utf-8, zero padded)
+            row count x DETECTION_DTYPE
+    record ...
+
+Each record replaces the detections of one frame; replaying the records in
+order on top of ``detections.dtdet`` gives the current detections. Appending
+costs one record whatever the sequence length, and a record cut short by a
+crash is dropped on the next read.
+"""
+import os
+import struct
+from pathlib import Path
+
+import numpy as np
+
+from app.track_app.sections.track_detector.detection_table import DETECTION_DTYPE
+
+_MAGIC = b"DTDJOURN"
+_VERSION = 1
+_HEADER = struct.Struct("<8sHH")
+_RECORD = struct.Struct("<II64s")
+
+
+def append_detection_journal(path: Path, frame_index: int, rows: np.ndarray, detector_name: str) -> None:
+    """Append one frame's rows to ``path`` and make them durable before returning."""
+    with open(path, "ab") as fh:
+        if fh.tell() == 0:
+            fh.write(_HEADER.pack(_MAGIC, _VERSION, DETECTION_DTYPE.itemsize))
+        name = detector_name.encode("utf-8")[:64]
+        fh.write(_RECORD.pack(frame_index, len(rows), name))
+        fh.write(np.ascontiguousarray(rows, dtype=DETECTION_DTYPE).tobytes())
+        fh.flush()
+        os.fsync(fh.fileno())
+
+
+def read_detection_journal(path: Path) -> tuple[list[tuple[int, np.ndarray, str]], int]:
+    """(records as (frame, rows, detector name), size of the valid prefix in bytes).
+
+    Reading stops at the first incomplete record; a missing or foreign file
+    reads as no records and a valid size of 0.
+    """
+    try:
+        data = path.read_bytes()
+    except OSError:
+        return [], 0
+    if len(data) < _HEADER.size:
+        return [], 0
+    magic, version, row_size = _HEADER.unpack_from(data, 0)
+    if magic != _MAGIC or version != _VERSION or row_size != DETECTION_DTYPE.itemsize:
+        return [], 0
+
+    records = []
+    position = _HEADER.size
+    while position + _RECORD.size <= len(data):
+        frame_index, row_count, name = _RECORD.unpack_from(data, position)
+        rows_start = position + _RECORD.size
+        rows_end = rows_start + row_count * row_size
+        if rows_end > len(data):
+            break
+        rows = np.frombuffer(data, dtype=DETECTION_DTYPE, count=row_count, offset=rows_start)
+        records.append((frame_index, rows, name.rstrip(b"\0").decode("utf-8", errors="replace")))
+        position = rows_end
+    return records, position
@@ -0,0 +1,183 @@
+"""Columnar person detections of a sequence, stored in one memory-mappable file.
+
+Layout (little endian)::
+
+    magic "DTDETECT" | version u16 | row size u16 | frame count u32
+    row count u64 | detector name 64s (utf-8, zero padded) | padding to 128 bytes
+    offsets: (frame count + 1) x i64
+    rows: row count x DETECTION_DTYPE
+
+Rows are grouped by frame in frame order; frame ``i`` owns rows
+``offsets[i]:offsets[i + 1]`` (CSR style), so a frame's detections are a
+slice of the mapped file and opening a sequence reads only the header.
+Frames without detections have an empty slice.
+"""
+import mmap
+import os
+import struct
+from pathlib import Path
+
+import numpy as np
+
+from app.interface.track_detector import BoundingBox, PersonDetection, RelativeBoundingBox
+
+DETECTIONS_FILE_NAME = "detections.dtdet"
+
+DETECTION_DTYPE = np.dtype(
+    {
+        "names": ["confidence", "relative", "pixels", "frame"],
+        "formats": ["<f8", ("<f8", (4,)), ("<i4", (4,)), "<u4"],
+        "offsets": [0, 8, 40, 56],
+        "itemsize": 64,
+    }
+)
+
+_MAGIC = b"DTDETECT"
+_VERSION = 1
+_HEADER = struct.Struct("<8sHHIQ64s")
+_DATA_OFFSET = 128
+
+
+class DetectionTable:
+    """Detections as NumPy columns plus a frame -> row offset index; treat as read-only."""
+
+    def __init__(self, rows: np.ndarray, offsets: np.ndarray, detector_name: str = ""):
+        self.rows = rows
+        self.offsets = offsets
+        self.detector_name = detector_name
+
+    @classmethod
+    def empty(cls, detector_name: str = "") -> "DetectionTable":
+        return cls(np.zeros(0, dtype=DETECTION_DTYPE), np.zeros(1, dtype=np.int64), detector_name)
+
+    @classmethod
+    def from_frames(cls, detections: dict[int, list[PersonDetection]], detector_name: str = "") -> "DetectionTable":
+        frame_count = max((idx + 1 for idx in detections if idx >= 0), default=0)
+        counts = np.zeros(frame_count, dtype=np.int64)
+        for idx, frame_detections in detections.items():
+            if idx >= 0:
+                counts[idx] = len(frame_detections)
+        offsets = np.zeros(frame_count + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+
+        rows = np.zeros(int(offsets[-1]), dtype=DETECTION_DTYPE)
+        for idx, frame_detections in detections.items():
+            if idx < 0:
+                continue
+            for row, detection in zip(range(offsets[idx], offsets[idx + 1]), frame_detections):
+                rows[row] = _to_row(idx, detection)
+        return cls(rows, offsets, detector_name)
+
+    @property
+    def frame_count(self) -> int:
+        return len(self.offsets) - 1
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def frame_rows(self, frame_index: int) -> np.ndarray:
+        """The rows of ``frame_index`` (a view, empty past the last frame)."""
+        if not 0 <= frame_index < self.frame_count:
+            return self.rows[:0]
+        return self.rows[self.offsets[frame_index] : self.offsets[frame_index + 1]]
+
+    def frame_detections(self, frame_index: int) -> list[PersonDetection]:
+        return detections_from_rows(self.frame_rows(frame_index))
+
+    def to_frames(self) -> dict[int, list[PersonDetection]]:
+        return {idx: self.frame_detections(idx) for idx in range(self.frame_count)}
+
+    def with_frames(self, frames: dict[int, np.ndarray]) -> "DetectionTable":
+        """A new table with the rows of each frame in ``frames`` replaced, in one pass."""
+        if not frames:
+            return self
+        frame_count = max(self.frame_count, max(frames) + 1)
+        counts = np.zeros(frame_count, dtype=np.int64)
+        counts[: self.frame_count] = np.diff(self.offsets)
+
+        pieces = []
+        cursor = 0
+        for frame_index in sorted(frames):
+            if frame_index < self.frame_count:
+                start, end = int(self.offsets[frame_index]), int(self.offsets[frame_index + 1])
+            else:
+                start = end = len(self.rows)
+            pieces.append(self.rows[cursor:start])
+            pieces.append(frames[frame_index])
+            counts[frame_index] = len(frames[frame_index])
+            cursor = end
+        pieces.append(self.rows[cursor:])
+
+        offsets = np.zeros(frame_count + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        return DetectionTable(np.concatenate(pieces), offsets, self.detector_name)
+
+
+def detection_rows(frame_index: int, detections: list[PersonDetection]) -> np.ndarray:
+    return np.array([_to_row(frame_index, d) for d in detections], dtype=DETECTION_DTYPE)
+
+
+def detections_from_rows(rows: np.ndarray) -> list[PersonDetection]:
+    return [_from_row(row) for row in rows]
+
+
+def write_detection_table(path: Path, table: DetectionTable) -> None:
+    """Write ``table`` to ``<path>.tmp`` and rename it into place."""
+    tmp_path = path.with_name(path.name + ".tmp")
+    name = table.detector_name.encode("utf-8")[:64]
+    with open(tmp_path, "wb") as fh:
+        fh.write(_HEADER.pack(_MAGIC, _VERSION, DETECTION_DTYPE.itemsize, table.frame_count, len(table), name))
+        fh.write(b"\0" * (_DATA_OFFSET - _HEADER.size))
+        fh.write(np.ascontiguousarray(table.offsets, dtype="<i8").tobytes())
+        fh.write(np.ascontiguousarray(table.rows, dtype=DETECTION_DTYPE).tobytes())
+    os.replace(tmp_path, path)
+
+
+def read_detection_table(path: Path) -> DetectionTable | None:
+    """Memory-map a detections file; None if it is missing or not valid."""
+    try:
+        with open(path, "rb") as fh:
+            data = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    try:
+        magic, version, row_size, frame_count, row_count, name = _HEADER.unpack_from(data, 0)
+    except struct.error:
+        data.close()
+        return None
+
+    rows_offset = _DATA_OFFSET + (frame_count + 1) * 8
+    if (
+        magic != _MAGIC
+        or version != _VERSION
+        or row_size != DETECTION_DTYPE.itemsize
+        or rows_offset + row_count * row_size > len(data)
+    ):
+        data.close()
+        return None
+
+    # The arrays keep the map alive; it is released when the table is dropped.
+    offsets = np.frombuffer(data, dtype="<i8", count=frame_count + 1, offset=_DATA_OFFSET)
+    rows = np.frombuffer(data, dtype=DETECTION_DTYPE, count=row_count, offset=rows_offset)
+    return DetectionTable(rows, offsets, name.rstrip(b"\0").decode("utf-8", errors="replace"))
+
+
+def _to_row(frame_index: int, detection: PersonDetection) -> tuple:
+    pixels = detection.bbox_pixels
+    relative = detection.bbox_relative
+    return (
+        detection.confidence,
+        (relative.x, relative.y, relative.width, relative.height),
+        (pixels.x, pixels.y, pixels.width, pixels.height),
+        frame_index,
+    )
+
+
+def _from_row(row) -> PersonDetection:
+    x, y, width, height = (float(value) for value in row["relative"])
+    px, py, pwidth, pheight = (int(value) for value in row["pixels"])
+    return PersonDetection(
+        confidence=float(row["confidence"]),
+        bbox_pixels=BoundingBox(x=px, y=py, width=pwidth, height=pheight),
+        bbox_relative=RelativeBoundingBox(x=x, y=y, width=width, height=height),
+    )
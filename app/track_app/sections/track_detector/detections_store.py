@@ -1,44 +1,149 @@
 import json
+import os
+import threading
 from dataclasses import asdict
 from pathlib import Path
 
+import numpy as np
+
 from app.interface.track_detector import BoundingBox, PersonDetection, RelativeBoundingBox
+from app.track_app.sections.track_detector.detection_journal import (
+    append_detection_journal,
+    read_detection_journal,
+)
+from app.track_app.sections.track_detector.detection_table import (
+    DETECTIONS_FILE_NAME,
+    DetectionTable,
+    read_detection_table,
+    write_detection_table,
+)
+
+# Appends and journal rotation must not interleave: a record written into a
+# journal that is already being compacted would be lost.
+_journal_lock = threading.Lock()
 
 
 class DetectionsStore:
-    """Single responsibility: read and write detections.json for a frames folder."""
+    """Single responsibility: read and write the detections of a frames folder.
+
+    Detections live in ``detections.dtdet`` (see ``detection_table``) next to
+    the frames folder, plus ``detections.dtdet.journal`` with single-frame
+    updates not yet merged into it (see ``detection_journal``). ``compact``
+    merges the journal by first renaming it to ``.compacting``, so appends
+    continue into a fresh journal meanwhile. ``detections.json`` is the
+    import/export format: it is read when no table exists yet (and
+    converted), and written on request.
+    """
+
+    @staticmethod
+    def table_path(frames_folder_path: str) -> Path:
+        return Path(frames_folder_path).expanduser().parent / DETECTIONS_FILE_NAME
+
+    @staticmethod
+    def journal_path(frames_folder_path: str) -> Path:
+        return Path(frames_folder_path).expanduser().parent / f"{DETECTIONS_FILE_NAME}.journal"
+
+    @staticmethod
+    def compacting_path(frames_folder_path: str) -> Path:
+        return Path(frames_folder_path).expanduser().parent / f"{DETECTIONS_FILE_NAME}.journal.compacting"
 
     @staticmethod
     def json_path(frames_folder_path: str) -> Path:
         return Path(frames_folder_path).expanduser().parent / "detections.json"
 
     @staticmethod
-    def write(
-        frames_folder_path: str,
-        detector_name: str,
-        detections: dict[int, list[PersonDetection]],
-    ) -> None:
+    def write(frames_folder_path: str, table: DetectionTable) -> None:
+        """Replace all detections with ``table``, dropping any journaled updates."""
+        write_detection_table(DetectionsStore.table_path(frames_folder_path), table)
+        with _journal_lock:
+            DetectionsStore.journal_path(frames_folder_path).unlink(missing_ok=True)
+            DetectionsStore.compacting_path(frames_folder_path).unlink(missing_ok=True)
+
+    @staticmethod
+    def append(frames_folder_path: str, frame_index: int, rows: np.ndarray, detector_name: str) -> None:
+        """Journal the detections of one frame; cost does not depend on the sequence length."""
+        with _journal_lock:
+            append_detection_journal(DetectionsStore.journal_path(frames_folder_path), frame_index, rows, detector_name)
+
+    @staticmethod
+    def compact(frames_folder_path: str) -> bool:
+        """Merge journaled updates into detections.dtdet; False if there were none.
+
+        Safe to run on a background thread while ``append`` is called.
+        """
+        journal_path = DetectionsStore.journal_path(frames_folder_path)
+        compacting_path = DetectionsStore.compacting_path(frames_folder_path)
+        with _journal_lock:
+            # A leftover .compacting file (interrupted compaction) is merged first.
+            if not compacting_path.exists():
+                if not journal_path.exists():
+                    return False
+                os.replace(journal_path, compacting_path)
+
+        table, _ = DetectionsStore._read_table(frames_folder_path)
+        records, _ = read_detection_journal(compacting_path)
+        table, _ = _apply_journal(table, records)
+        write_detection_table(DetectionsStore.table_path(frames_folder_path), table)
+        compacting_path.unlink(missing_ok=True)
+        return True
+
+    @staticmethod
+    def read(frames_folder_path: str) -> tuple[DetectionTable, str | None]:
+        """Return (detections, saved_detector_name), journaled updates included.
+
+        saved_detector_name is None when nothing was saved or no detector was recorded.
+        No side effects besides converting a legacy detections.json and dropping
+        a journal record cut short by a crash — the caller decides whether to
+        apply the detector name.
+        """
+        table, saved_name = DetectionsStore._read_table(frames_folder_path)
+        journal_path = DetectionsStore.journal_path(frames_folder_path)
+        records, _ = read_detection_journal(DetectionsStore.compacting_path(frames_folder_path))
+        with _journal_lock:
+            journal_records, valid_size = read_detection_journal(journal_path)
+            if journal_path.exists() and journal_path.stat().st_size > valid_size:
+                # Later appends would land behind the torn record and never be read.
+                with open(journal_path, "r+b") as fh:
+                    fh.truncate(valid_size)
+        table, journal_name = _apply_journal(table, records + journal_records)
+        return table, journal_name or saved_name
+
+    @staticmethod
+    def _read_table(frames_folder_path: str) -> tuple[DetectionTable, str | None]:
+        table = read_detection_table(DetectionsStore.table_path(frames_folder_path))
+        if table is not None:
+            return table, table.detector_name or None
+
+        detections, saved_name = DetectionsStore.read_json(frames_folder_path)
+        table = DetectionTable.from_frames(detections, saved_name or "")
+        if detections or saved_name is not None:
+            try:
+                write_detection_table(DetectionsStore.table_path(frames_folder_path), table)
+            except OSError:
+                pass
+        return table, saved_name
+
+    @staticmethod
+    def write_json(frames_folder_path: str, table: DetectionTable, path: Path | None = None) -> Path:
+        """Export ``table`` as detections.json (or to ``path``); returns the file written."""
         payload = {
-            "detector": detector_name,
+            "detector": table.detector_name,
             "frames": {
                 str(frame_index): [asdict(detection) for detection in frame_detections]
-                for frame_index, frame_detections in detections.items()
+                for frame_index, frame_detections in table.to_frames().items()
             },
         }
-        DetectionsStore.json_path(frames_folder_path).write_text(
-            json.dumps(payload, indent=2), encoding="utf-8"
-        )
+        target = path or DetectionsStore.json_path(frames_folder_path)
+        target.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+        return target
 
     @staticmethod
-    def read(
+    def read_json(
         frames_folder_path: str,
+        path: Path | None = None,
     ) -> tuple[dict[int, list[PersonDetection]], str | None]:
-        """Return (detections, saved_detector_name).
-
-        saved_detector_name is None when the file is missing or has no detector key.
-        No side effects — the caller decides whether to apply the detector name.
-        """
-        json_path = DetectionsStore.json_path(frames_folder_path)
+        """Import detections.json (or ``path``): (detections by frame, saved_detector_name)."""
+        json_path = path or DetectionsStore.json_path(frames_folder_path)
         if not json_path.exists():
             return {}, None
 
@@ -74,6 +179,19 @@ class DetectionsStore:
         return detections, saved_name
 
 
+def _apply_journal(
+    table: DetectionTable,
+    records: list[tuple[int, np.ndarray, str]],
+) -> tuple[DetectionTable, str | None]:
+    if not records:
+        return table, None
+    frames = {frame_index: rows for frame_index, rows, _ in records}
+    detector_name = records[-1][2]
+    table = table.with_frames(frames)
+    table.detector_name = detector_name or table.detector_name
+    return table, detector_name or None
+
+
 def _from_dict(data: dict) -> PersonDetection | None:
     confidence = data.get("confidence")
     bbox_pixels = data.get("bbox_pixels")
@@ -1,7 +1,7 @@
 import random
-from pathlib import Path
 
 from app.interface.track_detector import BoundingBox, PersonDetection, RelativeBoundingBox
+from utils.image_header import read_image_size
 
 
 class MockPersonDetector:
@@ -105,70 +105,4 @@ def _to_detection(rng: random.Random, box: BoundingBox, width: int, height: int)
 # ── Image size helpers ────────────────────────────────────────────────────────
 
 def _image_size(frame_path: str) -> tuple[int, int]:
-    path = Path(frame_path)
-    if not path.exists():
-        return 1920, 1080
-
-    try:
-        with path.open("rb") as fh:
-            header = fh.read(32)
-            if header.startswith(b"\x89PNG\r\n\x1a\n") and len(header) >= 24:
-                width = int.from_bytes(header[16:20], "big")
-                height = int.from_bytes(header[20:24], "big")
-                if width > 0 and height > 0:
-                    return width, height
-
-            if header.startswith(b"BM") and len(header) >= 26:
-                fh.seek(18)
-                dib = fh.read(8)
-                width = int.from_bytes(dib[0:4], "little")
-                height = int.from_bytes(dib[4:8], "little")
-                if width > 0 and height > 0:
-                    return width, abs(height)
-
-            fh.seek(0)
-            data = fh.read()
-            jpeg_size = _jpeg_size(data)
-            if jpeg_size is not None:
-                return jpeg_size
-    except OSError:
-        return 1920, 1080
-
-    return 1920, 1080
-
-
-def _jpeg_size(data: bytes) -> tuple[int, int] | None:
-    if len(data) < 4 or data[0:2] != b"\xff\xd8":
-        return None
-
-    idx = 2
-    while idx + 9 < len(data):
-        if data[idx] != 0xFF:
-            idx += 1
-            continue
-
-        marker = data[idx + 1]
-        idx += 2
-
-        if marker in {0xD8, 0xD9}:
-            continue
-
-        if idx + 2 > len(data):
-            return None
-
-        segment_length = int.from_bytes(data[idx:idx + 2], "big")
-        if segment_length < 2 or idx + segment_length > len(data):
-            return None
-
-        if marker in {0xC0, 0xC2}:
-            if idx + 7 >= len(data):
-                return None
-            height = int.from_bytes(data[idx + 3:idx + 5], "big")
-            width = int.from_bytes(data[idx + 5:idx + 7], "big")
-            if width > 0 and height > 0:
-                return width, height
-            return None
-
-        idx += segment_length
-
-    return None
+    return read_image_size(frame_path) or (1920, 1080)
@@ -1,14 +1,29 @@
-import re
+import shutil
+import threading
 from pathlib import Path
 
+import numpy as np
+
 from app.interface.track_detector import PersonDetection, PersonDetector
+from app.track_app.sections.track_detector.detection_table import (
+    DetectionTable,
+    detection_rows,
+    detections_from_rows,
+)
 from app.track_app.sections.track_detector.detections_store import DetectionsStore
 from app.track_app.sections.video_manager import sequence_file_store
+from utils.frame_source import FrameSource, open_frame_source
 
+# Packed frames are written here (inside the frames folder, so paths stay under
+# the data root) for detectors that only accept file paths.
+_SCRATCH_DIR_NAME = ".unpacked"
 
-class TrackDetectorService:
-    _VALID_SUFFIXES = {".png", ".jpg", ".jpeg", ".bmp", ".webp"}
+# Single-frame results are journaled; the journal is merged into the table in
+# the background once it holds this many records, and on close.
+_COMPACT_AFTER_RECORDS = 64
 
+
+class TrackDetectorService:
     def __init__(self, detectors: dict[str, PersonDetector], default_detector_name: str):
         self._detectors = dict(detectors)
         self._active_detector_name = (
@@ -16,8 +31,13 @@ class TrackDetectorService:
             if default_detector_name in self._detectors
             else next(iter(self._detectors), "")
         )
-        self._detections_by_frame: dict[int, list[PersonDetection]] = {}
-        self._store = DetectionsStore()
+        self._detections = DetectionTable.empty()
+        # Frames detected one by one since the table was loaded, on top of it.
+        self._frame_edits: dict[int, np.ndarray] = {}
+        self._detections_folder: str | None = None
+        self._journal_records = 0
+        self._compaction: threading.Thread | None = None
+        self._revision = 0
 
     def available_detectors(self) -> list[str]:
         return list(self._detectors.keys())
@@ -34,75 +54,143 @@ class TrackDetectorService:
     def detect_people_for_sequence(self, frames_folder_path: str, frame_index: int | None = None) -> int:
         detector = self._detectors.get(self._active_detector_name)
         if detector is None:
-            self._detections_by_frame = {}
-            DetectionsStore.write(frames_folder_path, self._active_detector_name, {})
+            self._set_detections(frames_folder_path, DetectionTable.empty(self._active_detector_name))
             return 0
 
-        frame_files = self._frame_files(frames_folder_path)
-        if frame_index is not None:
-            if frame_index < 0 or frame_index >= len(frame_files):
-                return 0
-
-            detections = dict(self._detections_by_frame)
-            if not detections:
-                detections, _ = DetectionsStore.read(frames_folder_path)
-
-            previous_detections = detections.get(frame_index - 1)
-            frame_detections = detector.detect_people_in_frame(
-                frame_path=str(frame_files[frame_index]),
-                previous_detections=previous_detections,
-            )
-            detections[frame_index] = frame_detections
-            self._detections_by_frame = detections
-            DetectionsStore.write(frames_folder_path, self._active_detector_name, detections)
-            return 1
-
-        video_path = _find_video_path(frames_folder_path)
-        if hasattr(detector, "detect_people_in_video") and video_path:
-            batch_results = detector.detect_people_in_video(video_path)
-            detections = {i: r for i, r in enumerate(batch_results)}
-        elif hasattr(detector, "detect_people_in_batch"):
-            batch_results = detector.detect_people_in_batch(frames_folder_path)
-            detections = {i: r for i, r in enumerate(batch_results)}
-        else:
-            detections = {}
-            previous_detections: list[PersonDetection] | None = None
-            for index, frame_path in enumerate(frame_files):
+        frames = open_frame_source(Path(frames_folder_path).expanduser())
+        try:
+            scratch_dir = Path(frames_folder_path).expanduser() / _SCRATCH_DIR_NAME
+            if frame_index is not None:
+                if frame_index < 0 or frame_index >= len(frames):
+                    return 0
+
+                self._ensure_folder(frames_folder_path)
+                # No rows on the previous frame means nothing to track from, as if it had never been detected.
+                previous_detections = (self.detections_for_frame(frame_index - 1) or None) if frame_index > 0 else None
+                frame_path = frames.frame_file(frame_index, scratch_dir)
                 frame_detections = detector.detect_people_in_frame(
                     frame_path=str(frame_path),
                     previous_detections=previous_detections,
                 )
-                detections[index] = frame_detections
-                previous_detections = frame_detections
-
-        self._detections_by_frame = detections
-        DetectionsStore.write(frames_folder_path, self._active_detector_name, detections)
-        return len(frame_files)
+                if _is_packed(frames):
+                    frame_path.unlink(missing_ok=True)
+                rows = detection_rows(frame_index, frame_detections)
+                DetectionsStore.append(frames_folder_path, frame_index, rows, self._active_detector_name)
+                self._frame_edits[frame_index] = rows
+                self._revision += 1
+                self._journal_records += 1
+                if self._journal_records >= _COMPACT_AFTER_RECORDS:
+                    self._compact_in_background(frames_folder_path)
+                return 1
+
+            video_path = _find_video_path(frames_folder_path)
+            if hasattr(detector, "detect_people_in_video") and video_path:
+                batch_results = detector.detect_people_in_video(video_path)
+                detections = {i: r for i, r in enumerate(batch_results)}
+            elif hasattr(detector, "detect_people_in_batch"):
+                batch_folder = frames_folder_path
+                if _is_packed(frames):
+                    for index in range(len(frames)):
+                        frames.frame_file(index, scratch_dir)
+                    batch_folder = str(scratch_dir)
+                batch_results = detector.detect_people_in_batch(batch_folder)
+                detections = {i: r for i, r in enumerate(batch_results)}
+            else:
+                detections = {}
+                previous_detections: list[PersonDetection] | None = None
+                for index in range(len(frames)):
+                    frame_path = frames.frame_file(index, scratch_dir)
+                    frame_detections = detector.detect_people_in_frame(
+                        frame_path=str(frame_path),
+                        previous_detections=previous_detections,
+                    )
+                    if _is_packed(frames):
+                        frame_path.unlink(missing_ok=True)
+                    detections[index] = frame_detections
+                    previous_detections = frame_detections
+
+            if _is_packed(frames):
+                shutil.rmtree(scratch_dir, ignore_errors=True)
+
+            self._set_detections(frames_folder_path, DetectionTable.from_frames(detections, self._active_detector_name))
+            return len(frames)
+        finally:
+            frames.close()
 
     def load_detections(self, frames_folder_path: str) -> None:
-        detections, saved_name = DetectionsStore.read(frames_folder_path)
-        self._detections_by_frame = detections
+        self._wait_for_compaction()
+        table, saved_name = DetectionsStore.read(frames_folder_path)
+        self._use_table(frames_folder_path, table)
         if saved_name is not None and saved_name in self._detectors:
             self._active_detector_name = saved_name
 
     def detections_for_frame(self, frame_index: int) -> list[PersonDetection]:
-        return list(self._detections_by_frame.get(frame_index, []))
+        return detections_from_rows(self._frame_rows(frame_index))
+
+    def detection_boxes_for_frame(self, frame_index: int) -> tuple[np.ndarray, np.ndarray]:
+        rows = self._frame_rows(frame_index)
+        return rows["relative"], rows["confidence"]
+
+    def detections_revision(self) -> int:
+        return self._revision
+
+    def flush(self) -> None:
+        """Merge journaled single-frame detections into the table, on the calling thread."""
+        self._wait_for_compaction()
+        if self._detections_folder is not None:
+            _compact(self._detections_folder)
+            self._journal_records = 0
+
+    def _frame_rows(self, frame_index: int) -> np.ndarray:
+        rows = self._frame_edits.get(frame_index)
+        return self._detections.frame_rows(frame_index) if rows is None else rows
+
+    def _ensure_folder(self, frames_folder_path: str) -> None:
+        if self._detections_folder != frames_folder_path:
+            self._wait_for_compaction()
+            table, _ = DetectionsStore.read(frames_folder_path)
+            self._use_table(frames_folder_path, table)
+
+    def _use_table(self, frames_folder_path: str, table: DetectionTable) -> None:
+        self._detections = table
+        self._frame_edits = {}
+        self._detections_folder = frames_folder_path
+        self._journal_records = 0
+        self._revision += 1
+
+    def _set_detections(self, frames_folder_path: str, table: DetectionTable) -> None:
+        self._wait_for_compaction()
+        self._use_table(frames_folder_path, table)
+        DetectionsStore.write(frames_folder_path, table)
+
+    def _compact_in_background(self, frames_folder_path: str) -> None:
+        if self._compaction is not None and self._compaction.is_alive():
+            return
+        # Only the file changes; the table in memory plus the edits stay current.
+        self._journal_records = 0
+        self._compaction = threading.Thread(
+            target=_compact,
+            args=(frames_folder_path,),
+            name="detections-compaction",
+            daemon=True,
+        )
+        self._compaction.start()
+
+    def _wait_for_compaction(self) -> None:
+        if self._compaction is not None:
+            self._compaction.join()
+            self._compaction = None
 
-    def _frame_files(self, frames_folder_path: str) -> list[Path]:
-        folder = Path(frames_folder_path).expanduser()
-        if not folder.is_dir():
-            return []
 
-        return [
-            file
-            for file in sorted(folder.iterdir(), key=_natural_sort_key)
-            if file.is_file() and file.suffix.lower() in self._VALID_SUFFIXES
-        ]
+def _compact(frames_folder_path: str) -> None:
+    try:
+        DetectionsStore.compact(frames_folder_path)
+    except OSError as err:
+        print(f"Could not compact detections of {frames_folder_path}: {err}")
 
 
-def _natural_sort_key(path: Path):
-    chunks = re.split(r"(\d+)", path.name.lower())
-    return [int(chunk) if chunk.isdigit() else chunk for chunk in chunks]
+def _is_packed(frames: FrameSource) -> bool:
+    return len(frames) > 0 and frames.file_path(0) is None
 
 
 def _find_video_path(frames_folder_path: str) -> str | None:
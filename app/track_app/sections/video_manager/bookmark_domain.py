@@ -1,5 +1,6 @@
 """Pure bookmark business rules — no I/O, no filesystem access."""
 from app.interface.sequence_data import Bookmark
+from app.track_app.sections.video_manager.bookmark_index import BookmarkIndex
 
 MIN_BOOKMARK_DISTANCE_FRAMES = 25
 
@@ -48,7 +49,7 @@ def insert_bookmark(
     normalized_name = normalize_name(name)
     by_frame = {b.frame: b for b in bookmarks}
 
-    if not allow_nearby and _is_too_close(bookmarks, normalized):
+    if not allow_nearby and _find_conflict(BookmarkIndex(bookmarks), normalized) is not None:
         return [by_frame[f] for f in sorted(by_frame)]
 
     by_frame[normalized] = Bookmark(frame=normalized, name=normalized_name, locked=locked)
@@ -68,12 +69,13 @@ def apply_move(bookmarks: list[Bookmark], source_frame: int, target_frame: int)
 
 def _resolve_move_target(bookmarks: list[Bookmark], target_frame: int, preferred_direction: int) -> int:
     candidate = max(0, int(target_frame))
-    if not _is_too_close(bookmarks, candidate):
+    index = BookmarkIndex(bookmarks)
+    if _find_conflict(index, candidate) is None:
         return candidate
 
     direction = 1 if preferred_direction >= 0 else -1
     while True:
-        conflict = _find_conflict(bookmarks, candidate)
+        conflict = _find_conflict(index, candidate)
         if conflict is None:
             return candidate
 
@@ -88,15 +90,8 @@ def _resolve_move_target(bookmarks: list[Bookmark], target_frame: int, preferred
         candidate = next_candidate
 
 
-def _find_conflict(bookmarks: list[Bookmark], frame: int) -> int | None:
-    for b in sorted(bookmarks, key=lambda item: abs(item.frame - frame)):
-        if abs(b.frame - frame) < MIN_BOOKMARK_DISTANCE_FRAMES:
-            return b.frame
-    return None
-
-
-def _is_too_close(bookmarks: list[Bookmark], frame: int) -> bool:
-    return _find_conflict(bookmarks, frame) is not None
+def _find_conflict(index: BookmarkIndex, frame: int) -> int | None:
+    return index.nearest_frame(frame, max_distance=MIN_BOOKMARK_DISTANCE_FRAMES - 1)
 
 
 def _to_int(value: object) -> int:
@@ -0,0 +1,42 @@
+"""Sorted in-memory bookmarks of one sequence, for lookups that must not touch the disk."""
+from bisect import bisect_left, bisect_right
+
+from app.interface.sequence_data import Bookmark
+
+
+class BookmarkIndex:
+    """Bookmarks ordered by frame; previous/next/nearest are binary searches."""
+
+    def __init__(self, bookmarks: list[Bookmark] | None = None):
+        self._bookmarks: list[Bookmark] = []
+        self._frames: list[int] = []
+        self.replace(bookmarks or [])
+
+    @property
+    def bookmarks(self) -> list[Bookmark]:
+        return list(self._bookmarks)
+
+    def replace(self, bookmarks: list[Bookmark]) -> None:
+        self._bookmarks = sorted(bookmarks, key=lambda b: b.frame)
+        self._frames = [b.frame for b in self._bookmarks]
+
+    def previous_frame(self, frame: int) -> int | None:
+        """The last bookmarked frame before ``frame``."""
+        idx = bisect_left(self._frames, frame)
+        return self._frames[idx - 1] if idx > 0 else None
+
+    def next_frame(self, frame: int) -> int | None:
+        """The first bookmarked frame after ``frame``."""
+        idx = bisect_right(self._frames, frame)
+        return self._frames[idx] if idx < len(self._frames) else None
+
+    def nearest_frame(self, frame: int, max_distance: int | None = None) -> int | None:
+        """The bookmarked frame closest to ``frame`` (the earlier one on a tie), within ``max_distance``."""
+        idx = bisect_left(self._frames, frame)
+        candidates = self._frames[max(0, idx - 1) : idx + 1]
+        if not candidates:
+            return None
+        nearest = min(candidates, key=lambda f: abs(f - frame))
+        if max_distance is not None and abs(nearest - frame) > max_distance:
+            return None
+        return nearest
@@ -0,0 +1,47 @@
+"""Progress manifest that makes frame extraction resumable after a crash.
+
+Stored as ``frames/.extraction.json`` and replaced atomically at each
+checkpoint. A frames folder only counts as extracted once its manifest says
+``complete``; folders extracted before manifests existed have none and are
+accepted as they are.
+"""
+import hashlib
+import json
+import os
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+MANIFEST_NAME = ".extraction.json"
+_VERSION = 1
+
+
+@dataclass
+class ExtractionManifest:
+    settings: str
+    expected_frames: int
+    completed_frames: int = 0
+    complete: bool = False
+    segments: list[list[int]] = field(default_factory=list)
+    segments_done: list[int] = field(default_factory=list)
+
+
+def extraction_settings(video_path: Path, **options) -> str:
+    """Hash of everything that must match for a partial extraction to be resumed."""
+    stat = video_path.stat()
+    payload = {"version": _VERSION, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns, **options}
+    return hashlib.sha1(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def read_manifest(frames_dir: Path) -> ExtractionManifest | None:
+    try:
+        payload = json.loads((frames_dir / MANIFEST_NAME).read_text(encoding="utf-8"))
+        return ExtractionManifest(**payload)
+    except (OSError, json.JSONDecodeError, TypeError):
+        return None
+
+
+def write_manifest(frames_dir: Path, manifest: ExtractionManifest) -> None:
+    path = frames_dir / MANIFEST_NAME
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_text(json.dumps(asdict(manifest)), encoding="utf-8")
+    os.replace(tmp_path, path)
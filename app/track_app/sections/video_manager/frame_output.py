@@ -0,0 +1,47 @@
+"""Per-frame output shared by the extraction paths: full frame, 320px proxy, atlas rows."""
+from pathlib import Path
+
+import cv2
+
+from utils.frame_source import frame_file_name
+from utils.mipmaps import write_mipmaps
+from utils.proxies import PROXY_MAX_DIM
+
+
+def proxy_size(width: int, height: int) -> tuple[int, int]:
+    max_dim = max(width, height)
+    scale = 1.0 if max_dim <= PROXY_MAX_DIM else PROXY_MAX_DIM / max_dim
+    return max(1, int(round(width * scale))), max(1, int(round(height * scale)))
+
+
+def write_frame(frame, frame_idx: int, frames_dir: Path, low_frames_dir: Path, pack: bool, mipmaps: bool = False):
+    """Write one frame, its mipmap levels if enabled and its proxy.
+
+    Returns (encoded full frame if packing, proxy frame).
+
+    cv2 releases the GIL while encoding and resizing, so this scales across threads.
+    """
+    out_name = frame_file_name(frame_idx)
+    encoded = None
+    if pack:
+        ok, encoded = cv2.imencode(".jpg", frame)
+        if not ok:
+            encoded = None
+    else:
+        cv2.imwrite(str(frames_dir / out_name), frame)
+
+    if mipmaps:
+        write_mipmaps(frame, frame_idx, frames_dir)
+
+    h, w = frame.shape[:2]
+    resized = cv2.resize(frame, proxy_size(w, h), interpolation=cv2.INTER_AREA)
+    cv2.imwrite(str(low_frames_dir / out_name), resized)
+    return encoded, resized
+
+
+def atlas_rows(bgr_frame, size: tuple[int, int]):
+    """RGB rows of ``bgr_frame`` at the atlas ``size`` (width, height)."""
+    width, height = size
+    if bgr_frame.shape[1] != width or bgr_frame.shape[0] != height:
+        bgr_frame = cv2.resize(bgr_frame, (width, height), interpolation=cv2.INTER_AREA)
+    return cv2.cvtColor(bgr_frame, cv2.COLOR_BGR2RGB)
@@ -1,19 +1,62 @@
+import os
+import queue
 import shutil
+import threading
+import time
+from collections import deque
 from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 
 import cv2
 
+from app.track_app.sections.video_manager.extraction_manifest import (
+    MANIFEST_NAME,
+    ExtractionManifest,
+    extraction_settings,
+    read_manifest,
+    write_manifest,
+)
+from app.track_app.sections.video_manager.frame_output import PROXY_MAX_DIM, atlas_rows, proxy_size, write_frame
+from app.track_app.sections.video_manager.segment_extraction import extract_in_segments
+from utils.frame_archive import FRAME_ARCHIVE_NAME, FrameArchiveWriter
+from utils.frame_manifest import discard_frame_manifest
+from utils.frame_source import open_frame_source
+from utils.mipmaps import mipmap_root, prepare_mipmap_dirs
+from utils.proxy_atlas import ATLAS_FILE_NAME, ProxyAtlasWriter
+from utils.video_frame_source import VideoFrameIndex, load_video_index
+
 VIDEO_SUFFIXES = {".mp4", ".mov", ".avi", ".mkv", ".m4v", ".webm"}
 VALID_SUFFIXES = {".png", ".jpg", ".jpeg", ".bmp", ".webp"}
+CHECKPOINT_FRAMES = 120
+AVAILABLE_INTERVAL_S = 0.5
 
 
 class VideoManager:
     """Single responsibility: validate video files and extract frames to disk.
 
     Metadata I/O (.dance_tracker.json) is handled by SequenceMetadataStore.
+    With ``pack_frames`` the full-size frames go into a single archive inside
+    ``frames/`` instead of one JPEG each. With ``proxy_atlas`` the proxies
+    are also packed into a single memory-mappable atlas
+    (``low_frames.atlas``) next to the frame folders. With ``mipmaps`` the
+    160/480/960px levels of utils.mipmaps are written alongside each frame.
     """
 
+    def __init__(
+        self,
+        pack_frames: bool = False,
+        workers: int = 0,
+        processes: int = 1,
+        mipmaps: bool = False,
+        proxy_atlas: bool = False,
+    ):
+        self._pack_frames = pack_frames
+        self._proxy_atlas = proxy_atlas
+        self._mipmaps = mipmaps
+        self._workers = workers if workers > 0 else max(1, os.cpu_count() or 1)
+        self._processes = processes if processes > 0 else max(1, os.cpu_count() or 1)
+
     @staticmethod
     def is_video(video_path: str) -> bool:
         source = Path(video_path)
@@ -24,13 +67,26 @@ class VideoManager:
         video_path: str,
         on_progress: Callable[[int], None] | None = None,
         should_cancel: Callable[[], bool] | None = None,
+        on_frames_available: Callable[[str, int, int], None] | None = None,
     ) -> tuple[str, dict] | None:
         """Extract full-size and 320px proxy frames from a video file.
 
+        With more than one process the video is split into keyframe-aligned
+        segments decoded in parallel processes (see segment_extraction).
+        Otherwise, or if a segment does not decode cleanly, one thread decodes
+        into a bounded queue, a pool encodes, resizes and writes each frame,
+        and this thread completes frames in order.
+
         Returns (frames_dir_path, video_info) on success, None on failure or
         cancellation.  video_info contains: fps, width, height, frames_count,
         duration_seconds, length_bytes — collected during the extraction pass
-        so the caller never needs to re-open the video file.
+        so the caller never needs to re-open the video file — plus
+        extraction_fps for fresh extractions.
+
+        While loose frames are being written, ``on_frames_available`` receives
+        (frames_dir_path, contiguous frames on disk, expected frames) at most
+        every ``AVAILABLE_INTERVAL_S`` so the sequence can be viewed before the
+        extraction finishes. Packed archives only become readable at the end.
         """
         source = Path(video_path)
         if not self.is_video(video_path):
@@ -40,81 +96,287 @@ class VideoManager:
         low_frames_dir = source.parent / "low_frames"
 
         if frames_dir.exists():
-            # Frames already on disk — read metadata without re-extracting.
-            return str(frames_dir), self._video_info_from_file(source)
+            existing_info = self._completed_extraction_info(source, frames_dir)
+            if existing_info is not None:
+                # Frames already on disk — read metadata without re-extracting.
+                return str(frames_dir), existing_info
 
         frames_dir.mkdir(parents=True, exist_ok=True)
         low_frames_dir.mkdir(parents=True, exist_ok=True)
 
-        for output_dir in (frames_dir, low_frames_dir):
-            for item in output_dir.iterdir():
-                if item.is_file() and item.suffix.lower() in VALID_SUFFIXES:
-                    item.unlink()
-
-        capture = cv2.VideoCapture(str(source))
-        if not capture.isOpened():
-            capture.release()
-            return None
-
-        total_frames = int(capture.get(cv2.CAP_PROP_FRAME_COUNT))
-        fps = float(capture.get(cv2.CAP_PROP_FPS))
-        width = int(capture.get(cv2.CAP_PROP_FRAME_WIDTH))
-        height = int(capture.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        video_info = self._video_info_from_file(source)
+        settings = extraction_settings(
+            source,
+            pack=self._pack_frames,
+            proxy_max_dim=PROXY_MAX_DIM,
+            mipmaps=self._mipmaps,
+            proxy_atlas=self._proxy_atlas,
+        )
+        manifest = read_manifest(frames_dir)
+        if manifest is None or manifest.complete or manifest.settings != settings:
+            _discard_partial_output(source, frames_dir, low_frames_dir)
+            manifest = ExtractionManifest(settings=settings, expected_frames=video_info["frames_count"])
+            write_manifest(frames_dir, manifest)
+        elif manifest.completed_frames or manifest.segments_done:
+            print(f"Resuming extraction of {source.name}")
+        if self._mipmaps:
+            prepare_mipmap_dirs(frames_dir, video_info["width"], video_info["height"])
 
         if on_progress is not None:
             on_progress(0)
+        on_available = None
+        if on_frames_available is not None and not self._pack_frames:
+            on_available = _AvailabilityReporter(
+                lambda available: on_frames_available(str(frames_dir), available, manifest.expected_frames)
+            )
 
-        frame_idx = 0
-        canceled = False
-        while True:
-            if should_cancel is not None and should_cancel():
-                canceled = True
-                break
-
-            ok, frame = capture.read()
-            if not ok:
-                break
-
-            out_name = f"frame_{frame_idx:06d}.jpg"
-            cv2.imwrite(str(frames_dir / out_name), frame)
-
-            h, w = frame.shape[:2]
-            max_dim = max(w, h)
-            scale = 1.0 if max_dim <= 320 else 320.0 / max_dim
-            scaled_w = max(1, int(round(w * scale)))
-            scaled_h = max(1, int(round(h * scale)))
-            resized = cv2.resize(frame, (scaled_w, scaled_h), interpolation=cv2.INTER_AREA)
-            cv2.imwrite(str(low_frames_dir / out_name), resized)
-
-            frame_idx += 1
-            if on_progress is not None and total_frames > 0:
-                on_progress(min(100, int((frame_idx * 100) / total_frames)))
-
-        capture.release()
+        started = time.perf_counter()
+        resumed_frames = manifest.completed_frames
+        frame_count, canceled = 0, False
+        if manifest.segments or (self._processes > 1 and manifest.completed_frames == 0):
+            frame_count, canceled = self._extract_in_segments(
+                source, frames_dir, low_frames_dir, manifest, on_progress, should_cancel, on_available
+            )
+            if frame_count == 0 and not canceled:
+                _discard_partial_output(source, frames_dir, low_frames_dir)
+                manifest = ExtractionManifest(settings=settings, expected_frames=video_info["frames_count"])
+                write_manifest(frames_dir, manifest)
+                if self._mipmaps:
+                    prepare_mipmap_dirs(frames_dir, video_info["width"], video_info["height"])
+                if on_available is not None:
+                    # Starting over: the frames reported so far are gone, report from 0 again.
+                    on_available = _AvailabilityReporter(on_available.callback)
+        if frame_count == 0 and not canceled:
+            frame_count, canceled = self._extract_pipelined(
+                source, frames_dir, low_frames_dir, manifest, on_progress, should_cancel, on_available
+            )
+        elapsed_s = time.perf_counter() - started
 
         if canceled:
             shutil.rmtree(frames_dir, ignore_errors=True)
             shutil.rmtree(low_frames_dir, ignore_errors=True)
             return None
 
-        if frame_idx == 0:
+        if frame_count == 0:
+            # Nothing usable was written (e.g. a frame failed to encode); never leave it to look resumable.
+            _discard_partial_output(source, frames_dir, low_frames_dir)
             return None
 
+        manifest.expected_frames = manifest.completed_frames = frame_count
+        manifest.complete = True
+        write_manifest(frames_dir, manifest)
+
         if on_progress is not None:
             on_progress(100)
 
-        print("Finished")
+        extraction_fps = (frame_count - resumed_frames) / elapsed_s if elapsed_s > 0 else 0.0
+        print(f"Finished: {frame_count} frames at {extraction_fps:.1f} frames/s")
 
-        video_info = {
-            "fps": fps,
-            "width": width,
-            "height": height,
-            "frames_count": frame_idx,
-            "duration_seconds": round(frame_idx / fps, 3) if fps > 0 else 0.0,
-            "length_bytes": source.stat().st_size if source.is_file() else 0,
-        }
+        fps = video_info["fps"]
+        video_info.update(
+            frames_count=frame_count,
+            duration_seconds=round(frame_count / fps, 3) if fps > 0 else 0.0,
+            extraction_fps=round(extraction_fps, 1),
+        )
         return str(frames_dir), video_info
 
+    def _completed_extraction_info(self, source: Path, frames_dir: Path) -> dict | None:
+        """Video info for a frames folder that holds a finished extraction, else None.
+
+        Folders extracted before manifests existed are accepted if they hold
+        any frames.
+        """
+        manifest = read_manifest(frames_dir)
+        frame_count = len(open_frame_source(frames_dir))
+        if manifest is None:
+            return self._video_info_from_file(source) if frame_count > 0 else None
+        if not manifest.complete or frame_count != manifest.expected_frames:
+            return None
+
+        video_info = self._video_info_from_file(source)
+        fps = video_info["fps"]
+        video_info.update(
+            frames_count=frame_count,
+            duration_seconds=round(frame_count / fps, 3) if fps > 0 else 0.0,
+        )
+        return video_info
+
+    def _extract_in_segments(
+        self,
+        source: Path,
+        frames_dir: Path,
+        low_frames_dir: Path,
+        manifest: ExtractionManifest,
+        on_progress: Callable[[int], None] | None,
+        should_cancel: Callable[[], bool] | None,
+        on_frames_available: Callable[[int], None] | None,
+    ) -> tuple[int, bool]:
+        try:
+            index = load_video_index(source)
+        except (OSError, ValueError):
+            return 0, False
+        return extract_in_segments(
+            source, index, frames_dir, low_frames_dir, self._processes, self._pack_frames, manifest, self._mipmaps,
+            proxy_atlas=self._proxy_atlas, on_progress=on_progress, should_cancel=should_cancel, on_frames_available=on_frames_available,
+        )
+
+    def _extract_pipelined(
+        self,
+        source: Path,
+        frames_dir: Path,
+        low_frames_dir: Path,
+        manifest: ExtractionManifest,
+        on_progress: Callable[[int], None] | None,
+        should_cancel: Callable[[], bool] | None,
+        on_frames_available: Callable[[int], None] | None,
+    ) -> tuple[int, bool]:
+        """Decode thread -> bounded queue -> encode pool; returns (frames extracted, canceled).
+
+        Continues after ``manifest.completed_frames`` and checkpoints the
+        manifest every ``CHECKPOINT_FRAMES`` frames.
+        """
+        capture = cv2.VideoCapture(str(source))
+        if not capture.isOpened():
+            capture.release()
+            return 0, False
+
+        frame_idx = manifest.completed_frames
+        atlas: ProxyAtlasWriter | None = None
+        archive: FrameArchiveWriter | None = None
+        if frame_idx > 0:
+            try:
+                atlas, archive = self._resume_writers(source, frames_dir, capture, frame_idx)
+            except (OSError, ValueError):
+                print("Cannot resume extraction, starting over")
+                frame_idx = 0
+                capture.set(cv2.CAP_PROP_POS_FRAMES, 0)
+        if archive is None and self._pack_frames:
+            archive = FrameArchiveWriter(frames_dir / FRAME_ARCHIVE_NAME)
+
+        total_frames = manifest.expected_frames
+        decoded_frames: queue.Queue = queue.Queue(maxsize=self._workers * 2)
+        stop_decoding = threading.Event()
+        decoder = threading.Thread(
+            target=_decode_frames, args=(capture, decoded_frames, stop_decoding), daemon=True
+        )
+        decoder.start()
+
+        submitted = frame_idx
+        canceled = False
+        failed = False
+        decoding_done = False
+        in_flight: deque[Future] = deque()
+        pool = ThreadPoolExecutor(max_workers=self._workers)
+        try:
+            while True:
+                if should_cancel is not None and should_cancel():
+                    canceled = True
+                    break
+
+                if in_flight and (
+                    decoding_done or in_flight[0].done() or len(in_flight) >= self._workers * 2
+                ):
+                    encoded, proxy = in_flight.popleft().result()
+                    if archive is not None:
+                        if encoded is None:
+                            print(f"Cannot encode frame {frame_idx} of {source.name}, extraction failed")
+                            failed = True
+                            break
+                        archive.append(encoded.data)
+                    if self._proxy_atlas:
+                        if atlas is None:
+                            atlas = ProxyAtlasWriter(source.parent / ATLAS_FILE_NAME, proxy.shape[1], proxy.shape[0])
+                        atlas.append(atlas_rows(proxy, atlas.size).data)
+
+                    frame_idx += 1
+                    if frame_idx % CHECKPOINT_FRAMES == 0:
+                        for writer in (atlas, archive):
+                            if writer is not None:
+                                writer.flush()
+                        manifest.completed_frames = frame_idx
+                        write_manifest(frames_dir, manifest)
+                    if on_progress is not None and total_frames > 0:
+                        on_progress(min(100, int((frame_idx * 100) / total_frames)))
+                    if on_frames_available is not None:
+                        on_frames_available(frame_idx)
+                    continue
+
+                if decoding_done:
+                    break
+
+                try:
+                    frame = decoded_frames.get(timeout=0.05)
+                except queue.Empty:
+                    continue
+                if frame is None:
+                    decoding_done = True
+                    continue
+
+                in_flight.append(
+                    pool.submit(
+                        write_frame, frame, submitted, frames_dir, low_frames_dir, archive is not None, self._mipmaps
+                    )
+                )
+                submitted += 1
+        finally:
+            stop_decoding.set()
+            pool.shutdown(wait=True, cancel_futures=True)
+            while decoder.is_alive():
+                _drain(decoded_frames)
+                decoder.join(timeout=0.05)
+            capture.release()
+
+        for writer in (atlas, archive):
+            if writer is None:
+                continue
+            if canceled or failed or frame_idx == 0:
+                writer.abort()
+            else:
+                writer.close()
+        return (0 if failed else frame_idx), canceled
+
+    def _resume_writers(
+        self, source: Path, frames_dir: Path, capture: cv2.VideoCapture, frames: int
+    ) -> tuple[ProxyAtlasWriter | None, FrameArchiveWriter | None]:
+        """Reopen the writers of an interrupted run and seek ``capture`` to frame ``frames``."""
+        _seek_capture(capture, load_video_index(source), frames)
+        atlas = None
+        if self._proxy_atlas:
+            width = int(capture.get(cv2.CAP_PROP_FRAME_WIDTH))
+            height = int(capture.get(cv2.CAP_PROP_FRAME_HEIGHT))
+            atlas = ProxyAtlasWriter(source.parent / ATLAS_FILE_NAME, *proxy_size(width, height), resume_frames=frames)
+        if not self._pack_frames:
+            return atlas, None
+        try:
+            return atlas, FrameArchiveWriter(frames_dir / FRAME_ARCHIVE_NAME, resume_frames=frames)
+        except (OSError, ValueError):
+            if atlas is not None:
+                atlas.abort()
+            raise
+
+    @staticmethod
+    def build_proxy_atlas(proxy_files: list[Path], atlas_path: Path) -> int:
+        """Pack existing proxy images into an atlas; returns the frame count (0 on failure)."""
+        atlas: ProxyAtlasWriter | None = None
+        try:
+            for path in proxy_files:
+                frame = cv2.imread(str(path), cv2.IMREAD_COLOR)
+                if frame is None:
+                    raise OSError(f"cannot read proxy frame {path}")
+                if atlas is None:
+                    height, width = frame.shape[:2]
+                    atlas = ProxyAtlasWriter(atlas_path, width, height)
+                atlas.append(atlas_rows(frame, atlas.size).data)
+        except (OSError, ValueError):
+            if atlas is not None:
+                atlas.abort()
+            return 0
+
+        if atlas is None:
+            return 0
+        atlas.close()
+        return len(proxy_files)
+
     @staticmethod
     def _video_info_from_file(video_path: Path) -> dict:
         """Read video metadata without extracting frames (frames-already-exist path)."""
@@ -137,3 +399,76 @@ class VideoManager:
             "duration_seconds": round(frame_count / fps, 3) if fps > 0 else 0.0,
             "length_bytes": video_path.stat().st_size if video_path.is_file() else 0,
         }
+
+
+class _AvailabilityReporter:
+    """Forwards a growing frame count, at most once every ``AVAILABLE_INTERVAL_S``."""
+
+    def __init__(self, callback: Callable[[int], None]):
+        self.callback = callback
+        self._reported = 0
+        self._last_report = 0.0
+
+    def __call__(self, available: int) -> None:
+        now = time.monotonic()
+        if available <= self._reported or (self._reported > 0 and now - self._last_report < AVAILABLE_INTERVAL_S):
+            return
+        self._reported = available
+        self._last_report = now
+        self.callback(available)
+
+
+def _decode_frames(capture: cv2.VideoCapture, frames: queue.Queue, stop: threading.Event) -> None:
+    """Read frames into ``frames`` until the video ends or ``stop`` is set; None marks the end."""
+    while not stop.is_set():
+        ok, frame = capture.read()
+        if not ok:
+            break
+        if not _put_unless_stopped(frames, frame, stop):
+            return
+    _put_unless_stopped(frames, None, stop)
+
+
+def _put_unless_stopped(frames: queue.Queue, item, stop: threading.Event) -> bool:
+    while not stop.is_set():
+        try:
+            frames.put(item, timeout=0.05)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _drain(frames: queue.Queue) -> None:
+    while True:
+        try:
+            frames.get_nowait()
+        except queue.Empty:
+            return
+
+
+def _seek_capture(capture: cv2.VideoCapture, index: VideoFrameIndex, frame_idx: int) -> None:
+    """Position ``capture`` so the next read returns ``frame_idx`` (ValueError if it cannot)."""
+    keyframe = index.keyframe_before(frame_idx)
+    if not capture.set(cv2.CAP_PROP_POS_FRAMES, keyframe):
+        raise ValueError(f"cannot seek to frame {keyframe}")
+    for _ in range(frame_idx - keyframe):
+        if not capture.grab():
+            raise ValueError(f"cannot reach frame {frame_idx}")
+
+
+def _discard_partial_output(source: Path, frames_dir: Path, low_frames_dir: Path) -> None:
+    """Remove everything an interrupted extraction may have left behind."""
+    for output_dir in (frames_dir, low_frames_dir):
+        for item in output_dir.iterdir():
+            if item.is_file() and (
+                item.suffix.lower() in VALID_SUFFIXES
+                or item.name.startswith(FRAME_ARCHIVE_NAME)
+                or item.name.startswith(MANIFEST_NAME)
+            ):
+                item.unlink()
+    for leftover in source.parent.glob(f"{ATLAS_FILE_NAME}*"):
+        leftover.unlink(missing_ok=True)
+    shutil.rmtree(mipmap_root(frames_dir), ignore_errors=True)
+    for output_dir in (frames_dir, low_frames_dir):
+        discard_frame_manifest(output_dir)
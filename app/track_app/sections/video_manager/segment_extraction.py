@@ -0,0 +1,244 @@
+"""Segment-parallel extraction: one process per keyframe-aligned range of the video.
+
+Each process opens its own capture, seeks to its first keyframe and writes
+frames straight to their final indices: loose JPEGs (or a part archive that is
+merged afterwards when packing) and, with a proxy atlas, proxy rows into
+reserved atlas slots.
+Finished segments are recorded in the extraction manifest, so an interrupted
+run only redoes the segments that had not finished.
+"""
+import multiprocessing
+import queue
+from collections.abc import Callable
+from pathlib import Path
+
+import cv2
+
+from app.track_app.sections.video_manager.extraction_manifest import ExtractionManifest, write_manifest
+from app.track_app.sections.video_manager.frame_output import atlas_rows, proxy_size, write_frame
+from utils.frame_archive import FRAME_ARCHIVE_NAME, FrameArchive, FrameArchiveWriter
+from utils.proxy_atlas import ATLAS_FILE_NAME, ProxyAtlasSlotWriter, ProxyAtlasWriter
+from utils.video_frame_source import VideoFrameIndex
+
+_PROGRESS_EVERY = 8
+
+
+def plan_segments(index: VideoFrameIndex, segments: int) -> list[tuple[int, int]]:
+    """Split the video into up to ``segments`` [start, end) ranges that each start on a keyframe."""
+    count = index.frame_count
+    starts = sorted({index.keyframe_before(count * i // segments) for i in range(segments)})
+    return list(zip(starts, starts[1:] + [count]))
+
+
+def extract_in_segments(
+    video_path: Path,
+    index: VideoFrameIndex,
+    frames_dir: Path,
+    low_frames_dir: Path,
+    processes: int,
+    pack: bool,
+    manifest: ExtractionManifest,
+    mipmaps: bool = False,
+    proxy_atlas: bool = False,
+    on_progress: Callable[[int], None] | None = None,
+    should_cancel: Callable[[], bool] | None = None,
+    on_frames_available: Callable[[int], None] | None = None,
+) -> tuple[int, bool]:
+    """Extract ``video_path`` with up to ``processes`` worker processes.
+
+    Resumes the segments recorded in ``manifest`` if it has any.
+    ``on_frames_available`` receives the number of frames written contiguously
+    from the start, which only grows past a segment boundary once the earlier
+    segment has finished. Returns
+    (frames extracted, canceled). 0 frames without cancellation means a
+    segment did not decode to exactly its frames; the caller should fall back
+    to sequential extraction.
+    """
+    resuming = bool(manifest.segments)
+    ranges = [(start, end) for start, end in manifest.segments] if resuming else plan_segments(index, processes)
+    if len(ranges) < 2:
+        return 0, False
+
+    proxy_w, proxy_h = proxy_size(index.width, index.height)
+    atlas = None
+    if proxy_atlas:
+        try:
+            atlas = ProxyAtlasWriter(
+                video_path.parent / ATLAS_FILE_NAME, proxy_w, proxy_h,
+                reserve_frames=index.frame_count, resume_frames=0 if resuming else None,
+            )
+        except (OSError, ValueError):
+            if not resuming:
+                raise
+            return 0, False
+    part_paths = [segment_archive_path(frames_dir, k) for k in range(len(ranges))]
+    if not resuming:
+        manifest.segments = [[start, end] for start, end in ranges]
+        manifest.segments_done = []
+        write_manifest(frames_dir, manifest)
+
+    context = multiprocessing.get_context("spawn")
+    progress = context.Queue()
+    cancel = context.Event()
+    workers = {
+        k: context.Process(
+            target=extract_segment,
+            args=(
+                str(video_path), k, start, end, str(frames_dir), str(low_frames_dir),
+                str(atlas.tmp_path) if atlas is not None else "", (proxy_w, proxy_h), str(part_paths[k]) if pack else "", mipmaps,
+                index.pts_ms[start], index.fps, progress, cancel,
+            ),
+            daemon=True,
+        )
+        for k, (start, end) in enumerate(ranges)
+        if k not in manifest.segments_done
+    }
+    for worker in workers.values():
+        worker.start()
+
+    done = [end - start if k in manifest.segments_done else 0 for k, (start, end) in enumerate(ranges)]
+    finished = [k in manifest.segments_done for k in range(len(ranges))]
+    exited_unfinished: set[int] = set()
+    canceled = False
+    while not all(finished):
+        if should_cancel is not None and should_cancel():
+            cancel.set()
+            canceled = True
+            break
+        try:
+            segment, count, is_final = progress.get(timeout=0.05)
+        except queue.Empty:
+            # A process that died without reporting counts as finished short,
+            # once a second empty poll shows nothing was left in the queue.
+            for k, worker in workers.items():
+                if finished[k] or worker.exitcode is None:
+                    continue
+                if k in exited_unfinished:
+                    finished[k] = True
+                exited_unfinished.add(k)
+            continue
+
+        done[segment] = count
+        finished[segment] = finished[segment] or is_final
+        start, end = ranges[segment]
+        if is_final and (count == end - start or (segment == len(ranges) - 1 and count > 0)):
+            manifest.segments[segment] = [start, start + count]
+            manifest.segments_done.append(segment)
+            write_manifest(frames_dir, manifest)
+        if on_progress is not None:
+            on_progress(min(100, sum(done) * 100 // max(1, index.frame_count)))
+        if on_frames_available is not None:
+            on_frames_available(_contiguous_frames(ranges, done))
+
+    for worker in workers.values():
+        worker.join(timeout=5)
+        if worker.is_alive():
+            worker.terminate()
+            worker.join()
+
+    complete = all(
+        done[k] == end - start for k, (start, end) in enumerate(ranges[:-1])
+    ) and done[-1] > 0
+    if canceled or not complete:
+        if atlas is not None:
+            atlas.abort()
+        for path in part_paths:
+            path.unlink(missing_ok=True)
+        return 0, canceled
+
+    total = ranges[-1][0] + done[-1]
+    if atlas is not None:
+        atlas.close(frame_count=total)
+    if pack:
+        _merge_part_archives(part_paths, frames_dir / FRAME_ARCHIVE_NAME)
+    return total, False
+
+
+def extract_segment(
+    video_path: str,
+    segment: int,
+    start: int,
+    end: int,
+    frames_dir: str,
+    low_frames_dir: str,
+    atlas_tmp_path: str,
+    atlas_size: tuple[int, int],
+    part_archive_path: str,
+    mipmaps: bool,
+    start_pts_ms: float,
+    fps: float,
+    progress,
+    cancel,
+) -> None:
+    """Process entry point: extract frames [start, end) and report (segment, done, final).
+
+    Empty ``atlas_tmp_path`` / ``part_archive_path`` skip the atlas / archive.
+    """
+    written = 0
+    failed = False
+    capture = cv2.VideoCapture(video_path)
+    slots = ProxyAtlasSlotWriter(atlas_tmp_path, *atlas_size) if atlas_tmp_path else None
+    archive = FrameArchiveWriter(part_archive_path) if part_archive_path else None
+    try:
+        if not capture.isOpened() or (start > 0 and not capture.set(cv2.CAP_PROP_POS_FRAMES, start)):
+            return
+
+        for frame_idx in range(start, end):
+            if cancel.is_set():
+                return
+            ok, frame = capture.read()
+            if not ok:
+                break
+            if frame_idx == start and abs(capture.get(cv2.CAP_PROP_POS_MSEC) - start_pts_ms) > 500.0 / fps:
+                # The backend did not land on the indexed keyframe; let the caller fall back.
+                return
+
+            encoded, proxy = write_frame(
+                frame, frame_idx, Path(frames_dir), Path(low_frames_dir), archive is not None, mipmaps
+            )
+            if archive is not None:
+                if encoded is None:
+                    failed = True
+                    return
+                archive.append(encoded.data)
+            if slots is not None:
+                slots.write(frame_idx, atlas_rows(proxy, atlas_size).data)
+            written += 1
+            if written % _PROGRESS_EVERY == 0:
+                progress.put((segment, written, False))
+    finally:
+        capture.release()
+        if slots is not None:
+            slots.close()
+        if archive is not None:
+            if written > 0 and not cancel.is_set() and not failed:
+                archive.close()
+            else:
+                archive.abort()
+        # A failed encode reports nothing written, so even a final segment is not taken as complete.
+        progress.put((segment, 0 if failed else written, True))
+
+
+def _contiguous_frames(ranges: list[tuple[int, int]], done: list[int]) -> int:
+    """Frames written without a gap from frame 0, given each segment's written count."""
+    available = 0
+    for (start, end), count in zip(ranges, done):
+        available = start + count
+        if count < end - start:
+            break
+    return available
+
+
+def segment_archive_path(frames_dir: Path, segment: int) -> Path:
+    return frames_dir / f"{FRAME_ARCHIVE_NAME}.part{segment}"
+
+
+def _merge_part_archives(part_paths: list[Path], archive_path: Path) -> None:
+    writer = FrameArchiveWriter(archive_path)
+    for path in part_paths:
+        part = FrameArchive(path)
+        for idx in range(len(part)):
+            writer.append(part.frame_bytes(idx))
+        part.close()
+        path.unlink(missing_ok=True)
+    writer.close()
@@ -1,22 +1,47 @@
+import threading
+from dataclasses import dataclass
 from pathlib import Path
 
 from app.interface.sequence_data import Bookmark, SequenceVideoData
-from app.track_app.sections.video_manager import bookmark_domain, sequence_file_store
+from app.track_app.sections.video_manager import bookmark_domain
+from app.track_app.sections.video_manager.bookmark_index import BookmarkIndex
+from app.track_app.sections.video_manager.sidecar_writer import SidecarWriter, shared_writer
+from utils.sidecar_registry import SIDECAR_SUFFIX, find_sidecar, read_sidecar
+
+
+@dataclass
+class _LoadedSequence:
+    metadata_path: Path
+    payload: dict
+    bookmarks: BookmarkIndex
 
 
 class SequenceDataService:
+    """Sequence sidecar data, kept in memory per frames folder and saved behind the caller.
+
+    Reads and bookmark navigation are answered from memory. Changes replace
+    the in-memory payload and are written by a SidecarWriter shortly after;
+    call ``flush`` before exiting. A sidecar changed on disk by someone else
+    is reloaded on the next access unless a write of ours is still pending.
+    """
+
+    def __init__(self, writer: SidecarWriter | None = None):
+        self._writer = writer or shared_writer
+        self._lock = threading.Lock()
+        self._loaded: dict[Path, _LoadedSequence] = {}
+
+    def flush(self) -> None:
+        self._writer.flush()
+
     def read_video_data(self, frames_folder_path: str) -> SequenceVideoData | None:
         frames_folder = Path(frames_folder_path).expanduser().resolve()
         if not frames_folder.is_dir():
             return None
 
-        metadata_path = sequence_file_store.find_metadata_for_frames(frames_folder)
-        if metadata_path is None:
-            return None
-
-        metadata = sequence_file_store.read(metadata_path)
-        if not metadata:
+        loaded = self._load(frames_folder)
+        if loaded is None:
             return None
+        metadata = loaded.payload
 
         video_data = metadata.get("video")
         if not isinstance(video_data, dict):
@@ -59,19 +84,8 @@ class SequenceDataService:
         )
 
     def read_bookmarks(self, frames_folder_path: str) -> list[Bookmark]:
-        frames_folder = Path(frames_folder_path).expanduser().resolve()
-        if not frames_folder.is_dir():
-            return []
-
-        metadata_path = sequence_file_store.find_metadata_for_frames(frames_folder)
-        if metadata_path is None:
-            return []
-
-        payload = sequence_file_store.read(metadata_path)
-        if payload is None:
-            return []
-
-        return bookmark_domain.extract_bookmarks(payload)
+        loaded = self._load_existing(frames_folder_path)
+        return loaded.bookmarks.bookmarks if loaded is not None else []
 
     def add_bookmark(self, frames_folder_path: str, frame: int) -> list[Bookmark]:
         return self._update_bookmarks(
@@ -114,16 +128,11 @@ class SequenceDataService:
         return self._update_bookmarks(frames_folder_path, updater=_apply)
 
     def get_sequence_name(self, frames_folder_path: str) -> str | None:
-        frames_folder = Path(frames_folder_path).expanduser().resolve()
-        metadata_path = sequence_file_store.find_metadata_for_frames(frames_folder)
-        if metadata_path is None:
+        loaded = self._load(Path(frames_folder_path).expanduser().resolve())
+        if loaded is None:
             return None
 
-        payload = sequence_file_store.read(metadata_path)
-        if payload is None:
-            return None
-
-        sequence = payload.get("sequence")
+        sequence = loaded.payload.get("sequence")
         if not isinstance(sequence, dict):
             return None
 
@@ -133,50 +142,67 @@ class SequenceDataService:
         return None
 
     def set_sequence_name(self, frames_folder_path: str, name: str) -> None:
-        frames_folder = Path(frames_folder_path).expanduser().resolve()
-        metadata_path = sequence_file_store.find_metadata_for_frames(frames_folder)
-        if metadata_path is None:
-            return
-
-        payload = sequence_file_store.read(metadata_path)
-        if payload is None:
+        loaded = self._load(Path(frames_folder_path).expanduser().resolve())
+        if loaded is None:
             return
-
-        payload.setdefault("sequence", {})["name"] = name.strip()
-        sequence_file_store.write_payload(metadata_path, payload)
+        self._save(loaded, _with_sequence_value(loaded.payload, "name", name.strip()))
 
     def previous_bookmark_frame(self, frames_folder_path: str, current_frame: int) -> int | None:
-        bookmarks = self.read_bookmarks(frames_folder_path)
-        candidates = sorted(b.frame for b in bookmarks if b.frame < current_frame)
-        return candidates[-1] if candidates else None
+        loaded = self._load_existing(frames_folder_path)
+        return loaded.bookmarks.previous_frame(current_frame) if loaded is not None else None
 
     def next_bookmark_frame(self, frames_folder_path: str, current_frame: int) -> int | None:
-        bookmarks = self.read_bookmarks(frames_folder_path)
-        candidates = sorted(b.frame for b in bookmarks if b.frame > current_frame)
-        return candidates[0] if candidates else None
+        loaded = self._load_existing(frames_folder_path)
+        return loaded.bookmarks.next_frame(current_frame) if loaded is not None else None
 
     def _update_bookmarks(self, frames_folder_path: str, updater) -> list[Bookmark]:
-        frames_folder = Path(frames_folder_path).expanduser().resolve()
-        if not frames_folder.is_dir():
+        loaded = self._load_existing(frames_folder_path)
+        if loaded is None:
             return []
 
-        metadata_path = sequence_file_store.find_metadata_for_frames(frames_folder)
-        if metadata_path is None:
-            return []
-
-        payload = sequence_file_store.read(metadata_path)
-        if payload is None:
-            return []
-
-        current = bookmark_domain.extract_bookmarks(payload)
-        updated = updater(current)
-        payload.setdefault("sequence", {})["bookmarks"] = [
-            {"frame": b.frame, "name": b.name, "locked": b.locked}
-            for b in updated
-        ]
-        sequence_file_store.write_payload(metadata_path, payload)
+        updated = updater(loaded.bookmarks.bookmarks)
+        loaded.bookmarks.replace(updated)
+        raw_bookmarks = [{"frame": b.frame, "name": b.name, "locked": b.locked} for b in updated]
+        self._save(loaded, _with_sequence_value(loaded.payload, "bookmarks", raw_bookmarks))
         return updated
 
+    def _load_existing(self, frames_folder_path: str) -> _LoadedSequence | None:
+        frames_folder = Path(frames_folder_path).expanduser().resolve()
+        if not frames_folder.is_dir():
+            return None
+        return self._load(frames_folder)
+
+    def _load(self, frames_folder: Path) -> _LoadedSequence | None:
+        with self._lock:
+            loaded = self._loaded.get(frames_folder)
+        if loaded is not None and (
+            self._writer.is_pending(loaded.metadata_path) or read_sidecar(loaded.metadata_path) is loaded.payload
+        ):
+            return loaded
+
+        found = find_sidecar(frames_folder, SIDECAR_SUFFIX)
+        if found is None:
+            with self._lock:
+                self._loaded.pop(frames_folder, None)
+            return None
+        metadata_path, payload = found
+        loaded = _LoadedSequence(metadata_path, payload, BookmarkIndex(bookmark_domain.extract_bookmarks(payload)))
+        with self._lock:
+            self._loaded[frames_folder] = loaded
+        return loaded
+
+    def _save(self, loaded: _LoadedSequence, payload: dict) -> None:
+        loaded.payload = payload
+        self._writer.schedule(loaded.metadata_path, payload)
+
+
+def _with_sequence_value(payload: dict, key: str, value: object) -> dict:
+    """A copy of ``payload`` with ``sequence[key]`` set; ``payload`` itself is shared and left alone."""
+    sequence = payload.get("sequence")
+    sequence = dict(sequence) if isinstance(sequence, dict) else {}
+    sequence[key] = value
+    return {**payload, "sequence": sequence}
+
 
 def _to_int(value: object) -> int:
     try:
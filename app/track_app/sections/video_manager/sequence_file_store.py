@@ -1,43 +1,38 @@
-"""Single responsibility: read and write .dance_tracker.json files for sequence data."""
+"""Single responsibility: read and write .dance_tracker.json files for sequence data.
+
+Lookups and reads go through the shared sidecar registry, so they only
+touch the disk when a file has changed.
+"""
+import copy
 import json
+import os
 from pathlib import Path
 
-_SUFFIX = ".dance_tracker.json"
+from utils.sidecar_registry import SIDECAR_SUFFIX, find_sidecar, read_sidecar, remember_sidecar, resolve_sidecar_path
 
 
 def find_metadata_for_frames(frames_folder: Path) -> Path | None:
     """Return the metadata file whose 'frames' entry resolves to frames_folder, or None."""
-    target = frames_folder.resolve()
-    for metadata_path in sorted(frames_folder.parent.glob(f"*{_SUFFIX}")):
-        payload = read(metadata_path)
-        if not payload:
-            continue
-        frames_value = payload.get("frames") or payload.get("frames_path")
-        resolved = resolve_path(frames_value, metadata_path.parent)
-        if resolved and resolved == target:
-            return metadata_path
-    return None
+    found = find_sidecar(frames_folder, SIDECAR_SUFFIX)
+    return found[0] if found is not None else None
 
 
 def read(path: Path) -> dict | None:
-    try:
-        payload = json.loads(path.read_text(encoding="utf-8"))
-    except (OSError, json.JSONDecodeError):
-        return None
-    return payload if isinstance(payload, dict) else None
+    """The parsed sidecar, as a copy the caller may modify."""
+    payload = read_sidecar(path)
+    return copy.deepcopy(payload) if payload is not None else None
 
 
 def write_payload(path: Path, payload: dict) -> None:
-    path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    """Replace ``path`` atomically with ``payload``, which must not be modified afterwards."""
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    os.replace(tmp_path, path)
+    remember_sidecar(path, payload)
 
 
 def resolve_path(value: object, root: Path) -> Path | None:
-    if not isinstance(value, str) or not value.strip():
-        return None
-    candidate = Path(value).expanduser()
-    if not candidate.is_absolute():
-        candidate = (root / candidate).resolve()
-    return candidate
+    return resolve_sidecar_path(value, root)
 
 
 def video_path_from_metadata(metadata: dict) -> str | None:
@@ -1,14 +1,19 @@
-import json
+import copy
 from pathlib import Path
 
-_SUFFIX = ".dance_tracker.json"
+from app.track_app.sections.video_manager import sequence_file_store
+from app.track_app.sections.video_manager.sidecar_writer import shared_writer
+from utils.proxy_atlas import ATLAS_FILE_NAME
+from utils.sidecar_registry import SIDECAR_SUFFIX, read_sidecar
 
 
 class SequenceMetadataStore:
     """Reads and writes .dance_tracker.json sequence metadata files.
 
     Single responsibility: all I/O for the sidecar metadata that links a video
-    file to its extracted frames directory.
+    file to its extracted frames directory. Writes first flush the shared
+    SidecarWriter, so a pending bookmark save cannot land afterwards with
+    an older payload.
     """
 
     @staticmethod
@@ -19,7 +24,7 @@ class SequenceMetadataStore:
     @staticmethod
     def path_for_video(video_path: str) -> Path:
         source = Path(video_path)
-        return source.with_name(f"{source.stem}{_SUFFIX}")
+        return source.with_name(f"{source.stem}{SIDECAR_SUFFIX}")
 
     @classmethod
     def write(cls, video_path: str, frames_path: str, video_info: dict) -> str | None:
@@ -59,19 +64,32 @@ class SequenceMetadataStore:
             "frames": cls._relative_or_absolute(frames_dir, source.parent),
             "low_frames": cls._relative_or_absolute(low_frames_dir, source.parent),
         }
-        metadata_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+        atlas_path = frames_dir.with_name(ATLAS_FILE_NAME)
+        if atlas_path.is_file():
+            payload["proxy_atlas"] = cls._relative_or_absolute(atlas_path, source.parent)
+        shared_writer.flush()
+        sequence_file_store.write_payload(metadata_path, payload)
         return str(metadata_path)
 
+    @classmethod
+    def set_proxy_atlas(cls, metadata_path: str, atlas_path: str) -> bool:
+        """Point an existing sidecar at a (re)built proxy atlas."""
+        shared_writer.flush()
+        payload = cls.read(metadata_path)
+        if payload is None:
+            return False
+        source = Path(metadata_path)
+        payload["proxy_atlas"] = cls._relative_or_absolute(Path(atlas_path).resolve(), source.parent)
+        sequence_file_store.write_payload(source, payload)
+        return True
+
     @staticmethod
     def read(metadata_path: str) -> dict | None:
         source = Path(metadata_path)
-        if not source.is_file() or source.suffix.lower() != ".json":
-            return None
-        try:
-            data = json.loads(source.read_text(encoding="utf-8"))
-        except (OSError, json.JSONDecodeError):
+        if source.suffix.lower() != ".json":
             return None
-        return data if isinstance(data, dict) else None
+        data = read_sidecar(source)
+        return copy.deepcopy(data) if data is not None else None
 
     @staticmethod
     def _relative_or_absolute(path: Path, parent: Path) -> str:
@@ -0,0 +1,97 @@
+"""Write-behind persistence for sidecar payloads.
+
+Changes are written on a background thread ``delay_s`` after the last
+change to the same file, so a burst of edits costs one write and the GUI
+thread never waits on the disk. Payloads handed to ``schedule`` must not be
+modified afterwards; callers build a new dict for every change.
+"""
+import threading
+import time
+from pathlib import Path
+
+from app.track_app.sections.video_manager import sequence_file_store
+
+
+class SidecarWriter:
+    DELAY_S = 0.5
+
+    def __init__(self, delay_s: float = DELAY_S):
+        self._delay_s = delay_s
+        self._condition = threading.Condition()
+        # path -> (due time, version, payload)
+        self._pending: dict[Path, tuple[float, int, dict]] = {}
+        self._version = 0
+        self._written: dict[Path, int] = {}
+        self._writing: dict[Path, int] = {}
+        self._write_lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    def schedule(self, path: Path, payload: dict) -> None:
+        with self._condition:
+            self._version += 1
+            self._pending[path] = (time.monotonic() + self._delay_s, self._version, payload)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="sidecar-writer", daemon=True)
+                self._thread.start()
+            self._condition.notify()
+
+    def is_pending(self, path: Path) -> bool:
+        """True from ``schedule`` until the payload is on disk."""
+        with self._condition:
+            return path in self._pending or path in self._writing
+
+    def flush(self) -> None:
+        """Write every pending payload now, on the calling thread.
+
+        Returns once nothing is left in flight, including a batch the
+        background thread was already writing.
+        """
+        with self._condition:
+            due = [(path, version, payload) for path, (_, version, payload) in self._pending.items()]
+            self._pending.clear()
+            self._mark_writing(due)
+        for path, version, payload in due:
+            self._write(path, version, payload)
+        with self._condition:
+            while self._writing:
+                self._condition.wait()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._pending:
+                    self._condition.wait()
+                now = time.monotonic()
+                next_due = min(due for due, _, _ in self._pending.values())
+                if next_due > now:
+                    self._condition.wait(next_due - now)
+                    continue
+                ready = [path for path, (due, _, _) in self._pending.items() if due <= now]
+                batch = [(path, *self._pending.pop(path)[1:]) for path in ready]
+                self._mark_writing(batch)
+            for path, version, payload in batch:
+                self._write(path, version, payload)
+
+    def _mark_writing(self, batch: list[tuple[Path, int, dict]]) -> None:
+        for path, version, _ in batch:
+            self._writing[path] = max(version, self._writing.get(path, 0))
+
+    def _write(self, path: Path, version: int, payload: dict) -> None:
+        # A flush can overtake the background thread; never let an older payload land last.
+        try:
+            with self._write_lock:
+                if version > self._written.get(path, 0):
+                    try:
+                        sequence_file_store.write_payload(path, payload)
+                        self._written[path] = version
+                    except OSError as err:
+                        print(f"Could not save {path}: {err}")
+        finally:
+            with self._condition:
+                if self._writing.get(path, 0) <= version:
+                    self._writing.pop(path, None)
+                self._condition.notify_all()
+
+
+# Shared by everything that saves sidecars, so a direct write can first flush the edits still pending.
+shared_writer = SidecarWriter()
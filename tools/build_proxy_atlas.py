@@ -0,0 +1,54 @@
+"""Pack an existing low_frames folder into a proxy atlas and reference it from the sidecar.
+
+Usage:
+    python -m tools.build_proxy_atlas <video>.dance_tracker.json [...]
+
+Extractions write the atlas when PACK_PROXY_ATLAS is set; this builds it for
+other folders (or rebuilds it after proxies were regenerated).
+"""
+import argparse
+import sys
+from pathlib import Path
+
+from app.track_app.sections.video_manager import sequence_file_store
+from app.track_app.sections.video_manager.manager import VideoManager
+from app.track_app.sections.video_manager.sequence_metadata_store import SequenceMetadataStore
+from utils.frame_source import scan_frame_files
+from utils.proxy_atlas import ATLAS_FILE_NAME
+
+
+def build_for_sidecar(metadata_path: Path) -> bool:
+    payload = sequence_file_store.read(metadata_path)
+    if payload is None:
+        print(f"{metadata_path}: not a sidecar file")
+        return False
+
+    frames_dir = sequence_file_store.resolve_path(payload.get("frames") or payload.get("frames_path"), metadata_path.parent)
+    low_frames_dir = sequence_file_store.resolve_path(payload.get("low_frames"), metadata_path.parent)
+    if frames_dir is None or low_frames_dir is None or not low_frames_dir.is_dir():
+        print(f"{metadata_path}: no low_frames folder")
+        return False
+
+    proxy_files = scan_frame_files(low_frames_dir)
+    atlas_path = frames_dir.with_name(ATLAS_FILE_NAME)
+    written = VideoManager.build_proxy_atlas(proxy_files, atlas_path)
+    if written == 0:
+        print(f"{metadata_path}: failed to build {atlas_path}")
+        return False
+
+    SequenceMetadataStore.set_proxy_atlas(str(metadata_path), str(atlas_path))
+    size_mb = atlas_path.stat().st_size / (1024 * 1024)
+    print(f"{metadata_path}: {written} frames -> {atlas_path} ({size_mb:.1f} MB)")
+    return True
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("sidecars", type=Path, nargs="+")
+    args = parser.parse_args()
+    results = [build_for_sidecar(path) for path in args.sidecars]
+    return 0 if all(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
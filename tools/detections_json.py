@@ -0,0 +1,55 @@
+"""Convert a sequence's detections between detections.dtdet and detections.json.
+
+Usage:
+    python -m tools.detections_json export <frames_dir> [--output detections.json]
+    python -m tools.detections_json import <frames_dir> [--input detections.json]
+
+The app keeps detections in the columnar detections.dtdet next to the
+frames folder; JSON is for inspection, hand edits and other tools. Import
+replaces the table with the JSON contents.
+"""
+import argparse
+import sys
+from pathlib import Path
+
+from app.track_app.sections.track_detector.detection_table import DetectionTable
+from app.track_app.sections.track_detector.detections_store import DetectionsStore
+
+
+def export_json(frames_dir: Path, output: Path | None) -> bool:
+    table, _ = DetectionsStore.read(str(frames_dir))
+    target = DetectionsStore.write_json(str(frames_dir), table, output)
+    print(f"{frames_dir}: {len(table)} detections in {table.frame_count} frames -> {target}")
+    return True
+
+
+def import_json(frames_dir: Path, source: Path | None) -> bool:
+    json_path = source or DetectionsStore.json_path(str(frames_dir))
+    if not json_path.is_file():
+        print(f"{json_path}: not found")
+        return False
+    detections, detector_name = DetectionsStore.read_json(str(frames_dir), json_path)
+    table = DetectionTable.from_frames(detections, detector_name or "")
+    DetectionsStore.write(str(frames_dir), table)
+    print(f"{json_path}: {len(table)} detections in {table.frame_count} frames -> {DetectionsStore.table_path(str(frames_dir))}")
+    return True
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    export_parser = subparsers.add_parser("export")
+    export_parser.add_argument("frames_dir", type=Path)
+    export_parser.add_argument("--output", type=Path)
+    import_parser = subparsers.add_parser("import")
+    import_parser.add_argument("frames_dir", type=Path)
+    import_parser.add_argument("--input", type=Path)
+    args = parser.parse_args()
+
+    if args.command == "export":
+        return 0 if export_json(args.frames_dir, args.output) else 1
+    return 0 if import_json(args.frames_dir, args.input) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
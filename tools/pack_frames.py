@@ -0,0 +1,72 @@
+"""Migrate extracted frames folders from one file per frame to a single frame archive.
+
+Usage:
+    python -m tools.pack_frames <frames_dir> [...] [--keep-files]
+
+The encoded images are copied byte for byte (no re-encoding) into
+<frames_dir>/frames.dtpack. Loose frame files are deleted only after the
+archive has been re-opened and checked, unless --keep-files is given.
+"""
+import argparse
+import sys
+from pathlib import Path
+
+from utils.frame_archive import FRAME_ARCHIVE_NAME, FrameArchiveWriter, open_frame_archive
+from utils.frame_source import scan_frame_files
+
+
+def pack_folder(frames_dir: Path, keep_files: bool) -> bool:
+    if open_frame_archive(frames_dir) is not None:
+        print(f"{frames_dir}: already packed")
+        return True
+
+    frame_files = scan_frame_files(frames_dir)
+    if not frame_files:
+        print(f"{frames_dir}: no frames found")
+        return False
+
+    suffixes = {path.suffix.lower() for path in frame_files}
+    if len(suffixes) != 1:
+        print(f"{frames_dir}: mixed image formats {sorted(suffixes)}, skipping")
+        return False
+
+    writer = FrameArchiveWriter(frames_dir / FRAME_ARCHIVE_NAME, suffix=suffixes.pop())
+    try:
+        for path in frame_files:
+            writer.append(path.read_bytes())
+    except OSError as exc:
+        writer.abort()
+        print(f"{frames_dir}: {exc}")
+        return False
+    writer.close()
+
+    archive = open_frame_archive(frames_dir)
+    if archive is None or len(archive) != len(frame_files) or any(
+        archive.frame_span(idx)[1] != path.stat().st_size for idx, path in enumerate(frame_files)
+    ):
+        print(f"{frames_dir}: archive verification failed, keeping loose files")
+        return False
+    for idx in (0, len(frame_files) // 2, len(frame_files) - 1):
+        if bytes(archive.frame_bytes(idx)) != frame_files[idx].read_bytes():
+            print(f"{frames_dir}: frame {idx} differs after packing, keeping loose files")
+            return False
+
+    archive_mb = (frames_dir / FRAME_ARCHIVE_NAME).stat().st_size / (1024 * 1024)
+    if not keep_files:
+        for path in frame_files:
+            path.unlink(missing_ok=True)
+    print(f"{frames_dir}: packed {len(frame_files)} frames ({archive_mb:.1f} MB)")
+    return True
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("frames_dirs", type=Path, nargs="+")
+    parser.add_argument("--keep-files", action="store_true", help="leave the per-frame files in place")
+    args = parser.parse_args()
+    results = [pack_folder(folder, args.keep_files) for folder in args.frames_dirs]
+    return 0 if all(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from typing import Protocol
+
+import numpy as np
+from PySide6.QtGui import QImage
+
+from utils.frame_source import FrameSource
+from utils.shared_frame_decode import decode_into_shared_memory
+
+THREAD_BACKEND = "thread"
+PROCESS_BACKEND = "process"
+
+
+class FrameDecoder(Protocol):
+    def decode(self, frames: FrameSource, idx: int) -> QImage | None: ...
+
+    def shutdown(self) -> None: ...
+
+
+def default_decode_workers() -> int:
+    return max(1, os.cpu_count() or 1)
+
+
+def to_display_format(image: QImage) -> QImage:
+    """Convert to the 32-bit format QPixmap uses, so promotion on the GUI thread is cheap."""
+    if image.hasAlphaChannel():
+        return image.convertToFormat(QImage.Format.Format_ARGB32_Premultiplied)
+    return image.convertToFormat(QImage.Format.Format_RGB32)
+
+
+def create_frame_decoder(backend: str, workers: int) -> FrameDecoder:
+    if backend == PROCESS_BACKEND:
+        return ProcessFrameDecoder(workers)
+    return ThreadFrameDecoder()
+
+
+class ThreadFrameDecoder:
+    """Decodes with QImage on the calling thread (Qt releases the GIL while decoding)."""
+
+    def decode(self, frames: FrameSource, idx: int) -> QImage | None:
+        frame = frames.decoded_frame(idx)
+        if frame is not None:
+            return VideoFrameImage(frame)
+
+        path = frames.file_path(idx)
+        image = QImage(str(path)) if path is not None else QImage.fromData(frames.read_bytes(idx))
+        return None if image.isNull() else image
+
+    def shutdown(self) -> None:
+        pass
+
+
+class SharedMemoryImage(QImage):
+    """RGB888 QImage that wraps a shared memory block without copying it.
+
+    QImage does not keep external buffers alive, so the block is owned here
+    and released when the image is garbage collected.
+    """
+
+    def __init__(self, shm: SharedMemory, width: int, height: int, stride: int):
+        super().__init__(shm.buf, width, height, stride, QImage.Format.Format_RGB888)
+        self._shm = shm
+
+
+class VideoFrameImage(QImage):
+    """BGR888 QImage over a decoded video frame array, which it keeps alive."""
+
+    def __init__(self, frame: np.ndarray):
+        height, width = frame.shape[:2]
+        super().__init__(frame.data, width, height, frame.strides[0], QImage.Format.Format_BGR888)
+        self._frame = frame
+
+
+class ProcessFrameDecoder:
+    """Decodes frames in worker processes and hands pixels back through shared memory.
+
+    The calling thread reads the image size from the file header, allocates a
+    shared memory block, and waits while a worker decodes into it. Formats whose
+    header cannot be parsed, and frames without a file span (video sources,
+    whose capture lives in this process), fall back to in-thread decoding.
+    """
+
+    def __init__(self, workers: int):
+        self._workers = max(1, workers)
+        self._pool: ProcessPoolExecutor | None = None
+        self._pool_lock = threading.Lock()
+        self._fallback = ThreadFrameDecoder()
+
+    def decode(self, frames: FrameSource, idx: int) -> QImage | None:
+        span = frames.file_span(idx)
+        size = frames.image_size(idx)
+        if span is None or size is None:
+            return self._fallback.decode(frames, idx)
+
+        path, offset, length = span
+
+        width, height = size
+        stride = (width * 3 + 3) & ~3
+        shm = SharedMemory(create=True, size=stride * height)
+        try:
+            decoded = self._executor().submit(
+                decode_into_shared_memory, str(path), shm.name, width, height, stride, offset, length
+            ).result()
+        except Exception:
+            decoded = False
+        finally:
+            shm.unlink()
+
+        if not decoded:
+            shm.close()
+            return self._fallback.decode(frames, idx)
+        return SharedMemoryImage(shm, width, height, stride)
+
+    def shutdown(self) -> None:
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _executor(self) -> ProcessPoolExecutor:
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self._workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._pool
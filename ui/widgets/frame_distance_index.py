@@ -0,0 +1,49 @@
+from bisect import bisect_left, insort
+
+
+class FrameDistanceIndex:
+    """Sorted set of frame numbers that evicts those farthest from a centre.
+
+    The farthest member of a sorted set is always at one of its ends, so
+    eviction only compares the two ends instead of scanning every key.
+    """
+
+    def __init__(self):
+        self._frames: list[int] = []
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+    def __contains__(self, frame_idx: int) -> bool:
+        pos = bisect_left(self._frames, frame_idx)
+        return pos < len(self._frames) and self._frames[pos] == frame_idx
+
+    def add(self, frame_idx: int) -> None:
+        if frame_idx not in self:
+            insort(self._frames, frame_idx)
+
+    def discard(self, frame_idx: int) -> None:
+        pos = bisect_left(self._frames, frame_idx)
+        if pos < len(self._frames) and self._frames[pos] == frame_idx:
+            del self._frames[pos]
+
+    def clear(self) -> None:
+        self._frames.clear()
+
+    def evict_farthest(self, center_frame: int, keep: int) -> list[int]:
+        """Drop frames farthest from ``center_frame`` until ``keep`` remain; return them."""
+        excess = len(self._frames) - max(0, keep)
+        if excess <= 0:
+            return []
+
+        frames = self._frames
+        lo, hi = 0, len(frames) - 1
+        for _ in range(excess):
+            if center_frame - frames[lo] >= frames[hi] - center_frame:
+                lo += 1
+            else:
+                hi -= 1
+
+        evicted = frames[:lo] + frames[hi + 1 :]
+        self._frames = frames[lo : hi + 1]
+        return evicted
@@ -1,23 +1,39 @@
 import threading
-from pathlib import Path
 
 from PySide6.QtCore import QObject, Signal
 from PySide6.QtGui import QImage
 
+from ui.widgets.frame_decoders import FrameDecoder, ThreadFrameDecoder, default_decode_workers
+from ui.widgets.image_budget_cache import ImageBudgetCache
+from ui.widgets.preload_scheduler import PreloadScheduler
+from utils.frame_source import FrameSource
+
 
 class FramePreloader(QObject):
     frame_preloaded = Signal(int, bool, int)
     preload_finished = Signal(int)
 
-    def __init__(self):
+    def __init__(
+        self,
+        max_bytes: int = 0,
+        urgent_radius: int = 0,
+        decoder: FrameDecoder | None = None,
+        workers: int = 0,
+    ):
         super().__init__()
+        self._decoder = decoder or ThreadFrameDecoder()
+        self._worker_count = workers if workers > 0 else default_decode_workers()
         self._stop = threading.Event()
         self._threads: list[threading.Thread] = []
         self._generation = 0
         self._priority = 0
+        self._urgent_radius = urgent_radius
         self._lock = threading.Lock()
-        self._full_images: list[QImage | None] = []
+        self._work_available = threading.Condition(self._lock)
+        self._scheduler = PreloadScheduler(0, [], urgent_radius)
+        self._full_images = ImageBudgetCache(max_bytes)
         self._loaded_flags: list[bool] = []
+        self._finished_emitted = False
 
     @property
     def loaded_flags(self) -> list[bool]:
@@ -30,85 +46,121 @@ class FramePreloader(QObject):
 
     def get_image(self, idx: int) -> QImage | None:
         with self._lock:
-            return self._full_images[idx] if idx < len(self._full_images) else None
+            return self._full_images.get(idx)
 
     def set_priority(self, frame_idx: int) -> None:
         with self._lock:
             self._priority = frame_idx
-
-    def start(self, frame_files: list[Path], bookmark_anchors: list[int]) -> None:
-        if not frame_files:
+            self._full_images.set_playhead(frame_idx)
+            self._scheduler.set_playhead(frame_idx)
+            radius = self._budget_radius()
+            if radius is not None:
+                self._scheduler.requeue_evicted(frame_idx, radius)
+                # The window moved with the playhead; idle workers may have frames to decode again.
+                self._work_available.notify_all()
+
+    def start(self, frames: FrameSource, bookmark_anchors: list[int]) -> None:
+        if len(frames) == 0:
             return
 
         self._stop.clear()
-        total_frames = len(frame_files)
+        total_frames = len(frames)
+        scheduler = PreloadScheduler(
+            total_frames,
+            seeds=[0, total_frames // 2, total_frames - 1, *bookmark_anchors],
+            urgent_radius=self._urgent_radius,
+        )
 
         with self._lock:
             self._generation += 1
             generation = self._generation
-            self._full_images = [None] * total_frames
+            self._scheduler = scheduler
+            self._full_images.clear()
+            self._full_images.set_playhead(0)
             self._loaded_flags = [False] * total_frames
             self._priority = 0
+            self._finished_emitted = False
 
-        anchors = [0, total_frames // 2, total_frames - 1, *bookmark_anchors]
-        unique_anchors: list[int] = []
-        for anchor in anchors:
-            if 0 <= anchor < total_frames and anchor not in unique_anchors:
-                unique_anchors.append(anchor)
+        worker_count = max(1, min(self._worker_count, total_frames))
+        in_flight = 0
 
-        pending = set(range(total_frames))
-        remaining_workers = len(unique_anchors)
+        def is_current() -> bool:
+            return not self._stop.is_set() and generation == self._generation
 
-        def preload_worker(anchor: int) -> None:
-            nonlocal remaining_workers
+        def preload_worker() -> None:
+            nonlocal in_flight
             while True:
-                if self._stop.is_set() or generation != self._generation:
-                    return
-
+                emit_finished = False
                 with self._lock:
-                    if not pending:
-                        break
-                    idx = min(pending, key=lambda i: abs(i - anchor))
-                    pending.remove(idx)
-
-                image = QImage(str(frame_files[idx]))
-                if self._stop.is_set() or generation != self._generation:
-                    return
+                    idx = None
+                    while is_current():
+                        idx = scheduler.next_frame()
+                        if idx is not None:
+                            in_flight += 1
+                            break
+                        # Frames left pending outside the budget window mean the sequence is not done yet.
+                        if in_flight == 0 and scheduler.pending_count == 0 and not self._finished_emitted:
+                            self._finished_emitted = emit_finished = True
+                            break
+                        self._work_available.wait()
+                    if not is_current():
+                        return
 
-                if image.isNull():
-                    self._safe_emit_preloaded(idx, False, generation)
+                if emit_finished:
+                    try:
+                        self.preload_finished.emit(generation)
+                    except RuntimeError:
+                        return
                     continue
 
+                image = self._decoder.decode(frames, idx)
+
                 with self._lock:
-                    if idx >= len(self._full_images):
+                    in_flight -= 1
+                    if not is_current():
                         return
-                    self._full_images[idx] = image
-                    if idx < len(self._loaded_flags):
+                    if scheduler.pending_count == 0 and in_flight == 0:
+                        self._work_available.notify_all()
+                    if image is None:
+                        evicted = None
+                    else:
+                        evicted = self._full_images.put(idx, image)
+                        scheduler.set_window(self._budget_radius())
                         self._loaded_flags[idx] = True
+                        for evicted_idx in evicted:
+                            self._loaded_flags[evicted_idx] = False
+                            scheduler.mark_evicted(evicted_idx)
 
-                self._safe_emit_preloaded(idx, True, generation)
-
-            should_emit_finished = False
-            with self._lock:
-                remaining_workers -= 1
-                should_emit_finished = remaining_workers == 0
-
-            if should_emit_finished and not self._stop.is_set() and generation == self._generation:
-                try:
-                    self.preload_finished.emit(generation)
-                except RuntimeError:
-                    return
+                if evicted is None:
+                    self._safe_emit_preloaded(idx, False, generation)
+                    continue
+                if idx not in evicted:
+                    self._safe_emit_preloaded(idx, True, generation)
+                for evicted_idx in evicted:
+                    self._safe_emit_preloaded(evicted_idx, False, generation)
 
         self._threads = []
-        for anchor in unique_anchors:
-            thread = threading.Thread(target=preload_worker, args=(anchor,), daemon=True)
+        for _ in range(worker_count):
+            thread = threading.Thread(target=preload_worker, daemon=True)
             self._threads.append(thread)
             thread.start()
 
+    def extend(self, total_frames: int) -> None:
+        """Queue frames appended to the running source; preload_finished fires again once they are done."""
+        with self._lock:
+            added = total_frames - len(self._loaded_flags)
+            if added <= 0 or self._stop.is_set():
+                return
+            self._scheduler.extend(total_frames)
+            self._loaded_flags.extend([False] * added)
+            self._finished_emitted = False
+            self._work_available.notify_all()
+
     def stop(self, wait: bool = False) -> None:
         self._stop.set()
         with self._lock:
             self._generation += 1
+            self._work_available.notify_all()
         threads = list(self._threads)
         self._threads = []
         if wait:
@@ -116,11 +168,21 @@ class FramePreloader(QObject):
                 if thread.is_alive():
                     thread.join(timeout=0.5)
 
+    def shutdown(self) -> None:
+        self.stop(wait=True)
+        self._decoder.shutdown()
+
     def reset(self) -> None:
         with self._lock:
-            self._full_images = []
+            self._full_images.clear()
             self._loaded_flags = []
             self._priority = 0
+            self._scheduler = PreloadScheduler(0, [], self._urgent_radius)
+
+    def _budget_radius(self) -> int | None:
+        """How far from the playhead decoded frames still fit in the byte budget (caller holds the lock)."""
+        capacity = self._full_images.capacity_frames
+        return None if capacity is None else capacity * 2 // 5
 
     def _safe_emit_preloaded(self, idx: int, loaded: bool, generation: int) -> None:
         try:
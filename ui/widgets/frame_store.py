@@ -1,52 +1,124 @@
-import re
 from pathlib import Path
 
-from PySide6.QtCore import QObject, Signal
-from PySide6.QtGui import QPixmap
+from PySide6.QtCore import QObject, QTimer, Signal
+from PySide6.QtGui import QImage, QPixmap
 
+from ui.widgets.frame_decoders import THREAD_BACKEND, create_frame_decoder, default_decode_workers
 from ui.widgets.frame_preloader import FramePreloader
+from ui.widgets.mipmap_builder import MipmapBuilder
 from ui.widgets.pixmap_cache import PixmapCache
+from ui.widgets.playhead_motion import PlayheadMotion
+from ui.widgets.proxy_builder import ProxyBuilder
+from ui.widgets.proxy_loader import ProxyLoader
+from ui.widgets.proxy_stores import DECODED_PROXY_STORE, AtlasProxyStore, create_proxy_store
 from ui.widgets.sidecar_metadata_reader import SidecarMetadataReader
+from utils.frame_source import (
+    FolderFrameSource,
+    FrameSource,
+    frame_file_name,
+    open_frame_source,
+    scan_frame_files,
+)
+from utils.mipmaps import level_size, missing_mipmap_levels, open_mipmap_levels
+from utils.proxy_atlas import open_proxy_atlas
+from utils.video_frame_source import VideoFrameIndex, VideoFrameSource
 
-_VALID_SUFFIXES = {".png", ".jpg", ".jpeg", ".bmp", ".webp"}
-
-
-def _scan_folder(folder: Path) -> list[Path]:
-    return [
-        p
-        for p in sorted(folder.iterdir(), key=_natural_sort_key)
-        if p.is_file() and p.suffix.lower() in _VALID_SUFFIXES
-    ]
 
+class FrameStore(QObject):
+    """Frames of the loaded sequence for display: preloading, pixmap cache and proxies.
 
-def _natural_sort_key(path: Path):
-    chunks = re.split(r"(\d+)", path.name.lower())
-    return [int(chunk) if chunk.isdigit() else chunk for chunk in chunks]
+    Full-resolution display frames come from the smallest mipmap level that
+    covers the size ``get_frame`` is asked for, falling back to the source
+    frames. Switching level restarts the preloader on that level's source and
+    emits ``display_source_changed`` with the new preload generation.
 
+    Proxies are mapped per frame, so a folder with only some of them still
+    uses those; the missing ones are generated in the background and loaded
+    as each is written.
+    """
 
-class FrameStore(QObject):
     VIDEO_SUFFIXES = {".mp4", ".mov", ".avi", ".mkv", ".m4v", ".webm"}
+    LEVEL_SWITCH_DELAY_MS = 250
 
     frame_preloaded = Signal(int, bool, int)
     preload_finished = Signal(int)
+    frame_ready = Signal(int, bool)
+    proxies_finished = Signal(int)
+    display_source_changed = Signal(int)
 
-    def __init__(self, cache_radius: int):
+    def __init__(
+        self,
+        cache_radius: int,
+        cache_max_mb: int = 0,
+        decode_backend: str = THREAD_BACKEND,
+        decode_workers: int = 0,
+        proxy_store: str = DECODED_PROXY_STORE,
+        mipmaps: bool = False,
+        build_proxies: bool = False,
+    ):
         super().__init__()
-        self._frame_files: list[Path] = []
-        self._proxy_files: list[Path] = []
+        self._frames: FrameSource = FolderFrameSource([])
+        self._display_frames: FrameSource = self._frames
+        self._mipmaps_enabled = mipmaps
+        self._mipmap_levels: list[tuple[int, FrameSource]] = []
+        self._folder: Path | None = None
+        self._source_size: tuple[int, int] | None = None
+        self._target_size: tuple[int, int] | None = None
+        self._display_level = 0
+        self._bookmark_anchors: list[int] = []
+        self._level_switch = QTimer(self)
+        self._level_switch.setSingleShot(True)
+        self._level_switch.setInterval(self.LEVEL_SWITCH_DELAY_MS)
+        self._level_switch.timeout.connect(self._apply_display_level)
+        self._mipmap_builder = MipmapBuilder()
+        self._mipmap_builder.levels_built.connect(self._on_mipmaps_built)
+        self._proxy_files: list[Path | None] = []
+        self._has_proxies = False
+        self._build_proxies = build_proxies
+        self._proxies_loading = False
+        self._proxies_building = False
+        self._proxy_atlas: AtlasProxyStore | None = None
+        self._growing_folder: Path | None = None
         self._metadata = SidecarMetadataReader()
         self._cache = PixmapCache(cache_radius)
-        self._preloader = FramePreloader()
+        self._cache.frame_ready.connect(self.frame_ready)
+        self._motion = PlayheadMotion()
+        self._motion_settle = QTimer(self)
+        self._motion_settle.setSingleShot(True)
+        self._motion_settle.setInterval(int(PlayheadMotion.IDLE_S * 1000))
+        self._motion_settle.timeout.connect(self._on_motion_settled)
+        workers = decode_workers if decode_workers > 0 else default_decode_workers()
+        self._preloader = FramePreloader(
+            max_bytes=cache_max_mb * 1024 * 1024,
+            urgent_radius=cache_radius,
+            decoder=create_frame_decoder(decode_backend, workers),
+            workers=workers,
+        )
         self._preloader.frame_preloaded.connect(self.frame_preloaded)
         self._preloader.preload_finished.connect(self.preload_finished)
+        self._proxy_loader = ProxyLoader(create_proxy_store(proxy_store))
+        self._proxy_loader.proxy_loaded.connect(self._on_proxy_loaded)
+        self._proxy_loader.proxies_finished.connect(self._on_proxies_loaded)
+        self._proxy_builder = ProxyBuilder(workers=max(1, workers // 2))
+        self._proxy_builder.proxies_built.connect(self._on_proxies_built)
 
     @property
     def total_frames(self) -> int:
-        return len(self._frame_files)
+        return len(self._frames)
+
+    @property
+    def is_growing(self) -> bool:
+        """True while the loaded folder is still being written by an extraction."""
+        return self._growing_folder is not None
+
+    @property
+    def display_level(self) -> int:
+        """Longer side of the mipmap level frames are decoded from; 0 means the source frames."""
+        return self._display_level
 
     @property
     def has_proxy_frames(self) -> bool:
-        return bool(self._proxy_files)
+        return self._has_proxies or self._proxy_atlas is not None
 
     @property
     def loaded_flags(self) -> list[bool]:
@@ -56,44 +128,284 @@ class FrameStore(QObject):
     def preload_generation(self) -> int:
         return self._preloader.generation
 
+    @property
+    def proxy_generation(self) -> int:
+        return self._proxy_loader.generation
+
+    @property
+    def proxy_loaded_count(self) -> int:
+        if self._proxy_atlas is not None:
+            return self._proxy_atlas.loaded_count
+        return self._proxy_loader.loaded_count
+
     def shutdown(self) -> None:
-        self._preloader.stop(wait=True)
+        self._motion_settle.stop()
+        self._level_switch.stop()
+        self._mipmap_builder.stop(wait=True)
+        self._proxy_builder.stop(wait=True)
+        self._proxy_loader.stop(wait=True)
+        self._preloader.shutdown()
+        self._cache.shutdown()
+        self._report_cache_stats()
+        self._close_sources()
 
     def clear(self) -> None:
+        self._level_switch.stop()
+        self._mipmap_builder.stop(wait=True)
+        self._proxy_builder.stop(wait=True)
         self._preloader.stop(wait=True)
-        self._frame_files = []
+        self._proxy_loader.stop(wait=True)
+        self._report_cache_stats()
+        self._close_sources()
+        self._frames = FolderFrameSource([])
+        self._display_frames = self._frames
+        self._mipmap_levels = []
+        self._folder = None
+        self._source_size = None
+        self._display_level = 0
+        self._bookmark_anchors = []
         self._proxy_files = []
+        self._has_proxies = False
+        self._proxies_loading = False
+        self._proxies_building = False
+        self._proxy_atlas = None
+        self._growing_folder = None
+        self._motion.reset()
         self._cache.clear()
         self._preloader.reset()
+        self._proxy_loader.reset()
 
     def load_folder(self, folder_path: str) -> int:
-        self._preloader.stop(wait=True)
-
+        """Load an extracted frames folder."""
         folder = Path(folder_path)
         if not folder.exists() or not folder.is_dir():
             self.clear()
             return 0
 
-        self._frame_files = _scan_folder(folder)
-        self._proxy_files = self._metadata.find_proxy_files(folder, self._frame_files)
+        return self._load_source(open_frame_source(folder), folder)
+
+    def load_video(self, video_path: str, index: VideoFrameIndex) -> int:
+        """Decode frames straight from ``video_path`` without extracting them first.
+
+        ``index`` comes from the background load: building it reads every
+        packet of the file, which must not happen on the GUI thread. Proxies
+        and bookmarks are looked up for the ``frames`` folder an extraction
+        would create next to the video.
+        """
+        try:
+            frames = VideoFrameSource(video_path, index)
+        except (OSError, ValueError):
+            self.clear()
+            return 0
+        return self._load_source(frames, Path(video_path).parent / "frames")
+
+    def load_growing_folder(self, folder_path: str, available_frames: int) -> int:
+        """Open the first ``available_frames`` frames of a folder an extraction is still writing.
+
+        Only the contiguous prefix reported by the extraction is used: files
+        past it may be half written or belong to a later segment. Call
+        ``extend_growing_folder`` as the prefix grows and ``load_folder`` once
+        the extraction has finished.
+        """
+        folder = Path(folder_path)
+        files = scan_frame_files(folder)[:available_frames]
+        if not files:
+            self.clear()
+            return 0
+        # The extraction writes mipmap levels and proxies too, but only the finished folder has them all.
+        frame_count = self._load_source(FolderFrameSource(files), folder, complete=False)
+        self._growing_folder = folder
+        return frame_count
+
+    def extend_growing_folder(self, available_frames: int) -> int:
+        """Make newly extracted frames of the growing folder available; returns the frame count."""
+        frames = self._frames
+        if self._growing_folder is None or not isinstance(frames, FolderFrameSource):
+            return len(frames)
+        if available_frames <= len(frames):
+            return len(frames)
+        # Extraction names frames by index, so the new files need no directory listing.
+        frames.extend([self._growing_folder / frame_file_name(idx) for idx in range(len(frames), available_frames)])
+        self._preloader.extend(len(frames))
+        return len(frames)
+
+    def _load_source(self, frames: FrameSource, folder: Path, complete: bool = True) -> int:
+        self._level_switch.stop()
+        self._mipmap_builder.stop(wait=True)
+        self._proxy_builder.stop(wait=True)
+        self._preloader.stop(wait=True)
+        self._proxy_loader.stop(wait=True)
+        self._report_cache_stats()
+        self._close_sources()
+        self._frames = frames
+        self._folder = folder
+        self._growing_folder = None
+        self._source_size = frames.image_size(0) if len(frames) else None
+        self._mipmap_levels = []
+        if complete and self._mipmaps_enabled and self._source_size is not None:
+            self._mipmap_levels = open_mipmap_levels(folder, len(frames))
+            self._start_mipmap_build(frames, folder)
+        self._display_level = self._level_for(self._target_size)
+        self._display_frames = self._level_source(self._display_level)
+        self._motion.reset()
         self._cache.clear()
-        bookmark_anchors = self._metadata.read_bookmark_anchor_frames(folder, len(self._frame_files))
-        self._cache.preload_proxy(self._proxy_files)
-        self._preloader.start(self._frame_files, bookmark_anchors)
-        return len(self._frame_files)
+        self._proxy_loader.reset()
+        self._proxy_atlas = self._open_proxy_atlas(folder)
+        self._proxy_files = []
+        self._proxies_loading = self._proxies_building = False
+        if self._proxy_atlas is None:
+            self._proxy_files = self._metadata.find_proxy_files(folder, frames)
+            self._proxies_loading = bool(self._proxy_files)
+            self._proxy_loader.start(self._proxy_files)
+            self._proxies_building = complete and self._build_proxies and self._start_proxy_build(frames, folder)
+        self._has_proxies = self._proxies_building or any(path is not None for path in self._proxy_files)
+        self._bookmark_anchors = self._metadata.read_bookmark_anchor_frames(folder, len(self._frames))
+        self._preloader.start(self._display_frames, self._bookmark_anchors)
+        return len(self._frames)
 
     def request_preload_priority(self, frame_idx: int) -> None:
-        if not self._frame_files:
+        if len(self._frames) == 0:
             return
-        target = max(0, min(frame_idx, len(self._frame_files) - 1))
+        target = max(0, min(frame_idx, len(self._frames) - 1))
         self._preloader.set_priority(target)
+        self._proxy_loader.set_priority(target)
+        self._proxy_builder.set_priority(target)
+        self._motion.record(target)
+        self._cache.set_motion(self._motion.direction, self._motion.is_fast_scrub)
+        self._motion_settle.start()
+
+    def get_frame(
+        self, frame_idx: int, use_proxy: bool = False, target_size: tuple[int, int] | None = None
+    ) -> QPixmap | None:
+        """Best pixmap available now for ``frame_idx``, or None.
 
-    def get_frame(self, frame_idx: int, use_proxy: bool = False) -> QPixmap | None:
-        if not self._frame_files or frame_idx < 0 or frame_idx >= len(self._frame_files):
+        ``target_size`` is the (width, height) in device pixels the frame is
+        drawn at; decoding moves to the smallest mipmap level covering it
+        once the size has been stable for ``LEVEL_SWITCH_DELAY_MS``.
+        """
+        if frame_idx < 0 or frame_idx >= len(self._frames):
             return None
+        if target_size is not None:
+            self._request_target_size(target_size)
         return self._cache.get(
-            frame_idx, use_proxy, self._frame_files, self._proxy_files, self._preloader.get_image
+            frame_idx,
+            use_proxy and self.has_proxy_frames,
+            self._display_frames,
+            self._preloader.get_image,
+            self._get_proxy_image,
         )
 
     def get_display_size(self, frame_idx: int) -> tuple[int, int] | None:
-        return self._cache.get_display_size(frame_idx, self._frame_files, self._preloader.get_image)
+        return self._cache.get_display_size(frame_idx, self._display_frames, self._preloader.get_image)
+
+    # ── Mipmap levels ────────────────────────────────────────────────
+
+    def _request_target_size(self, target_size: tuple[int, int]) -> None:
+        if target_size == self._target_size:
+            return
+        self._target_size = target_size
+        if self._level_for(target_size) != self._display_level:
+            self._level_switch.start()
+        else:
+            self._level_switch.stop()
+
+    def _level_for(self, target_size: tuple[int, int] | None) -> int:
+        if target_size is None or self._source_size is None:
+            return 0
+        width, height = self._source_size
+        for level, _ in self._mipmap_levels:
+            level_width, level_height = level_size(width, height, level)
+            if level_width >= target_size[0] and level_height >= target_size[1]:
+                return level
+        return 0
+
+    def _level_source(self, level: int) -> FrameSource:
+        return next((source for lvl, source in self._mipmap_levels if lvl == level), self._frames)
+
+    def _apply_display_level(self) -> None:
+        level = self._level_for(self._target_size)
+        if level == self._display_level or len(self._frames) == 0:
+            return
+        self._display_level = level
+        self._display_frames = self._level_source(level)
+        self._preloader.stop(wait=True)
+        self._cache.clear()
+        self._preloader.start(self._display_frames, self._bookmark_anchors)
+        self.display_source_changed.emit(self._preloader.generation)
+
+    def _start_mipmap_build(self, frames: FrameSource, folder: Path) -> None:
+        if isinstance(frames, VideoFrameSource) or self._source_size is None:
+            return
+        missing = missing_mipmap_levels(folder, len(frames), *self._source_size)
+        if missing:
+            self._mipmap_builder.start(frames, folder, missing)
+
+    def _on_mipmaps_built(self, generation: int) -> None:
+        if generation != self._mipmap_builder.generation or isinstance(self._frames, VideoFrameSource):
+            return
+        if self._folder is None:
+            return
+        self._mipmap_levels = open_mipmap_levels(self._folder, len(self._frames))
+        self._apply_display_level()
+
+    # ── Generated proxies ────────────────────────────────────────────
+
+    def _start_proxy_build(self, frames: FrameSource, folder: Path) -> bool:
+        if not isinstance(frames, FolderFrameSource):
+            return False
+        generation = self._proxy_loader.generation
+
+        def on_proxy(idx: int, path: Path) -> None:
+            self._proxy_loader.add(idx, path, generation)
+
+        return self._proxy_builder.start(frames, folder, self._proxy_files, on_proxy)
+
+    def _on_proxies_loaded(self, generation: int) -> None:
+        if generation != self._proxy_loader.generation:
+            return
+        self._proxies_loading = False
+        if not self._proxies_building:
+            self.proxies_finished.emit(generation)
+
+    def _on_proxies_built(self, generation: int) -> None:
+        if generation != self._proxy_builder.generation:
+            return
+        self._proxies_building = False
+        if not self._proxies_loading:
+            self.proxies_finished.emit(self._proxy_loader.generation)
+
+    def _report_cache_stats(self) -> None:
+        """Log how the display cache served the sequence being closed."""
+        stats = self._cache.stats
+        if self._folder is None or stats.hits + stats.misses == 0:
+            return
+        print(
+            f"Frame cache for {self._folder}: {stats.hits} hits, {stats.misses} misses "
+            f"({stats.hit_rate:.0%}), {stats.evictions} evictions"
+        )
+
+    def _close_sources(self) -> None:
+        self._frames.close()
+        for _, source in self._mipmap_levels:
+            source.close()
+        if self._proxy_atlas is not None:
+            self._proxy_atlas.close()
+
+    def _open_proxy_atlas(self, folder: Path) -> AtlasProxyStore | None:
+        atlas_path = self._metadata.find_proxy_atlas(folder)
+        atlas = open_proxy_atlas(atlas_path, len(self._frames)) if atlas_path is not None else None
+        return AtlasProxyStore(atlas) if atlas is not None else None
+
+    def _get_proxy_image(self, frame_idx: int) -> QImage | None:
+        if self._proxy_atlas is not None:
+            return self._proxy_atlas.get_image(frame_idx)
+        return self._proxy_loader.get_image(frame_idx)
+
+    def _on_motion_settled(self) -> None:
+        self._cache.set_motion(0, False)
+        self._cache.refresh_window()
+
+    def _on_proxy_loaded(self, frame_idx: int, generation: int) -> None:
+        if generation != self._proxy_loader.generation:
+            return
+        self.frame_ready.emit(frame_idx, True)
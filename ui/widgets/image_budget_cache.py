@@ -0,0 +1,106 @@
+from PySide6.QtGui import QImage
+
+
+class ImageBudgetCache:
+    """Byte-bounded store of decoded full-resolution frames.
+
+    Not thread-safe: the owner serialises access with its own lock.
+
+    Eviction prefers frames far from the playhead. Distances are grouped in
+    bands (1/``DISTANCE_BANDS`` of the cached frame count wide) and, inside a
+    band, the least recently used frame goes first. Eviction runs in batches
+    down to a low-water mark so the victim ordering is not recomputed on every
+    insert.
+    """
+
+    DISTANCE_BANDS = 16
+    LOW_WATER_RATIO = 0.9
+
+    def __init__(self, max_bytes: int):
+        self._max_bytes = max(0, max_bytes)
+        self._images: dict[int, QImage] = {}
+        self._sizes: dict[int, int] = {}
+        self._last_used: dict[int, int] = {}
+        self._clock = 0
+        self._used_bytes = 0
+        self._playhead = 0
+
+    @property
+    def max_bytes(self) -> int:
+        return self._max_bytes
+
+    @property
+    def used_bytes(self) -> int:
+        return self._used_bytes
+
+    @property
+    def capacity_frames(self) -> int | None:
+        """Estimated number of frames that fit in the budget, None when unbounded or unknown."""
+        if self._max_bytes <= 0 or not self._images or self._used_bytes <= 0:
+            return None
+        return max(1, self._max_bytes * len(self._images) // self._used_bytes)
+
+    def __len__(self) -> int:
+        return len(self._images)
+
+    def __contains__(self, frame_idx: int) -> bool:
+        return frame_idx in self._images
+
+    def set_playhead(self, frame_idx: int) -> None:
+        self._playhead = frame_idx
+
+    def get(self, frame_idx: int) -> QImage | None:
+        image = self._images.get(frame_idx)
+        if image is not None:
+            self._touch(frame_idx)
+        return image
+
+    def put(self, frame_idx: int, image: QImage) -> list[int]:
+        """Store ``image`` and return the frames evicted to stay under budget.
+
+        The returned list may contain ``frame_idx`` itself when the new frame
+        is the worst candidate to keep.
+        """
+        self.discard(frame_idx)
+        size = max(0, int(image.sizeInBytes()))
+        self._images[frame_idx] = image
+        self._sizes[frame_idx] = size
+        self._used_bytes += size
+        self._touch(frame_idx)
+
+        if self._max_bytes <= 0 or self._used_bytes <= self._max_bytes:
+            return []
+        return self._evict_to(int(self._max_bytes * self.LOW_WATER_RATIO))
+
+    def discard(self, frame_idx: int) -> None:
+        if self._images.pop(frame_idx, None) is None:
+            return
+        self._used_bytes -= self._sizes.pop(frame_idx, 0)
+        self._last_used.pop(frame_idx, None)
+
+    def clear(self) -> None:
+        self._images.clear()
+        self._sizes.clear()
+        self._last_used.clear()
+        self._used_bytes = 0
+        self._clock = 0
+
+    def _touch(self, frame_idx: int) -> None:
+        self._clock += 1
+        self._last_used[frame_idx] = self._clock
+
+    def _evict_to(self, target_bytes: int) -> list[int]:
+        playhead = self._playhead
+        band = max(1, len(self._images) // self.DISTANCE_BANDS)
+        victims = sorted(
+            self._images,
+            key=lambda idx: (-(abs(idx - playhead) // band), self._last_used.get(idx, 0)),
+        )
+
+        evicted: list[int] = []
+        for idx in victims:
+            if self._used_bytes <= target_bytes:
+                break
+            self.discard(idx)
+            evicted.append(idx)
+        return evicted
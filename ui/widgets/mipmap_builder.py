@@ -0,0 +1,60 @@
+import threading
+from pathlib import Path
+
+from PySide6.QtCore import QObject, Signal
+
+from utils.frame_source import FrameSource
+from utils.mipmaps import build_mipmaps
+
+
+class MipmapBuilder(QObject):
+    """Builds the missing mipmap levels of a loaded sequence on one background thread.
+
+    One thread keeps the build from competing with the preloader for more
+    than a core; ``levels_built`` fires once every frame has its levels.
+    """
+
+    levels_built = Signal(int)
+
+    def __init__(self):
+        super().__init__()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._generation = 0
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def start(self, frames: FrameSource, frames_dir: Path, levels: list[int]) -> None:
+        self.stop(wait=True)
+        if not levels or len(frames) == 0:
+            return
+
+        self._stop = threading.Event()
+        self._generation += 1
+        generation = self._generation
+        stop = self._stop
+
+        def build() -> None:
+            try:
+                build_mipmaps(frames, frames_dir, levels, should_cancel=stop.is_set)
+            except (OSError, ValueError) as err:
+                print(f"Mipmap build stopped for {frames_dir}: {err}")
+                return
+            if stop.is_set():
+                return
+            try:
+                self.levels_built.emit(generation)
+            except RuntimeError:
+                pass
+
+        self._thread = threading.Thread(target=build, name="mipmap-build", daemon=True)
+        self._thread.start()
+
+    def stop(self, wait: bool = False) -> None:
+        self._stop.set()
+        thread = self._thread
+        self._thread = None
+        if wait and thread is not None and thread.is_alive():
+            thread.join(timeout=0.5)
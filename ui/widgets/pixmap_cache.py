@@ -1,150 +1,312 @@
-import re
-from collections import OrderedDict
-from pathlib import Path
+import threading
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass
 from typing import Callable
 
+from PySide6.QtCore import QObject, QTimer, Signal
 from PySide6.QtGui import QImage, QPixmap
 
-_VALID_SUFFIXES = {".png", ".jpg", ".jpeg", ".bmp", ".webp"}
+from ui.widgets.frame_decoders import ThreadFrameDecoder, to_display_format
+from ui.widgets.frame_distance_index import FrameDistanceIndex
+from utils.frame_source import FrameSource
 
 
-def _natural_sort_key(path: Path):
-    chunks = re.split(r"(\d+)", path.name.lower())
-    return [int(chunk) if chunk.isdigit() else chunk for chunk in chunks]
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
 
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class PixmapCache(QObject):
+    """Display cache of QPixmaps around the current frame.
+
+    ``get`` never decodes from disk on the calling (GUI) thread. Full-resolution
+    misses are queued for background workers that produce display-ready
+    QImages, and the main thread promotes them to QPixmaps in small
+    time-sliced batches, emitting ``frame_ready`` for each one.
+
+    Full-resolution pixmaps are bounded to the radius window and evicted
+    farthest-from-centre first. While the playhead moves the window leans
+    towards the direction of travel; during fast scrubbing or in proxy mode
+    nothing is prefetched and frames come from the proxy loader instead.
+    Proxy pixmaps are wrapped lazily and kept in a small LRU.
+    """
+
+    frame_ready = Signal(int, bool)
+    _images_ready = Signal()
+
+    PREFETCH_WORKERS = 2
+    PROMOTE_BUDGET_S = 0.004
+    TRAILING_FRACTION = 0.25
+    PROXY_PIXMAP_LIMIT = 128
 
-class PixmapCache:
     def __init__(self, cache_radius: int):
+        super().__init__()
         self._cache_radius = cache_radius
-        self._cache: OrderedDict[tuple[bool, int], QPixmap] = OrderedDict()
+        self._proxy_cache: OrderedDict[int, QPixmap] = OrderedDict()
+        self._full_cache: dict[int, QPixmap] = {}
+        self._full_index = FrameDistanceIndex()
+        self._stats = CacheStats()
         self._base_sizes: dict[int, tuple[int, int]] = {}
-        self._proxy_loaded = False
+        self._center = 0
+        self._direction = 0
+        self._fast_scrub = False
+        self._last_window: tuple[int, bool, int, bool] | None = None
+        self._sources: tuple[FrameSource, Callable[[int], QImage | None]] | None = None
+        self._decoder = ThreadFrameDecoder()
+
+        self._lock = threading.Lock()
+        self._work_available = threading.Condition(self._lock)
+        self._stopped = False
+        self._generation = 0
+        self._pending: deque[tuple[int, FrameSource, Callable[[int], QImage | None]]] = deque()
+        self._requested: set[int] = set()
+        self._ready: deque[tuple[int, int, QImage]] = deque()
+        self._images_ready.connect(self._promote_ready)
+
+        self._workers = [
+            threading.Thread(target=self._prefetch_worker, daemon=True)
+            for _ in range(self.PREFETCH_WORKERS)
+        ]
+        for worker in self._workers:
+            worker.start()
 
     def clear(self) -> None:
-        self._cache.clear()
+        with self._lock:
+            self._generation += 1
+            self._pending.clear()
+            self._requested.clear()
+            self._ready.clear()
+        self._proxy_cache.clear()
+        self._full_cache.clear()
+        self._full_index.clear()
+        self._stats = CacheStats()
         self._base_sizes.clear()
-        self._proxy_loaded = False
+        self._direction = 0
+        self._fast_scrub = False
+        self._last_window = None
+        self._sources = None
 
-    def preload_proxy(self, proxy_files: list[Path]) -> None:
-        if not proxy_files or self._proxy_loaded:
-            return
-        for idx, path in enumerate(proxy_files):
-            pix = QPixmap(str(path))
-            if not pix.isNull():
-                self._cache[(True, idx)] = pix
-        self._proxy_loaded = True
+    def set_motion(self, direction: int, fast_scrub: bool) -> None:
+        """Bias the next prefetch window by playhead travel."""
+        self._direction = direction
+        self._fast_scrub = fast_scrub
+
+    def refresh_window(self) -> None:
+        """Re-plan the last prefetch window, e.g. after motion settles."""
+        if self._last_window is not None and self._sources is not None:
+            center_frame, is_proxy = self._last_window[:2]
+            self._request_window(center_frame, is_proxy, *self._sources)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            self._stopped = True
+            self._pending.clear()
+            self._work_available.notify_all()
+
+    @property
+    def stats(self) -> CacheStats:
+        """Snapshot of full-resolution lookup counters since the last clear."""
+        return CacheStats(self._stats.hits, self._stats.misses, self._stats.evictions)
 
     def get(
         self,
         frame_idx: int,
         use_proxy: bool,
-        frame_files: list[Path],
-        proxy_files: list[Path],
+        frames: FrameSource,
         get_full_image: Callable[[int], QImage | None],
+        get_proxy_image: Callable[[int], QImage | None],
     ) -> QPixmap | None:
-        source_files = proxy_files if use_proxy and proxy_files else frame_files
-        is_proxy = source_files is proxy_files
-        cache_key = (is_proxy, frame_idx)
-
-        pix = self._cache.get(cache_key)
-        if pix is None:
-            full_image = None if is_proxy else get_full_image(frame_idx)
-            if full_image is not None:
-                pix = QPixmap.fromImage(full_image)
-            else:
-                pix = QPixmap(str(source_files[frame_idx]))
-
-            if pix.isNull():
-                return None
-
-            self._cache[cache_key] = pix
-            self._remember_base_size(frame_idx, is_proxy, pix, get_full_image, frame_files)
-            self._enforce_limit(frame_idx)
-        else:
-            self._cache.move_to_end(cache_key)
-
-        self._prefetch_neighbors(frame_idx, is_proxy, frame_files, proxy_files, get_full_image)
-        return pix
+        """Return the best pixmap available right now, or None.
+
+        A missing full-resolution frame falls back to its proxy while the full
+        frame is decoded in the background, and a proxy that has not been
+        loaded yet falls back to a cached or preloaded full-resolution frame.
+        """
+        self._center = frame_idx
+        self._request_window(frame_idx, use_proxy, frames, get_full_image)
+
+        if use_proxy:
+            pix = self._proxy_pixmap(frame_idx, get_proxy_image) or self._full_cache.get(frame_idx)
+            if pix is None:
+                full_image = get_full_image(frame_idx)
+                if full_image is not None:
+                    # Cached like any full frame, so repaints of a frame without a proxy upload it once.
+                    pix = QPixmap.fromImage(full_image)
+                    self._store_full(frame_idx, pix, full_image)
+                    self._enforce_limit(self._eviction_center(frame_idx))
+            return pix
+
+        pix = self._full_cache.get(frame_idx)
+        if pix is not None:
+            self._stats.hits += 1
+            return pix
+
+        self._stats.misses += 1
+        full_image = get_full_image(frame_idx)
+        if full_image is not None:
+            pix = QPixmap.fromImage(full_image)
+            self._store_full(frame_idx, pix, full_image)
+            self._enforce_limit(self._eviction_center(frame_idx))
+            return pix
+        return self._proxy_pixmap(frame_idx, get_proxy_image)
 
     def get_display_size(
         self,
         frame_idx: int,
-        frame_files: list[Path],
+        frames: FrameSource,
         get_full_image: Callable[[int], QImage | None],
     ) -> tuple[int, int] | None:
         if frame_idx in self._base_sizes:
             return self._base_sizes[frame_idx]
 
-        if frame_idx < 0 or frame_idx >= len(frame_files):
+        if frame_idx < 0 or frame_idx >= len(frames):
             return None
 
         image = get_full_image(frame_idx)
-        if image is not None:
-            self._base_sizes[frame_idx] = (image.width(), image.height())
-            return self._base_sizes[frame_idx]
+        size = (image.width(), image.height()) if image is not None else frames.image_size(frame_idx)
+        if size is not None:
+            self._base_sizes[frame_idx] = size
+        return size
+
+    def _proxy_pixmap(self, frame_idx: int, get_proxy_image: Callable[[int], QImage | None]) -> QPixmap | None:
+        pix = self._proxy_cache.get(frame_idx)
+        if pix is not None:
+            self._proxy_cache.move_to_end(frame_idx)
+            return pix
 
-        pix = self.get(frame_idx, False, frame_files, [], get_full_image)
-        if pix is None:
+        image = get_proxy_image(frame_idx)
+        if image is None:
             return None
-        return self._base_sizes.get(frame_idx)
+        pix = QPixmap.fromImage(image)
+        self._proxy_cache[frame_idx] = pix
+        if len(self._proxy_cache) > self.PROXY_PIXMAP_LIMIT:
+            self._proxy_cache.popitem(last=False)
+        return pix
 
-    def _remember_base_size(
-        self,
-        frame_idx: int,
-        is_proxy: bool,
-        pix: QPixmap,
-        get_full_image: Callable[[int], QImage | None],
-        frame_files: list[Path],
-    ) -> None:
-        if is_proxy or frame_idx in self._base_sizes or frame_idx < 0 or frame_idx >= len(frame_files):
-            return
-        image = get_full_image(frame_idx)
-        if image is not None:
-            self._base_sizes[frame_idx] = (image.width(), image.height())
-        else:
-            self._base_sizes[frame_idx] = (pix.width(), pix.height())
+    # ── Background prefetch ──────────────────────────────────────────
 
-    def _prefetch_neighbors(
+    def _request_window(
         self,
         center_frame: int,
         is_proxy: bool,
-        frame_files: list[Path],
-        proxy_files: list[Path],
+        frames: FrameSource,
         get_full_image: Callable[[int], QImage | None],
     ) -> None:
-        source_files = proxy_files if is_proxy else frame_files
-        for idx in range(
-            max(0, center_frame - self._cache_radius),
-            min(len(frame_files), center_frame + self._cache_radius + 1),
-        ):
-            key = (is_proxy, idx)
-            if key in self._cache:
-                continue
+        self._sources = (frames, get_full_image)
+        window = (center_frame, is_proxy, self._direction, self._fast_scrub)
+        if window == self._last_window:
+            return
+        self._last_window = window
+
+        # Full-resolution decodes cannot keep up while scrubbing, and proxy
+        # mode never shows them; the proxy loader follows the playhead instead.
+        ordered: list[int] = []
+        if not is_proxy and not self._fast_scrub:
+            behind, ahead = self._window_extent(self._cache_radius)
+            if self._direction < 0:
+                behind, ahead = ahead, behind
+            first = max(0, center_frame - behind)
+            last = min(len(frames), center_frame + ahead + 1)
+            ordered = sorted(range(first, last), key=lambda idx: abs(idx - center_frame))
 
-            image = get_full_image(idx) if not is_proxy else None
+        with self._lock:
+            in_flight = self._requested.difference(idx for idx, _, _ in self._pending)
+            self._pending.clear()
+            self._requested = in_flight
+            for idx in ordered:
+                if idx in self._full_cache or idx in self._requested:
+                    continue
+                self._pending.append((idx, frames, get_full_image))
+                self._requested.add(idx)
+            if self._pending:
+                self._work_available.notify_all()
+
+    def _prefetch_worker(self) -> None:
+        while True:
+            with self._lock:
+                while not self._pending and not self._stopped:
+                    self._work_available.wait()
+                if self._stopped:
+                    return
+                idx, frames, get_full_image = self._pending.popleft()
+                generation = self._generation
+
+            image = get_full_image(idx)
+            if image is None:
+                image = self._decoder.decode(frames, idx)
             if image is not None:
-                pix = QPixmap.fromImage(image)
-            else:
-                pix = QPixmap(str(source_files[idx]))
+                image = to_display_format(image)
+
+            with self._lock:
+                if generation != self._generation:
+                    continue
+                if image is None:
+                    self._requested.discard(idx)
+                    continue
+                self._ready.append((generation, idx, image))
+                notify = len(self._ready) == 1
+
+            if notify:
+                try:
+                    self._images_ready.emit()
+                except RuntimeError:
+                    return
 
-            if pix.isNull():
+    def _promote_ready(self) -> None:
+        deadline = time.perf_counter() + self.PROMOTE_BUDGET_S
+        promoted: list[int] = []
+        while time.perf_counter() < deadline:
+            with self._lock:
+                if not self._ready:
+                    break
+                generation, idx, image = self._ready.popleft()
+                self._requested.discard(idx)
+                if generation != self._generation:
+                    continue
+
+            if idx in self._full_cache:
                 continue
+            self._store_full(idx, QPixmap.fromImage(image), image)
+            promoted.append(idx)
+
+        if promoted:
+            self._enforce_limit(self._eviction_center(self._center))
+        for idx in promoted:
+            if idx in self._full_cache:
+                self.frame_ready.emit(idx, False)
 
-            self._cache[key] = pix
-            if not is_proxy:
-                self._base_sizes[idx] = (pix.width(), pix.height())
+        with self._lock:
+            has_more = bool(self._ready)
+        if has_more:
+            QTimer.singleShot(0, self._promote_ready)
 
-        self._enforce_limit(center_frame)
+    def _window_extent(self, radius: int) -> tuple[int, int]:
+        """Frames kept (behind, ahead) of the playhead; the total stays 2 * radius."""
+        if self._direction == 0:
+            return radius, radius
+        behind = int(radius * 2 * self.TRAILING_FRACTION)
+        return behind, radius * 2 - behind
+
+    def _eviction_center(self, frame_idx: int) -> int:
+        behind, ahead = self._window_extent(self._cache_radius)
+        return frame_idx + self._direction * (ahead - behind) // 2
+
+    def _store_full(self, frame_idx: int, pix: QPixmap, image: QImage) -> None:
+        self._full_cache[frame_idx] = pix
+        self._full_index.add(frame_idx)
+        self._base_sizes.setdefault(frame_idx, (image.width(), image.height()))
 
     def _enforce_limit(self, center_frame: int) -> None:
         max_base_items = (self._cache_radius * 2) + 1
-        if max_base_items <= 0:
-            self._cache.clear()
-            return
-
-        while True:
-            base_keys = [key for key in self._cache.keys() if not key[0]]
-            if len(base_keys) <= max_base_items:
-                break
-            farthest_idx = max(base_keys, key=lambda key: abs(key[1] - center_frame))
-            self._cache.pop(farthest_idx, None)
+        evicted = self._full_index.evict_farthest(center_frame, max_base_items)
+        for idx in evicted:
+            self._full_cache.pop(idx, None)
+        self._stats.evictions += len(evicted)
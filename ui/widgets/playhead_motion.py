@@ -0,0 +1,58 @@
+import time
+from collections import deque
+from typing import Callable
+
+
+class PlayheadMotion:
+    """Estimates playhead direction and speed from recent frame changes.
+
+    Samples older than ``WINDOW_S`` are dropped, but the last two are always
+    kept, so a single PageUp/PageDown jump still reports its direction while a
+    burst of jumps (held keys, timeline dragging) reads as fast scrubbing.
+    """
+
+    WINDOW_S = 0.35
+    IDLE_S = 0.25
+    FAST_SCRUB_FPS = 120.0
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self._samples: deque[tuple[float, int]] = deque()
+
+    def reset(self) -> None:
+        self._samples.clear()
+
+    def record(self, frame_idx: int) -> None:
+        now = self._clock()
+        if self._samples and self._samples[-1][1] == frame_idx:
+            return
+        self._samples.append((now, frame_idx))
+        self._drop_old(now)
+
+    @property
+    def speed(self) -> float:
+        """Frames travelled per second over the sample window, in either direction (0 when idle)."""
+        now = self._clock()
+        self._drop_old(now)
+        if len(self._samples) < 2 or now - self._samples[-1][0] > self.IDLE_S:
+            return 0.0
+        samples = list(self._samples)
+        travelled = sum(abs(later[1] - earlier[1]) for earlier, later in zip(samples, samples[1:]))
+        return travelled / max(samples[-1][0] - samples[0][0], 1e-3)
+
+    @property
+    def direction(self) -> int:
+        now = self._clock()
+        self._drop_old(now)
+        if len(self._samples) < 2 or now - self._samples[-1][0] > self.IDLE_S:
+            return 0
+        delta = self._samples[-1][1] - self._samples[-2][1]
+        return (delta > 0) - (delta < 0)
+
+    @property
+    def is_fast_scrub(self) -> bool:
+        return self.speed > self.FAST_SCRUB_FPS
+
+    def _drop_old(self, now: float) -> None:
+        while len(self._samples) > 2 and now - self._samples[0][0] > self.WINDOW_S:
+            self._samples.popleft()
@@ -0,0 +1,150 @@
+_PENDING = 0
+_CLAIMED = 1
+_EVICTED = 2
+
+_EVICTED_TO_PENDING = bytes(_PENDING if value == _EVICTED else value for value in range(256))
+
+
+class PreloadScheduler:
+    """Decides which frame the preload workers decode next.
+
+    Not thread-safe: the owner serialises access with its own lock.
+
+    Frame states live in a bytearray searched with ``find``/``rfind``. The
+    playhead and each seed keep a cursor on either side (see ``_Cursor``)
+    that only moves outwards, so a pick resumes where the previous one
+    stopped instead of rescanning from the playhead: amortized O(1) per
+    pick. A seek outside the scanned span, or evicted frames becoming
+    pending again, resets the cursors. Frames within ``urgent_radius`` of
+    the playhead are always served first; past that, picks alternate between
+    the playhead and the seed anchors (start, middle, end, bookmarks). With a
+    window set (``set_window``), frames farther from the playhead stay pending
+    until the playhead comes near them.
+    """
+
+    def __init__(self, total_frames: int, seeds: list[int], urgent_radius: int):
+        self._state = bytearray(total_frames)
+        self._pending = total_frames
+        self._playhead = 0
+        self._urgent_radius = max(0, urgent_radius)
+        self._cursor = _Cursor(0)
+        self._seeds: list[_Cursor] = []
+        for seed in seeds:
+            if 0 <= seed < total_frames and all(cursor.position != seed for cursor in self._seeds):
+                self._seeds.append(_Cursor(seed))
+        self._seed_turn = 0
+        self._serve_seed = False
+        self._window: int | None = None
+
+    @property
+    def total_frames(self) -> int:
+        return len(self._state)
+
+    @property
+    def pending_count(self) -> int:
+        return self._pending
+
+    def set_playhead(self, frame_idx: int) -> None:
+        if self._state:
+            self._playhead = max(0, min(frame_idx, len(self._state) - 1))
+            self._cursor.move(self._playhead)
+
+    def set_window(self, radius: int | None) -> None:
+        """Only hand out frames within ``radius`` of the playhead; None lifts the limit."""
+        self._window = None if radius is None else max(0, radius)
+
+    def extend(self, total_frames: int) -> None:
+        """Append pending frames up to ``total_frames`` (for sequences that grow while open)."""
+        added = total_frames - len(self._state)
+        if added > 0:
+            self._state.extend(bytes(added))
+            self._pending += added
+
+    def next_frame(self) -> int | None:
+        if self._pending <= 0:
+            return None
+
+        idx = self._cursor.nearest_pending(self._state, self._window)
+        if idx is not None and abs(idx - self._playhead) > self._urgent_radius and self._seeds:
+            if self._serve_seed:
+                seed_idx = self._next_seed_frame()
+                if seed_idx is not None and (self._window is None or abs(seed_idx - self._playhead) <= self._window):
+                    idx = seed_idx
+            self._serve_seed = not self._serve_seed
+
+        if idx is None:
+            return None
+        self._state[idx] = _CLAIMED
+        self._pending -= 1
+        return idx
+
+    def mark_evicted(self, frame_idx: int) -> None:
+        if 0 <= frame_idx < len(self._state) and self._state[frame_idx] == _CLAIMED:
+            self._state[frame_idx] = _EVICTED
+
+    def requeue_evicted(self, center: int, radius: int) -> int:
+        """Make evicted frames within ``radius`` of ``center`` pending again."""
+        if radius <= 0 or not self._state:
+            return 0
+        start = max(0, center - radius)
+        end = min(len(self._state), center + radius + 1)
+        window = self._state[start:end]
+        requeued = window.count(_EVICTED)
+        if requeued:
+            self._state[start:end] = window.translate(_EVICTED_TO_PENDING)
+            self._pending += requeued
+            # Pending frames may now lie inside spans the cursors took as done.
+            for cursor in (self._cursor, *self._seeds):
+                cursor.reset(cursor.position)
+        return requeued
+
+    def _next_seed_frame(self) -> int | None:
+        for _ in range(len(self._seeds)):
+            cursor = self._seeds[self._seed_turn % len(self._seeds)]
+            self._seed_turn += 1
+            idx = cursor.nearest_pending(self._state)
+            if idx is not None:
+                return idx
+        return None
+
+
+class _Cursor:
+    """Nearest pending frame around ``position``, searched outwards from where the last search stopped.
+
+    Every frame strictly between ``left`` and ``right`` is known not to be
+    pending. Frames only stop being pending while the cursor is in use, so
+    the bounds never move back and repeated searches scan each frame once.
+    """
+
+    __slots__ = ("position", "left", "right")
+
+    def __init__(self, position: int):
+        self.reset(position)
+
+    def reset(self, position: int) -> None:
+        self.position = position
+        self.left = position - 1
+        self.right = position
+
+    def move(self, position: int) -> None:
+        """Follow the playhead; the known span still holds if ``position`` lies inside it."""
+        if self.left < position <= self.right:
+            self.position = position
+        else:
+            self.reset(position)
+
+    def nearest_pending(self, state: bytearray, radius: int | None = None) -> int | None:
+        position = self.position
+        end = len(state) if radius is None else min(len(state), position + radius + 1)
+        start = 0 if radius is None else max(0, position - radius)
+
+        right = state.find(_PENDING, self.right, end) if self.right < end else -1
+        self.right = right if right >= 0 else max(self.right, end)
+        left = state.rfind(_PENDING, start, self.left + 1) if self.left >= start else -1
+        self.left = left if left >= 0 else min(self.left, start - 1)
+
+        if right < 0:
+            return left if left >= 0 else None
+        if left < 0:
+            return right
+        return right if right - position <= position - left else left
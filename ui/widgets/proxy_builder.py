@@ -0,0 +1,139 @@
+import threading
+from collections.abc import Callable
+from pathlib import Path
+
+from PySide6.QtCore import QObject, Signal
+
+from ui.widgets.preload_scheduler import PreloadScheduler
+from utils.frame_source import FrameSource
+from utils.proxies import generated_proxy_dir, generated_proxy_path, write_proxy
+
+
+class ProxyBuilder(QObject):
+    """Generates the proxies a folder is missing on a small pool of background threads.
+
+    Frames nearest the playhead are resized first. Each proxy is passed to
+    ``on_proxy`` on the worker thread as soon as it is written, so the caller
+    can use it without waiting for the rest; ``proxies_built`` fires once
+    every missing proxy has been attempted.
+    """
+
+    proxies_built = Signal(int)
+
+    def __init__(self, workers: int = 1):
+        super().__init__()
+        self._workers = max(1, workers)
+        self._stop = threading.Event()
+        self._threads: list[threading.Thread] = []
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._scheduler = PreloadScheduler(0, [], 0)
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    @property
+    def is_running(self) -> bool:
+        return any(thread.is_alive() for thread in self._threads)
+
+    def set_priority(self, frame_idx: int) -> None:
+        with self._lock:
+            self._scheduler.set_playhead(frame_idx)
+
+    def start(
+        self,
+        frames: FrameSource,
+        frames_dir: Path,
+        proxy_files: list[Path | None],
+        on_proxy: Callable[[int, Path], None],
+        start_frame: int = 0,
+    ) -> bool:
+        """Build a proxy for every frame whose ``proxy_files`` entry is None; False if none are needed."""
+        self.stop(wait=True)
+        proxy_files = list(proxy_files)
+        if all(proxy_files[idx] is not None or frames.file_path(idx) is None for idx in range(len(proxy_files))):
+            return False
+        try:
+            generated_proxy_dir(frames_dir).mkdir(parents=True, exist_ok=True)
+        except OSError as err:
+            print(f"Cannot write proxies for {frames_dir}: {err}")
+            return False
+
+        self._stop = threading.Event()
+        scheduler = PreloadScheduler(len(proxy_files), [], 0)
+        scheduler.set_playhead(start_frame)
+        with self._lock:
+            self._generation += 1
+            generation = self._generation
+            self._scheduler = scheduler
+        stop = self._stop
+
+        in_flight = 0
+
+        def is_current() -> bool:
+            return not stop.is_set() and generation == self._generation
+
+        def build_worker() -> None:
+            nonlocal in_flight
+            while True:
+                with self._lock:
+                    if not is_current():
+                        return
+                    idx = scheduler.next_frame()
+                    if idx is None:
+                        return
+                    in_flight += 1
+
+                frame_file = frames.file_path(idx)
+                if proxy_files[idx] is None and frame_file is not None:
+                    target = generated_proxy_path(frames_dir, frame_file)
+                    try:
+                        written = write_proxy(frames, idx, target)
+                    except OSError as err:
+                        with self._lock:
+                            in_flight -= 1
+                            first_failure = is_current()
+                            stop.set()
+                        # The other workers see the stop and return; one report ends the build.
+                        if first_failure:
+                            print(f"Proxy build stopped for {frames_dir}: {err}")
+                            self._emit_built(generation)
+                        return
+                    if written and is_current():
+                        on_proxy(idx, target)
+
+                with self._lock:
+                    in_flight -= 1
+                    if not is_current():
+                        return
+                    finished = scheduler.pending_count == 0 and in_flight == 0
+
+                if finished and not self._emit_built(generation):
+                    return
+
+        worker_count = min(self._workers, len(proxy_files))
+        self._threads = [
+            threading.Thread(target=build_worker, name="proxy-build", daemon=True) for _ in range(worker_count)
+        ]
+        for thread in self._threads:
+            thread.start()
+        return True
+
+    def _emit_built(self, generation: int) -> bool:
+        try:
+            self.proxies_built.emit(generation)
+        except RuntimeError:
+            return False
+        return True
+
+    def stop(self, wait: bool = False) -> None:
+        self._stop.set()
+        with self._lock:
+            self._generation += 1
+        threads = list(self._threads)
+        self._threads = []
+        if wait:
+            for thread in threads:
+                if thread.is_alive():
+                    thread.join(timeout=0.5)
@@ -0,0 +1,128 @@
+import threading
+from pathlib import Path
+
+from PySide6.QtCore import QObject, Signal
+from PySide6.QtGui import QImage
+
+from ui.widgets.preload_scheduler import PreloadScheduler
+from ui.widgets.proxy_stores import DecodedProxyStore, ProxyStore
+
+
+class ProxyLoader(QObject):
+    """Loads low-resolution proxy frames in the background, nearest the playhead first.
+
+    Workers fill a ProxyStore; the decoded store converts images to the
+    display format on the worker threads so the GUI thread only wraps them in
+    a QPixmap when a proxy is first shown. Frames without a proxy file are
+    skipped; ``add`` loads proxies that become available later.
+    """
+
+    proxy_loaded = Signal(int, int)
+    proxies_finished = Signal(int)
+
+    WORKERS = 2
+
+    def __init__(self, store: ProxyStore | None = None):
+        super().__init__()
+        self._store = store or DecodedProxyStore()
+        self._stop = threading.Event()
+        self._threads: list[threading.Thread] = []
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._scheduler = PreloadScheduler(0, [], 0)
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    @property
+    def loaded_count(self) -> int:
+        return self._store.loaded_count
+
+    def get_image(self, idx: int) -> QImage | None:
+        return self._store.get_image(idx)
+
+    def set_priority(self, frame_idx: int) -> None:
+        with self._lock:
+            self._scheduler.set_playhead(frame_idx)
+
+    def start(self, proxy_files: list[Path | None], start_frame: int = 0) -> None:
+        self.stop(wait=True)
+        if not proxy_files:
+            return
+
+        self._stop.clear()
+        scheduler = PreloadScheduler(len(proxy_files), [], 0)
+        scheduler.set_playhead(start_frame)
+        with self._lock:
+            self._generation += 1
+            generation = self._generation
+            self._scheduler = scheduler
+        self._store.reset(len(proxy_files), generation)
+
+        in_flight = 0
+
+        def is_current() -> bool:
+            return not self._stop.is_set() and generation == self._generation
+
+        def proxy_worker() -> None:
+            nonlocal in_flight
+            while True:
+                with self._lock:
+                    if not is_current():
+                        return
+                    idx = scheduler.next_frame()
+                    if idx is None:
+                        return
+                    in_flight += 1
+
+                path = proxy_files[idx]
+                loaded = path is not None and self._store.load(idx, path, generation)
+
+                with self._lock:
+                    in_flight -= 1
+                    if not is_current():
+                        return
+                    finished = scheduler.pending_count == 0 and in_flight == 0
+
+                try:
+                    if loaded:
+                        self.proxy_loaded.emit(idx, generation)
+                    if finished:
+                        self.proxies_finished.emit(generation)
+                except RuntimeError:
+                    return
+
+        worker_count = max(1, min(self.WORKERS, len(proxy_files)))
+        self._threads = [threading.Thread(target=proxy_worker, daemon=True) for _ in range(worker_count)]
+        for thread in self._threads:
+            thread.start()
+
+    def add(self, idx: int, path: Path, generation: int) -> bool:
+        """Load a proxy written after ``start`` into the store; safe to call from any thread."""
+        if not self._store.load(idx, path, generation):
+            return False
+        try:
+            self.proxy_loaded.emit(idx, generation)
+        except RuntimeError:
+            return False
+        return True
+
+    def stop(self, wait: bool = False) -> None:
+        self._stop.set()
+        with self._lock:
+            self._generation += 1
+        threads = list(self._threads)
+        self._threads = []
+        if wait:
+            for thread in threads:
+                if thread.is_alive():
+                    thread.join(timeout=0.5)
+
+    def reset(self) -> None:
+        with self._lock:
+            # A new generation, so workers still finishing a load cannot fill the emptied store.
+            self._generation += 1
+            generation = self._generation
+            self._scheduler = PreloadScheduler(0, [], 0)
+        self._store.reset(0, generation)
@@ -0,0 +1,181 @@
+import threading
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+from typing import Protocol
+
+from PySide6.QtGui import QImage
+
+from ui.widgets.frame_decoders import to_display_format
+from utils.proxy_atlas import ProxyAtlas
+
+DECODED_PROXY_STORE = "decoded"
+COMPRESSED_PROXY_STORE = "compressed"
+
+
+class ProxyStore(Protocol):
+    """Holds proxy frames filled by ProxyLoader workers and read by the GUI thread.
+
+    ``reset`` tags the store with the loader's generation; ``load`` calls from
+    another generation (workers of a previous folder) are rejected under the
+    store's lock, so they cannot land after a reset.
+    """
+
+    @property
+    def loaded_count(self) -> int: ...
+
+    def reset(self, total_frames: int, generation: int = 0) -> None: ...
+
+    def load(self, idx: int, path: Path, generation: int = 0) -> bool: ...
+
+    def get_image(self, idx: int) -> QImage | None: ...
+
+
+def create_proxy_store(kind: str) -> ProxyStore:
+    if kind == COMPRESSED_PROXY_STORE:
+        return CompressedProxyStore()
+    return DecodedProxyStore()
+
+
+class DecodedProxyStore:
+    """Keeps every proxy decoded in the display format (fastest, most memory)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._images: list[QImage | None] = []
+        self._loaded_count = 0
+        self._generation = 0
+
+    @property
+    def loaded_count(self) -> int:
+        return self._loaded_count
+
+    def reset(self, total_frames: int, generation: int = 0) -> None:
+        with self._lock:
+            self._generation = generation
+            self._images = [None] * total_frames
+            self._loaded_count = 0
+
+    def load(self, idx: int, path: Path, generation: int = 0) -> bool:
+        image = QImage(str(path))
+        if image.isNull():
+            return False
+        image = to_display_format(image)
+        with self._lock:
+            if generation != self._generation or idx >= len(self._images):
+                return False
+            self._images[idx] = image
+            self._loaded_count += 1
+        return True
+
+    def get_image(self, idx: int) -> QImage | None:
+        with self._lock:
+            if 0 <= idx < len(self._images):
+                return self._images[idx]
+        return None
+
+
+class CompressedProxyStore:
+    """Keeps the encoded proxy files in one contiguous buffer and decodes on demand.
+
+    ``_offsets``/``_lengths`` index each frame's bytes in ``_blob``; decoded
+    images live in a small LRU sized for a scrub window, so a 320px JPEG costs
+    ~15 KB resident instead of ~230 KB.
+    """
+
+    DECODED_LIMIT = 64
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._blob = bytearray()
+        self._offsets = array("q")
+        self._lengths = array("i")
+        self._decoded: OrderedDict[int, QImage] = OrderedDict()
+        self._loaded_count = 0
+        self._generation = 0
+
+    @property
+    def loaded_count(self) -> int:
+        return self._loaded_count
+
+    @property
+    def encoded_bytes(self) -> int:
+        return len(self._blob)
+
+    def reset(self, total_frames: int, generation: int = 0) -> None:
+        with self._lock:
+            self._generation = generation
+            self._blob = bytearray()
+            self._offsets = array("q", [0]) * total_frames
+            self._lengths = array("i", [0]) * total_frames
+            self._decoded.clear()
+            self._loaded_count = 0
+
+    def load(self, idx: int, path: Path, generation: int = 0) -> bool:
+        try:
+            data = path.read_bytes()
+        except OSError:
+            return False
+        if not data:
+            return False
+        with self._lock:
+            if generation != self._generation or idx >= len(self._offsets):
+                return False
+            self._offsets[idx] = len(self._blob)
+            self._lengths[idx] = len(data)
+            self._blob += data
+            self._loaded_count += 1
+        return True
+
+    def get_image(self, idx: int) -> QImage | None:
+        with self._lock:
+            if not 0 <= idx < len(self._lengths) or self._lengths[idx] == 0:
+                return None
+            image = self._decoded.get(idx)
+            if image is not None:
+                self._decoded.move_to_end(idx)
+                return image
+            offset, length = self._offsets[idx], self._lengths[idx]
+            data = self._blob[offset : offset + length]
+
+        image = QImage.fromData(data)
+        if image.isNull():
+            return None
+        image = to_display_format(image)
+        with self._lock:
+            self._decoded[idx] = image
+            if len(self._decoded) > self.DECODED_LIMIT:
+                self._decoded.popitem(last=False)
+        return image
+
+
+class AtlasFrameImage(QImage):
+    """RGB888 QImage over one frame of a memory-mapped atlas, without copying.
+
+    QImage does not keep external buffers alive, so the view (and through it
+    the map) is owned here.
+    """
+
+    def __init__(self, atlas: ProxyAtlas, idx: int):
+        view = atlas.frame_view(idx)
+        super().__init__(view, atlas.width, atlas.height, atlas.stride, QImage.Format.Format_RGB888)
+        self._view = view
+
+
+class AtlasProxyStore:
+    """Serves every proxy straight from a memory-mapped atlas; nothing to load."""
+
+    def __init__(self, atlas: ProxyAtlas):
+        self._atlas = atlas
+
+    @property
+    def loaded_count(self) -> int:
+        return self._atlas.frame_count
+
+    def get_image(self, idx: int) -> QImage | None:
+        if not 0 <= idx < self._atlas.frame_count:
+            return None
+        return AtlasFrameImage(self._atlas, idx)
+
+    def close(self) -> None:
+        self._atlas.close()
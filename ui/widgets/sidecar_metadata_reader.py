@@ -1,76 +1,64 @@
-import json
-import re
 from pathlib import Path
 
-_VALID_SUFFIXES = {".png", ".jpg", ".jpeg", ".bmp", ".webp"}
-
-
-def _natural_sort_key(path: Path):
-    chunks = re.split(r"(\d+)", path.name.lower())
-    return [int(chunk) if chunk.isdigit() else chunk for chunk in chunks]
+from utils.frame_source import FrameSource, scan_frame_files
+from utils.proxies import generated_proxy_dir
+from utils.sidecar_registry import find_sidecar
 
 
 class SidecarMetadataReader:
-    def find_proxy_files(self, folder: Path, frame_files: list[Path]) -> list[Path]:
-        expected_count = len(frame_files)
+    def find_proxy_files(self, folder: Path, frames: FrameSource) -> list[Path | None]:
+        """Proxy file for each frame of ``frames``, or None where the frame has none.
+
+        A proxy folder holding exactly one file per frame is matched by
+        position. Otherwise each frame is matched by file name stem against
+        the proxy folder and then the proxies generated into the frames folder.
+        """
+        frame_count = len(frames)
+        if frame_count == 0:
+            return []
+
         proxy_dir = self._proxy_dir_from_metadata(folder)
         if proxy_dir is None:
             proxy_dir = folder.parent / "low_frames"
         if proxy_dir is None or not proxy_dir.exists() or not proxy_dir.is_dir():
             proxy_dir = folder.parent / "frames_mino"
-        if not proxy_dir.exists() or not proxy_dir.is_dir():
-            return []
 
-        proxy_files = [
-            p
-            for p in sorted(proxy_dir.iterdir(), key=_natural_sort_key)
-            if p.is_file() and p.suffix.lower() in _VALID_SUFFIXES
-        ]
-        return proxy_files if len(proxy_files) == expected_count else []
+        proxy_files = scan_frame_files(proxy_dir)
+        if len(proxy_files) == frame_count:
+            return list(proxy_files)
+
+        by_stem = {path.stem: path for path in scan_frame_files(generated_proxy_dir(folder))}
+        by_stem.update((path.stem, path) for path in proxy_files)
+        mapping: list[Path | None] = []
+        for idx in range(frame_count):
+            frame_file = frames.file_path(idx)
+            mapping.append(by_stem.get(frame_file.stem) if frame_file is not None else None)
+        return mapping
+
+    def find_proxy_atlas(self, folder: Path) -> Path | None:
+        payload = self._metadata_for(folder)
+        atlas_value = payload.get("proxy_atlas") if payload is not None else None
+        if not isinstance(atlas_value, str):
+            return None
+        atlas_path = _resolve_metadata_path(atlas_value, folder.parent)
+        return atlas_path if atlas_path.is_file() else None
 
     def read_bookmark_anchor_frames(self, folder: Path, total_frames: int) -> list[int]:
         if total_frames <= 0:
             return []
-
-        for metadata_file in folder.parent.glob("*.json"):
-            payload = _read_json_dict(metadata_file)
-            if payload is None:
-                continue
-
-            frames_value = payload.get("frames") or payload.get("frames_path")
-            if not isinstance(frames_value, str):
-                continue
-
-            resolved_frames = _resolve_metadata_path(frames_value, metadata_file.parent)
-            if resolved_frames != folder.resolve():
-                continue
-
-            return _extract_bookmark_frames(payload, total_frames)
-
-        return []
+        payload = self._metadata_for(folder)
+        return _extract_bookmark_frames(payload, total_frames) if payload is not None else []
 
     def _proxy_dir_from_metadata(self, folder: Path) -> Path | None:
-        for metadata_file in folder.parent.glob("*.json"):
-            try:
-                payload = json.loads(metadata_file.read_text(encoding="utf-8"))
-            except (OSError, json.JSONDecodeError):
-                continue
-
-            if not isinstance(payload, dict):
-                continue
-
-            frames_value = payload.get("frames") or payload.get("frames_path")
-            low_frames_value = payload.get("low_frames")
-            if not isinstance(frames_value, str) or not isinstance(low_frames_value, str):
-                continue
+        payload = self._metadata_for(folder)
+        low_frames_value = payload.get("low_frames") if payload is not None else None
+        if not isinstance(low_frames_value, str):
+            return None
+        return _resolve_metadata_path(low_frames_value, folder.parent)
 
-            resolved_frames = _resolve_metadata_path(frames_value, metadata_file.parent)
-            if resolved_frames != folder.resolve():
-                continue
-
-            return _resolve_metadata_path(low_frames_value, metadata_file.parent)
-
-        return None
+    def _metadata_for(self, folder: Path) -> dict | None:
+        found = find_sidecar(folder)
+        return found[1] if found is not None else None
 
 
 def _resolve_metadata_path(value: str, root: Path) -> Path:
@@ -80,14 +68,6 @@ def _resolve_metadata_path(value: str, root: Path) -> Path:
     return (root / candidate).resolve()
 
 
-def _read_json_dict(path: Path) -> dict | None:
-    try:
-        payload = json.loads(path.read_text(encoding="utf-8"))
-    except (OSError, json.JSONDecodeError):
-        return None
-    return payload if isinstance(payload, dict) else None
-
-
 def _extract_bookmark_frames(payload: dict, total_frames: int) -> list[int]:
     sequence = payload.get("sequence")
     if not isinstance(sequence, dict):
@@ -75,6 +75,7 @@ class TimelineTrack(QWidget):
         self.segments = segments
         self.frame = 0
         self.loaded_flags = [False] * self.total_frames
+        self.available_frames = self.total_frames
         self.bookmarks: list[Bookmark] = []
         self._dragging_bookmark = False
         self._drag_source_bookmark: int | None = None
@@ -103,6 +104,7 @@ class TimelineTrack(QWidget):
         if self._editor.editing_frame is not None and self._editor.editing_frame >= self.total_frames:
             self._editor.cancel()
         self.loaded_flags = [False] * self.total_frames
+        self.available_frames = self.total_frames
         self._emit_if_changed(self._viewport.set(self._viewport.view_start, self._viewport.view_span))
         self.update()
 
@@ -144,6 +146,11 @@ class TimelineTrack(QWidget):
             self.loaded_flags = list(flags)
         self.update()
 
+    def set_available_frames(self, available_frames: int) -> None:
+        """Frames at and after ``available_frames`` are drawn as still being extracted."""
+        self.available_frames = clamp(available_frames, 0, self.total_frames)
+        self.update()
+
     def set_frame_loaded(self, frame: int, loaded: bool) -> None:
         if 0 <= frame < self.total_frames:
             self.loaded_flags[frame] = loaded
@@ -348,6 +355,7 @@ class TimelineTrack(QWidget):
             self._viewport,
             self.segments,
             self.loaded_flags,
+            self.available_frames,
             self.bookmarks,
             self._dragging_bookmark,
             self._drag_source_bookmark,
@@ -1,5 +1,5 @@
 from PySide6.QtCore import QPointF, Qt, QRectF
-from PySide6.QtGui import QColor, QPainter, QPen, QPolygonF
+from PySide6.QtGui import QBrush, QColor, QPainter, QPen, QPolygonF
 
 from app.interface.layers import Segment
 from app.interface.sequence_data import Bookmark
@@ -25,6 +25,7 @@ class TimelineTrackPainter:
         viewport: TimelineViewport,
         segments: list[Segment],
         loaded_flags: list[bool],
+        available_frames: int,
         bookmarks: list[Bookmark],
         dragging: bool,
         drag_source: int | None,
@@ -48,7 +49,10 @@ class TimelineTrackPainter:
             painter.setBrush(_status_color(s.t))
             painter.drawRect(QRectF(left, 12, max(1, right - left), height - 16))
 
-        TimelineTrackPainter._draw_loaded_indicator(painter, width, height, total_frames, loaded_flags, viewport)
+        TimelineTrackPainter._draw_pending_range(painter, width, height, total_frames, available_frames, viewport)
+        TimelineTrackPainter._draw_loaded_indicator(
+            painter, width, height, total_frames, loaded_flags, available_frames, viewport
+        )
         TimelineTrackPainter._draw_bookmarks(
             painter, bookmarks, total_frames, width, viewport, dragging, drag_source, drag_target
         )
@@ -58,6 +62,26 @@ class TimelineTrackPainter:
         painter.setPen(QPen(QColor(255, 80, 80, 240), 2))
         painter.drawLine(xph, -4, xph, height + 4)
 
+    @staticmethod
+    def _draw_pending_range(
+        painter: QPainter,
+        w: int,
+        h: int,
+        total_frames: int,
+        available_frames: int,
+        viewport: TimelineViewport,
+    ) -> None:
+        """Hatch the frames an extraction still running has not written yet."""
+        if available_frames >= total_frames:
+            return
+        left_norm = clamp(available_frames / max(1, total_frames - 1), 0.0, 1.0)
+        if left_norm > viewport.visible_end:
+            return
+        left = max(1, int(((left_norm - viewport.view_start) / max(0.0001, viewport.view_span)) * w))
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(QBrush(QColor(95, 98, 102, 110), Qt.BrushStyle.BDiagPattern))
+        painter.drawRect(QRectF(left, 1, max(1, w - 1 - left), h - 2))
+
     @staticmethod
     def _draw_loaded_indicator(
         painter: QPainter,
@@ -65,6 +89,7 @@ class TimelineTrackPainter:
         h: int,
         total_frames: int,
         loaded_flags: list[bool],
+        available_frames: int,
         viewport: TimelineViewport,
     ) -> None:
         bar_h = 3
@@ -80,8 +105,11 @@ class TimelineTrackPainter:
         for x in range(1, w - 1):
             norm_pos = viewport.view_start + (x / max(1, w - 1)) * viewport.view_span
             f = int(clamp(norm_pos, 0.0, 1.0) * (total_frames - 1))
-            loaded = loaded_flags[f] if f < len(loaded_flags) else False
-            painter.setBrush(QColor(42, 160, 88, 240) if loaded else QColor(95, 98, 102, 200))
+            if f >= available_frames:
+                painter.setBrush(QColor(40, 44, 48, 200))
+            else:
+                loaded = loaded_flags[f] if f < len(loaded_flags) else False
+                painter.setBrush(QColor(42, 160, 88, 240) if loaded else QColor(95, 98, 102, 200))
             painter.drawRect(QRectF(x, y, 1, bar_h))
 
     @staticmethod
@@ -1,5 +1,9 @@
-from PySide6.QtCore import QRectF, Qt, Signal
-from PySide6.QtGui import QColor, QPainter, QPen, QResizeEvent
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+import numpy as np
+from PySide6.QtCore import QPointF, QRectF, Qt, Signal
+from PySide6.QtGui import QColor, QFont, QPainter, QPen, QPixmap, QResizeEvent, QStaticText, QTransform
 from PySide6.QtWidgets import QHBoxLayout, QSizePolicy, QToolButton, QWidget
 from shiboken6 import isValid
 
@@ -11,20 +15,47 @@ from ui.window.frames_mock import draw_viewer_frame
 from utils.numbers import clamp
 
 
+_LABEL_WIDTH = 88
+_LABEL_HEIGHT = 18
+_LABEL_GAP = 20
+
+
+@dataclass
+class _FrameBoxes:
+    """Everything needed to draw one frame's detections, in widget coordinates."""
+
+    boxes: list[QRectF] = field(default_factory=list)
+    labels: list[QRectF] = field(default_factory=list)
+    texts: list[tuple[QPointF, QStaticText]] = field(default_factory=list)
+
+
 class DetectionOverlay(QWidget):
     """Toggle button overlay + bounding-box drawing for detected persons.
 
     Responsibilities:
       - Own the eye-icon toggle button widget (visibility + positioning)
       - Draw bounding boxes and confidence labels onto an open QPainter
+
+    Rects and laid-out labels are built once per frame from the detector's
+    NumPy boxes and cached until the detections or the video rect change, so
+    a repaint during playback is a handful of batched draw calls.
     """
 
     repaintRequested = Signal()
 
+    CACHED_FRAMES = 512
+
     def __init__(self, track_detector, parent: QWidget) -> None:
         super().__init__(parent)
         self._track_detector = track_detector
         self._show = True
+        self._box_pen = QPen(QColor(0, 220, 120), 2)
+        self._text_pen = QPen(QColor(0, 255, 150), 1)
+        self._label_color = QColor(0, 0, 0, 170)
+        self._font: QFont | None = None
+        self._cache_key: tuple | None = None
+        self._frame_cache: OrderedDict[int, _FrameBoxes] = OrderedDict()
+        self._label_texts: dict[str, QStaticText] = {}
 
         self.setAttribute(Qt.WidgetAttribute.WA_StyledBackground, True)
         self.setStyleSheet(
@@ -65,39 +96,77 @@ class DetectionOverlay(QWidget):
     def paint(self, painter: QPainter, video_rect: QRectF, frame: int) -> None:
         if not self._show:
             return
-        detections = self._track_detector.detections_for_frame(frame)
-        if not detections:
+        if self._font is None:
+            self._font = QFont(painter.font())
+            self._font.setPointSize(10)
+        frame_boxes = self._frame_boxes(video_rect, frame)
+        if not frame_boxes.boxes:
             return
 
         painter.save()
         painter.setRenderHint(QPainter.RenderHint.Antialiasing, True)
-        font = painter.font()
-        font.setPointSize(10)
-        painter.setFont(font)
-
-        for detection in detections:
-            rel_box = detection.bbox_relative
-            x = video_rect.x() + rel_box.x * video_rect.width()
-            y = video_rect.y() + rel_box.y * video_rect.height()
-            w = rel_box.width * video_rect.width()
-            h = rel_box.height * video_rect.height()
-
-            rect = QRectF(x, y, w, h)
-            painter.setPen(QPen(QColor(0, 220, 120), 2))
-            painter.setBrush(Qt.BrushStyle.NoBrush)
-            painter.drawRect(rect)
-
-            label_rect = QRectF(rect.x(), max(video_rect.y(), rect.y() - 20), 88, 18)
-            painter.fillRect(label_rect, QColor(0, 0, 0, 170))
-            painter.setPen(QPen(QColor(0, 255, 150), 1))
-            painter.drawText(
-                label_rect.adjusted(4, 0, -2, 0),
-                Qt.AlignmentFlag.AlignVCenter,
-                f"person {detection.confidence:.2f}",
-            )
-
+        painter.setFont(self._font)
+        painter.setPen(self._box_pen)
+        painter.setBrush(Qt.BrushStyle.NoBrush)
+        painter.drawRects(frame_boxes.boxes)
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(self._label_color)
+        painter.drawRects(frame_boxes.labels)
+        painter.setPen(self._text_pen)
+        for position, text in frame_boxes.texts:
+            painter.drawStaticText(position, text)
         painter.restore()
 
+    def _frame_boxes(self, video_rect: QRectF, frame: int) -> _FrameBoxes:
+        key = (
+            self._track_detector.detections_revision(),
+            video_rect.x(),
+            video_rect.y(),
+            video_rect.width(),
+            video_rect.height(),
+        )
+        if key != self._cache_key:
+            self._frame_cache.clear()
+            self._cache_key = key
+
+        frame_boxes = self._frame_cache.get(frame)
+        if frame_boxes is not None:
+            self._frame_cache.move_to_end(frame)
+            return frame_boxes
+
+        frame_boxes = self._build_frame_boxes(video_rect, frame)
+        self._frame_cache[frame] = frame_boxes
+        while len(self._frame_cache) > self.CACHED_FRAMES:
+            self._frame_cache.popitem(last=False)
+        return frame_boxes
+
+    def _build_frame_boxes(self, video_rect: QRectF, frame: int) -> _FrameBoxes:
+        boxes, confidences = self._track_detector.detection_boxes_for_frame(frame)
+        if len(boxes) == 0:
+            return _FrameBoxes()
+
+        scale = np.array([video_rect.width(), video_rect.height(), video_rect.width(), video_rect.height()])
+        origin = np.array([video_rect.x(), video_rect.y(), 0.0, 0.0])
+        rects = boxes * scale + origin
+        label_ys = np.maximum(video_rect.y(), rects[:, 1] - _LABEL_GAP)
+
+        frame_boxes = _FrameBoxes()
+        for (x, y, w, h), label_y, confidence in zip(rects.tolist(), label_ys.tolist(), confidences.tolist()):
+            frame_boxes.boxes.append(QRectF(x, y, w, h))
+            frame_boxes.labels.append(QRectF(x, label_y, _LABEL_WIDTH, _LABEL_HEIGHT))
+            text = self._label_text(f"person {confidence:.2f}")
+            text_y = label_y + (_LABEL_HEIGHT - text.size().height()) / 2
+            frame_boxes.texts.append((QPointF(x + 4, text_y), text))
+        return frame_boxes
+
+    def _label_text(self, label: str) -> QStaticText:
+        text = self._label_texts.get(label)
+        if text is None:
+            text = QStaticText(label)
+            text.prepare(QTransform(), self._font)
+            self._label_texts[label] = text
+        return text
+
     def _on_toggled(self, checked: bool) -> None:
         self._show = checked
         self.repaintRequested.emit()
@@ -113,6 +182,7 @@ class ViewerWidget(QWidget):
 
     framesLoaded = Signal(int)
     folderLoaded = Signal(str, int)
+    videoDropped = Signal(str)
 
     def __init__(self, app: DanceTrackerPort, total_frames: int, frame_store: FrameStore, parent=None):
         super().__init__(parent)
@@ -121,6 +191,8 @@ class ViewerWidget(QWidget):
         self._frame_store = frame_store
         self._use_proxy = False
         self._is_closing = False
+        self._last_pixmap: QPixmap | None = None
+        self._frame_store.frame_ready.connect(self._on_frame_ready)
 
         self.setMinimumHeight(320)
         self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
@@ -135,6 +207,7 @@ class ViewerWidget(QWidget):
         self._drop_handler = DropHandler(app.media, parent=self)
         self._drop_handler.framesLoaded.connect(self.framesLoaded)
         self._drop_handler.folderLoaded.connect(self.folderLoaded)
+        self._drop_handler.videoDropped.connect(self.videoDropped)
 
         # ── Detection overlay ────────────────────────────────────────
         self._detection_overlay = DetectionOverlay(app.track_detector, parent=self)
@@ -148,6 +221,7 @@ class ViewerWidget(QWidget):
 
     def set_total_frames(self, total_frames: int):
         self._total_frames = max(1, total_frames)
+        self._last_pixmap = None
         self._frame = clamp(self._frame, 0, self._total_frames - 1)
         self.update()
 
@@ -165,13 +239,13 @@ class ViewerWidget(QWidget):
     # ── Video rect calculation ───────────────────────────────────────
 
     def _video_rect(self) -> QRectF:
-        pixmap = self._frame_store.get_frame(self._frame, use_proxy=self._use_proxy)
-        if pixmap is None:
+        display_size = self._frame_store.get_display_size(self._frame)
+        if display_size is None and self._last_pixmap is not None:
+            display_size = (self._last_pixmap.width(), self._last_pixmap.height())
+        if display_size is None:
             return QRectF(self.rect().adjusted(16, 16, -16, -16))
 
-        display_size = self._frame_store.get_display_size(self._frame)
-        source_width = display_size[0] if display_size is not None else pixmap.width()
-        source_height = display_size[1] if display_size is not None else pixmap.height()
+        source_width, source_height = display_size
         if source_width <= 0 or source_height <= 0:
             return QRectF(self.rect().adjusted(16, 16, -16, -16))
 
@@ -217,8 +291,20 @@ class ViewerWidget(QWidget):
         if self._is_closing:
             return
 
-        pixmap = self._frame_store.get_frame(self._frame, use_proxy=self._use_proxy)
+        # While a frame is still being decoded in the background, keep showing
+        # the previous one instead of flashing the placeholder.
         video_rect = self._video_rect()
+        dpr = self.devicePixelRatioF()
+        pixmap = self._frame_store.get_frame(
+            self._frame,
+            use_proxy=self._use_proxy,
+            target_size=(int(video_rect.width() * dpr), int(video_rect.height() * dpr)),
+        )
+        if pixmap is None:
+            pixmap = self._last_pixmap
+        else:
+            self._last_pixmap = pixmap
+            video_rect = self._video_rect()
 
         if pixmap is not None:
             self._paint_frame(pixmap, video_rect)
@@ -258,6 +344,10 @@ class ViewerWidget(QWidget):
 
     # ── Slots ────────────────────────────────────────────────────────
 
+    def _on_frame_ready(self, frame: int, _is_proxy: bool):
+        if frame == self._frame and not self._is_closing:
+            self.update()
+
     def _on_border_color_changed(self, color: QColor):
         self._border_color = color
         self.update()
@@ -9,6 +9,7 @@ Each concern lives in its own class:
   - PreloadTracker        → per-frame preload progress from FrameStore signals
   - LayoutPersistence     → splitter sizes and screen assignment save/restore
   - BookmarkController    → bookmark CRUD dispatch to App port
+  - MediaLoadProgress     → progress dialog for the background media load
   - TopBar                → top bar widget with recent-folder icons
   - ViewerPanel           → main video viewer and transport buttons
   - RightPanel            → layer thumbnails + 3D pose viewer
@@ -32,6 +33,7 @@ from ui.window.layout import MainWindowLayout
 from ui.window.sections.bookmark_controller import BookmarkController
 from ui.window.sections.folder_session_manager import FolderSessionManager
 from ui.window.sections.layout_persistence import LayoutPersistence
+from ui.window.sections.media_load_progress import MediaLoadProgress
 from ui.window.sections.playback_controller import PlaybackController
 from ui.window.sections.preferences_manager import PreferencesManager
 from ui.window.sections.preload_tracker import PreloadTracker
@@ -41,6 +43,7 @@ from ui.window.sections.status_panel import StatusPanel
 from ui.window.sections.timeline_panel import TimelinePanel
 from ui.window.sections.topbar import TopBar
 from ui.window.sections.viewer_panel import ViewerPanel
+from utils.video_frame_source import VideoFrameIndex
 
 
 class MainWindow(QMainWindow):
@@ -52,7 +55,15 @@ class MainWindow(QMainWindow):
         self._events = events
 
         self._prefs = prefs
-        self._frame_store = FrameStore(cache_radius=self._frames.frame_cache_radius)
+        self._frame_store = FrameStore(
+            cache_radius=self._frames.frame_cache_radius,
+            cache_max_mb=self._frames.frame_cache_max_mb,
+            decode_backend=self._frames.frame_decode_backend,
+            decode_workers=self._frames.frame_decode_workers,
+            proxy_store=self._frames.frame_proxy_store,
+            mipmaps=self._frames.frame_mipmaps,
+            build_proxies=self._frames.frame_build_proxies,
+        )
         self._playback = PlaybackController(
             fps=self._frames.fps,
             frames=self._frames,
@@ -65,7 +76,15 @@ class MainWindow(QMainWindow):
         )
         self._frame_store.frame_preloaded.connect(self._preload_tracker.on_frame_preloaded)
         self._frame_store.preload_finished.connect(self._preload_tracker.on_preload_finished)
-
+        self._frame_store.proxies_finished.connect(self._on_proxies_finished)
+        self._frame_store.display_source_changed.connect(self._on_display_source_changed)
+
+        self._extraction_total = 0
+        self._detached_extraction: str | None = None
+        # Frames folder of a dropped video shown straight from the file until its extraction finishes.
+        self._direct_video_folder: str | None = None
+        # Dropped video waiting for its index from the background load before it can be shown.
+        self._pending_direct_video: str | None = None
         self._folder_session = FolderSessionManager(
             preferences=self._prefs,
             frame_store=self._frame_store,
@@ -75,6 +94,8 @@ class MainWindow(QMainWindow):
         self.setWindowTitle(cfg.title)
         self.resize(1200, 780)
 
+        self._media_load_progress = MediaLoadProgress(self, on_cancel=self._app.media.cancel_load)
+
         self._layout = MainWindowLayout(self, cfg.get_css())
         self._build_ui()
 
@@ -87,10 +108,47 @@ class MainWindow(QMainWindow):
     # ── EventBus handlers ────────────────────────────────────────────
 
     def on_frames_loaded(self, path: str) -> None:
+        replaces_current = self._is_growing_folder(path) or self._is_direct_video(path)
+        target_frame = self._frames.cur_frame if replaces_current else None
+        self._direct_video_folder = None
+        if self._frame_store.is_growing and target_frame is None:
+            self._detached_extraction = self._folder_session.current_folder_path
+        elif self._detached_extraction == self._normalize(path):
+            self._detached_extraction = None
         self._right_panel.set_current_folder_path(path)
         self._right_panel.update_sequence_data(path)
         self._app.track_detector.load_detections(path)
-        self._folder_session.load_folder(path)
+        self._folder_session.load_folder(path, target_frame)
+
+    def on_frames_extracting(self, path: str, available_frames: int, total_frames: int) -> None:
+        if self._detached_extraction == self._normalize(path) or self._is_direct_video(path):
+            return
+        growing = self._is_growing_folder(path)
+        if available_frames <= 0:
+            if growing:
+                self._clear_loaded_sequence()
+            return
+
+        self._extraction_total = max(total_frames, available_frames)
+        if growing and available_frames >= self._frame_store.total_frames:
+            self._on_frames_extended(self._frame_store.extend_growing_folder(available_frames))
+        else:
+            self._folder_session.load_growing_folder(path, available_frames)
+
+    def on_video_indexed(self, video_path: str, index: VideoFrameIndex) -> None:
+        if self._pending_direct_video != self._normalize(video_path):
+            return
+        self._pending_direct_video = None
+        self._folder_session.remember_current_frame(self._frames.cur_frame)
+        self._direct_video_folder = self._folder_session.load_video(video_path, index)
+
+    def on_media_load_progress(self, path: str, percent: int) -> None:
+        self._media_load_progress.update(path, percent)
+
+    def on_media_load_finished(self, path: str) -> None:
+        self._media_load_progress.finish(path)
+        if self._pending_direct_video == self._normalize(path):
+            self._pending_direct_video = None
 
     def on_song_identified(self, song: SongMetadata) -> None:
         self._right_panel.update_song_info(song)
@@ -98,7 +156,7 @@ class MainWindow(QMainWindow):
     def on_sequences_changed(self, state: SequenceState) -> None:
         self._topbar.set_active_folder(state.active_folder)
         current = self._folder_session.current_folder_path
-        if current and not any(item.folder_path == current for item in state.items):
+        if current and current != self._direct_video_folder and not any(item.folder_path == current for item in state.items):
             self._clear_loaded_sequence()
 
     def on_detections_updated(self, frames_folder_path: str) -> None:
@@ -142,6 +200,7 @@ class MainWindow(QMainWindow):
             on_next_bookmark=self._bookmarks.go_to_next,
         )
         self._viewer_panel.viewer.folderLoaded.connect(self._on_folder_dropped)
+        self._viewer_panel.viewer.videoDropped.connect(self._on_video_dropped)
 
         self._scrubber = ScrubberController(
             set_proxy_enabled=self._viewer_panel.viewer.set_proxy_frames_enabled,
@@ -216,7 +275,7 @@ class MainWindow(QMainWindow):
     # ── Frame sync ───────────────────────────────────────────────────
 
     def set_frame(self, frame: int):
-        cur = self._frames.set_frame(frame)
+        cur = self._frames.set_frame(self._clamp_to_available(frame))
         self._frame_store.request_preload_priority(cur)
 
         self._viewer_panel.viewer.set_frame(cur)
@@ -242,7 +301,7 @@ class MainWindow(QMainWindow):
         )
 
     def _set_frame_lightweight(self, frame: int):
-        cur = self._frames.set_frame(frame)
+        cur = self._frames.set_frame(self._clamp_to_available(frame))
         self._frame_store.request_preload_priority(cur)
         self._viewer_panel.viewer.set_frame(cur)
         self._viewer_panel.update_frame_label(cur)
@@ -269,22 +328,74 @@ class MainWindow(QMainWindow):
             preload_done=preload_done,
         )
 
+    def _on_display_source_changed(self, generation: int) -> None:
+        loaded_flags = self._frame_store.loaded_flags
+        self._preload_tracker.reset(self._frame_store.total_frames, generation, loaded_flags)
+        self._timeline.set_loaded_flags(loaded_flags)
+        self.set_frame(self._frames.cur_frame)
+
+    def _on_proxies_finished(self, generation: int) -> None:
+        if generation != self._frame_store.proxy_generation:
+            return
+        self._log_message(f"Proxy frames ready ({self._frame_store.proxy_loaded_count}).")
+
     # ── Folder / session events ──────────────────────────────────────
 
     def _on_frames_loaded(self, total_frames: int, initial_frame: int = 0):
+        available_frames = total_frames
+        if self._frame_store.is_growing:
+            total_frames = max(total_frames, self._extraction_total)
         self._playback.pause()
         self._viewer_panel.viewer.set_proxy_frames_enabled(False)
-        self._frames.set_total_frames(total_frames)
-        self._viewer_panel.viewer.set_total_frames(total_frames)
-        self._timeline.set_total_frames(total_frames)
+        self._set_total_frames(total_frames)
+        self._timeline.set_available_frames(available_frames)
         loaded_flags = self._frame_store.loaded_flags
         self._timeline.set_loaded_flags(loaded_flags)
-        self._preload_tracker.reset(total_frames, self._frame_store.preload_generation, loaded_flags)
+        self._preload_tracker.reset(available_frames, self._frame_store.preload_generation, loaded_flags)
         self._bookmarks.refresh()
         source_name = Path(self._folder_session.current_folder_path or "").name or "sequence"
-        self._log_message(f"Loaded media: {source_name}.")
+        if self._frame_store.is_growing:
+            self._log_message(f"Extracting media: {source_name} ({available_frames}/{total_frames} frames).")
+        else:
+            self._log_message(f"Loaded media: {source_name}.")
         self.set_frame(initial_frame)
 
+    def _on_frames_extended(self, available_frames: int) -> None:
+        if self._extraction_total > self._frames.total_frames:
+            self._set_total_frames(self._extraction_total)
+            self._timeline.set_loaded_flags(self._frame_store.loaded_flags)
+            self._bookmarks.refresh()
+        self._timeline.set_available_frames(available_frames)
+        self._preload_tracker.extend(available_frames)
+        self._timeline.update_info(
+            self._frames.total_frames,
+            len(self._frames.error_frames),
+            loaded_count=self._preload_tracker.loaded_count,
+            preload_done=self._preload_tracker.preload_done,
+        )
+
+    def _set_total_frames(self, total_frames: int) -> None:
+        self._frames.set_total_frames(total_frames)
+        self._viewer_panel.viewer.set_total_frames(total_frames)
+        self._timeline.set_total_frames(total_frames)
+
+    def _clamp_to_available(self, frame: int) -> int:
+        """While the folder is still being extracted, frames past the written ones cannot be shown."""
+        if self._frame_store.is_growing:
+            return min(frame, self._frame_store.total_frames - 1)
+        return frame
+
+    def _is_growing_folder(self, path: str) -> bool:
+        return self._frame_store.is_growing and self._folder_session.current_folder_path == self._normalize(path)
+
+    def _is_direct_video(self, path: str) -> bool:
+        folder = self._normalize(path)
+        return self._direct_video_folder == folder and self._folder_session.current_folder_path == folder
+
+    @staticmethod
+    def _normalize(path: str) -> str:
+        return str(Path(path).expanduser())
+
     def _on_folder_dropped(self, folder_path: str, total_frames: int):
         self._folder_session.on_folder_dropped(folder_path, self._frames.cur_frame)
         self._on_frames_loaded(
@@ -294,6 +405,10 @@ class MainWindow(QMainWindow):
             ),
         )
 
+    def _on_video_dropped(self, video_path: str) -> None:
+        if self._frames.frame_open_videos_directly:
+            self._pending_direct_video = self._normalize(video_path)
+
     def _clear_loaded_sequence(self):
         self._playback.pause()
         self._viewer_panel.viewer.set_proxy_frames_enabled(False)
@@ -313,6 +428,9 @@ class MainWindow(QMainWindow):
     # ── Lifecycle ────────────────────────────────────────────────────
 
     def closeEvent(self, event: QCloseEvent):
+        self._app.media.cancel_load()
+        self._app.sequence_data.flush()
+        self._app.track_detector.flush()
         self._folder_session.remember_current_frame(self._frames.cur_frame)
         self._layout_persistence.save_screen()
         self._layout_persistence.save()
@@ -3,6 +3,7 @@ from typing import Callable
 
 from ui.widgets.frame_store import FrameStore
 from ui.window.sections.preferences_manager import PreferencesManager
+from utils.video_frame_source import VideoFrameIndex
 
 
 class FolderSessionManager:
@@ -34,6 +35,31 @@ class FolderSessionManager:
         )
         self._on_frames_loaded(frame_count, frame_to_restore)
 
+    def load_growing_folder(self, folder_path: str, available_frames: int):
+        """Open the frames an extraction has written so far; see FrameStore.load_growing_folder."""
+        frame_count = self._frame_store.load_growing_folder(folder_path, available_frames)
+        if frame_count <= 0:
+            return
+
+        normalized = str(Path(folder_path).expanduser())
+        self.current_folder_path = normalized
+        self._on_frames_loaded(frame_count, self._prefs.saved_frame_for_folder(normalized))
+
+    def load_video(self, video_path: str, index: VideoFrameIndex) -> str | None:
+        """Show a video by decoding it directly; see FrameStore.load_video.
+
+        The session is keyed by the ``frames`` folder an extraction creates
+        next to the video, which is returned (None if the video cannot be read).
+        """
+        frame_count = self._frame_store.load_video(video_path, index)
+        if frame_count <= 0:
+            return None
+
+        normalized = str(Path(video_path).expanduser().parent / "frames")
+        self.current_folder_path = normalized
+        self._on_frames_loaded(frame_count, self._prefs.saved_frame_for_folder(normalized))
+        return normalized
+
     def remember_current_frame(self, cur_frame: int):
         self._prefs.remember_frame(self.current_folder_path, cur_frame)
 
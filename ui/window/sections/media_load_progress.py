@@ -0,0 +1,45 @@
+from typing import Callable
+
+from PySide6.QtCore import Qt
+from PySide6.QtWidgets import QWidget
+
+from ui.widgets.generic_widgets.base_dialog import BaseProgressDialog
+
+
+class MediaLoadProgress:
+    """Single responsibility: show progress of the background media load and forward cancellation."""
+
+    def __init__(self, parent: QWidget, on_cancel: Callable[[], None]):
+        self._parent = parent
+        self._on_cancel = on_cancel
+        self._dialog: BaseProgressDialog | None = None
+        self._path: str | None = None
+
+    def update(self, path: str, percent: int) -> None:
+        if self._dialog is None or self._path != path:
+            self.finish(self._path or "")
+            self._dialog = self._create_dialog()
+            self._path = path
+        self._dialog.setValue(max(0, min(100, percent)))
+
+    def finish(self, path: str) -> None:
+        if self._dialog is None or path != self._path:
+            return
+        # Closing a QProgressDialog emits canceled(); the load is already over.
+        self._dialog.canceled.disconnect(self._on_cancel)
+        self._dialog.close()
+        self._dialog.deleteLater()
+        self._dialog = None
+        self._path = None
+
+    def _create_dialog(self) -> BaseProgressDialog:
+        dialog = BaseProgressDialog("Loading video...", "Cancel", 0, 100, self._parent)
+        dialog.setWindowTitle("Processing video")
+        # Non-modal: extracted frames can be viewed while the rest of the video is extracted.
+        dialog.setWindowModality(Qt.WindowModality.NonModal)
+        dialog.setAutoClose(False)
+        dialog.setAutoReset(False)
+        dialog.canceled.connect(self._on_cancel)
+        dialog.setValue(0)
+        dialog.show()
+        return dialog
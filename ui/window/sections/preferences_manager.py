@@ -1,7 +1,10 @@
-import re
 from pathlib import Path
 
 from ui.window.preferences import load_preferences, save_preferences
+from utils.frame_source import open_frame_source
+
+# Packed sequences have no frame file to point at; the thumbnail frame is written here.
+_THUMBNAIL_DIR_NAME = ".thumbnail"
 
 
 class PreferencesManager:
@@ -171,19 +174,13 @@ class PreferencesManager:
         if not folder.exists() or not folder.is_dir():
             return None
 
-        valid_suffixes = {".png", ".jpg", ".jpeg", ".bmp", ".webp"}
-        frame_files = [
-            file
-            for file in sorted(folder.iterdir(), key=self._natural_sort_key)
-            if file.is_file() and file.suffix.lower() in valid_suffixes
-        ]
-        if not frame_files:
+        frames = open_frame_source(folder)
+        try:
+            if len(frames) == 0:
+                return None
+            target_idx = 300 if len(frames) > 300 else len(frames) // 2
+            return str(frames.frame_file(target_idx, folder / _THUMBNAIL_DIR_NAME))
+        except OSError:
             return None
-
-        target_idx = 300 if len(frame_files) > 300 else len(frame_files) // 2
-        return str(frame_files[target_idx])
-
-    @staticmethod
-    def _natural_sort_key(path: Path):
-        chunks = re.split(r"(\d+)", path.name.lower())
-        return [int(chunk) if chunk.isdigit() else chunk for chunk in chunks]
+        finally:
+            frames.close()
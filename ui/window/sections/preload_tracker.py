@@ -34,6 +34,11 @@ class PreloadTracker:
         self._loaded_frames = {i for i, f in enumerate(loaded_flags) if f}
         self._preload_done = self.loaded_count >= total_frames
 
+    def extend(self, total_frames: int) -> None:
+        if total_frames > self._total_frames:
+            self._total_frames = total_frames
+            self._preload_done = False
+
     def on_frame_preloaded(self, frame: int, loaded: bool, generation: int) -> None:
         if generation != self._active_generation:
             return
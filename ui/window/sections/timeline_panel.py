@@ -116,6 +116,10 @@ class TimelinePanel(QFrame):
         for track in self.track_widgets:
             track.set_loaded_flags(flags)
 
+    def set_available_frames(self, available: int):
+        for track in self.track_widgets:
+            track.set_available_frames(available)
+
     def set_frame_loaded(self, frame: int, loaded: bool):
         for track in self.track_widgets:
             track.set_frame_loaded(frame, loaded)
@@ -0,0 +1,165 @@
+"""Single-file frame archive: encoded frames back to back plus an offset index.
+
+Layout (little endian)::
+
+    magic "DTFRAMES" | version u16 | suffix 6s (e.g. ".jpg") | frame count u32
+    index offset u64 | padding to 32 bytes
+    frame 0 bytes | frame 1 bytes | ...
+    index: frame count x (offset u64, length u32)
+
+The archive lives inside the sequence's frames folder (``frames/frames.dtpack``)
+so every path-keyed piece of metadata keeps working; the folder just holds one
+file instead of one per frame.
+"""
+import mmap
+import os
+import struct
+from pathlib import Path
+
+FRAME_ARCHIVE_NAME = "frames.dtpack"
+
+_MAGIC = b"DTFRAMES"
+_VERSION = 1
+_HEADER = struct.Struct("<8sH6sIQ")
+_HEADER_SIZE = 32
+_INDEX_ENTRY = struct.Struct("<QI")
+
+
+class FrameArchiveWriter:
+    """Appends encoded frames to ``<path>.tmp`` and renames it into place on ``close``.
+
+    Index entries are also journaled to ``<path>.tmp.index`` so that
+    ``resume_frames`` can continue an interrupted archive after that many
+    frames (ValueError if the leftovers hold fewer).
+    """
+
+    def __init__(self, path: str | Path, suffix: str = ".jpg", resume_frames: int | None = None):
+        self._path = Path(path)
+        self._tmp_path = self._path.with_name(self._path.name + ".tmp")
+        self._journal_path = self._tmp_path.with_name(self._tmp_path.name + ".index")
+        self._suffix = suffix.lower().encode("ascii")[:6]
+        self._index = bytearray()
+        self._count = 0
+        if resume_frames is not None:
+            self._resume(resume_frames)
+            return
+
+        self._file = open(self._tmp_path, "wb")
+        self._file.write(b"\0" * _HEADER_SIZE)
+        self._journal = open(self._journal_path, "wb")
+
+    @property
+    def frame_count(self) -> int:
+        return self._count
+
+    def append(self, encoded: bytes | memoryview) -> None:
+        offset = self._file.tell()
+        self._file.write(encoded)
+        entry = _INDEX_ENTRY.pack(offset, len(encoded))
+        self._index += entry
+        self._journal.write(entry)
+        self._count += 1
+
+    def flush(self) -> None:
+        """Make appended frames durable, e.g. before recording a checkpoint."""
+        for fh in (self._file, self._journal):
+            fh.flush()
+            os.fsync(fh.fileno())
+
+    def close(self) -> None:
+        index_offset = self._file.tell()
+        self._file.write(self._index)
+        self._file.seek(0)
+        self._file.write(_HEADER.pack(_MAGIC, _VERSION, self._suffix, self._count, index_offset))
+        self._file.close()
+        self._journal.close()
+        os.replace(self._tmp_path, self._path)
+        self._journal_path.unlink(missing_ok=True)
+
+    def abort(self) -> None:
+        self._file.close()
+        self._journal.close()
+        self._tmp_path.unlink(missing_ok=True)
+        self._journal_path.unlink(missing_ok=True)
+
+    def _resume(self, frames: int) -> None:
+        index = self._journal_path.read_bytes()[: frames * _INDEX_ENTRY.size]
+        if len(index) < frames * _INDEX_ENTRY.size:
+            raise ValueError(f"cannot resume {self._tmp_path}: {len(index) // _INDEX_ENTRY.size} frames journaled")
+
+        end = _HEADER_SIZE
+        if frames > 0:
+            offset, length = _INDEX_ENTRY.unpack_from(index, len(index) - _INDEX_ENTRY.size)
+            end = offset + length
+        self._file = open(self._tmp_path, "r+b")
+        if self._file.seek(0, os.SEEK_END) < end:
+            self._file.close()
+            raise ValueError(f"cannot resume {self._tmp_path}: too short")
+        self._file.truncate(end)
+        self._file.seek(end)
+        self._journal = open(self._journal_path, "r+b")
+        self._journal.truncate(len(index))
+        self._journal.seek(len(index))
+        self._index = bytearray(index)
+        self._count = frames
+
+
+class FrameArchive:
+    """Read-only memory map of a frame archive.
+
+    ``frame_bytes`` returns a view into the map, so reading a frame costs no
+    ``open()`` and no copy until it is decoded.
+    """
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        with open(self.path, "rb") as fh:
+            self._map = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, version, suffix, count, index_offset = _HEADER.unpack_from(self._map, 0)
+        except struct.error as exc:
+            self._map.close()
+            raise ValueError(f"not a frame archive: {path}") from exc
+
+        if (
+            magic != _MAGIC
+            or version != _VERSION
+            or index_offset + count * _INDEX_ENTRY.size > len(self._map)
+        ):
+            self._map.close()
+            raise ValueError(f"not a frame archive: {path}")
+
+        self.frame_count = count
+        self.suffix = suffix.rstrip(b"\0").decode("ascii", errors="replace")
+        self._index_offset = index_offset
+
+    def __len__(self) -> int:
+        return self.frame_count
+
+    def frame_span(self, idx: int) -> tuple[int, int]:
+        """Return (offset, length) of frame ``idx`` within the archive file."""
+        if not 0 <= idx < self.frame_count:
+            raise IndexError(idx)
+        return _INDEX_ENTRY.unpack_from(self._map, self._index_offset + idx * _INDEX_ENTRY.size)
+
+    def frame_bytes(self, idx: int) -> memoryview:
+        offset, length = self.frame_span(idx)
+        return memoryview(self._map)[offset : offset + length]
+
+    def close(self) -> None:
+        """Unmap the archive; reads afterwards raise ValueError."""
+        try:
+            self._map.close()
+        except BufferError:
+            # A frame view is still exported (e.g. mid-decode); the map is released with the last one.
+            pass
+
+
+def open_frame_archive(folder: str | Path) -> FrameArchive | None:
+    path = Path(folder) / FRAME_ARCHIVE_NAME
+    if not path.is_file():
+        return None
+    try:
+        return FrameArchive(path)
+    except (OSError, ValueError):
+        return None
@@ -0,0 +1,186 @@
+"""Persistent listing of a frames folder, so loading a sequence does not rescan it.
+
+Stored as ``<folder>/.frame_manifest/manifest.json``: the frame file names in
+natural sort order with each file's size, mtime and image dimensions, plus
+the folder's mtime when it was listed. Living in a subfolder keeps writes to
+the manifest from touching the folder's own mtime.
+
+A manifest is current while the folder's mtime matches. When it does not
+(files added, removed or renamed), the folder is listed again by name only:
+files already in the manifest keep their entry, only new ones are stat'ed
+and have their header read, and names that all sort after the existing ones
+(a growing extraction) are appended without sorting everything again.
+Rewriting a file in place does not change the folder's mtime; whoever does
+that removes the manifest with ``discard_frame_manifest``. Manifests are
+also kept in memory per folder, so repeated lookups in one process cost a
+``stat``.
+"""
+import json
+import os
+import re
+import shutil
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from utils.image_header import read_image_size
+
+FRAME_SUFFIXES = {".png", ".jpg", ".jpeg", ".bmp", ".webp"}
+MANIFEST_DIR_NAME = ".frame_manifest"
+MANIFEST_FILE_NAME = "manifest.json"
+_VERSION = 1
+
+_cache: dict[str, "FrameManifest"] = {}
+_cache_lock = threading.Lock()
+
+
+@dataclass
+class FrameManifest:
+    dir_mtime_ns: int
+    names: list[str] = field(default_factory=list)
+    sizes: list[int] = field(default_factory=list)
+    mtimes_ns: list[int] = field(default_factory=list)
+    widths: list[int] = field(default_factory=list)
+    heights: list[int] = field(default_factory=list)
+    _files: tuple[Path, list[Path]] | None = field(default=None, repr=False, compare=False)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def files(self, folder: Path) -> list[Path]:
+        """Paths of the frames in order; a new list the caller may modify."""
+        if self._files is None or self._files[0] != folder:
+            self._files = (folder, [folder / name for name in self.names])
+        return list(self._files[1])
+
+    def image_sizes(self) -> list[tuple[int, int] | None]:
+        """(width, height) per frame; None where the header could not be read."""
+        return [(w, h) if w > 0 and h > 0 else None for w, h in zip(self.widths, self.heights)]
+
+
+def frame_manifest(folder: Path) -> FrameManifest:
+    """The current manifest of ``folder``, listing and saving it again if it is stale."""
+    try:
+        dir_mtime_ns = folder.stat().st_mtime_ns
+    except OSError:
+        return FrameManifest(dir_mtime_ns=0)
+
+    key = str(folder.resolve())
+    with _cache_lock:
+        cached = _cache.get(key)
+    if cached is not None and cached.dir_mtime_ns == dir_mtime_ns:
+        return cached
+
+    previous = cached or _read_manifest(folder)
+    if previous is not None and previous.dir_mtime_ns == dir_mtime_ns:
+        manifest = previous
+    else:
+        manifest = _list_folder(folder, previous)
+        _write_manifest(folder, manifest)
+
+    with _cache_lock:
+        _cache[key] = manifest
+    return manifest
+
+
+def discard_frame_manifest(folder: Path) -> None:
+    """Forget ``folder``'s manifest, in memory and on disk (e.g. before rewriting its files)."""
+    with _cache_lock:
+        _cache.pop(str(folder.resolve()), None)
+    shutil.rmtree(folder / MANIFEST_DIR_NAME, ignore_errors=True)
+
+
+def natural_sort_key(name: str):
+    chunks = re.split(r"(\d+)", name.lower())
+    return [int(chunk) if chunk.isdigit() else chunk for chunk in chunks]
+
+
+def _list_folder(folder: Path, previous: FrameManifest | None) -> FrameManifest:
+    try:
+        # Created first so that it does not change the folder mtime recorded below.
+        (folder / MANIFEST_DIR_NAME).mkdir(exist_ok=True)
+    except OSError:
+        pass
+    # Taken before listing, so a file added meanwhile makes the next lookup list again.
+    dir_mtime_ns = folder.stat().st_mtime_ns
+    known: dict[str, tuple[int, int, int, int]] = {}
+    if previous is not None:
+        columns = zip(previous.sizes, previous.mtimes_ns, previous.widths, previous.heights)
+        known = dict(zip(previous.names, columns))
+
+    entries: dict[str, tuple[int, int, int, int]] = {}
+    with os.scandir(folder) as listing:
+        for item in listing:
+            if os.path.splitext(item.name)[1].lower() not in FRAME_SUFFIXES or not item.is_file():
+                continue
+            entry = known.get(item.name)
+            if entry is None:
+                try:
+                    stat = item.stat()
+                except OSError:
+                    continue
+                width, height = read_image_size(item.path) or (0, 0)
+                entry = (stat.st_size, stat.st_mtime_ns, width, height)
+            entries[item.name] = entry
+
+    names = _ordered_names(entries, previous.names if previous is not None else [])
+    manifest = FrameManifest(dir_mtime_ns=dir_mtime_ns, names=names)
+    for name in names:
+        size, mtime_ns, width, height = entries[name]
+        manifest.sizes.append(size)
+        manifest.mtimes_ns.append(mtime_ns)
+        manifest.widths.append(width)
+        manifest.heights.append(height)
+    return manifest
+
+
+def _ordered_names(entries: dict, previous_names: list[str]) -> list[str]:
+    kept = [name for name in previous_names if name in entries]
+    if len(kept) != len(previous_names):
+        return sorted(entries, key=natural_sort_key)
+    known = set(kept)
+    added = sorted((name for name in entries if name not in known), key=natural_sort_key)
+    if kept and added and natural_sort_key(added[0]) < natural_sort_key(kept[-1]):
+        return sorted(entries, key=natural_sort_key)
+    return kept + added
+
+
+def _read_manifest(folder: Path) -> FrameManifest | None:
+    try:
+        payload = json.loads((folder / MANIFEST_DIR_NAME / MANIFEST_FILE_NAME).read_text(encoding="utf-8"))
+        if payload.pop("version", None) != _VERSION:
+            return None
+        manifest = FrameManifest(
+            dir_mtime_ns=payload["dir_mtime_ns"],
+            names=payload["names"],
+            sizes=payload["sizes"],
+            mtimes_ns=payload["mtimes_ns"],
+            widths=payload["widths"],
+            heights=payload["heights"],
+        )
+    except (OSError, json.JSONDecodeError, KeyError, TypeError, AttributeError):
+        return None
+    columns = (manifest.sizes, manifest.mtimes_ns, manifest.widths, manifest.heights)
+    if any(len(column) != len(manifest.names) for column in columns):
+        return None
+    return manifest
+
+
+def _write_manifest(folder: Path, manifest: FrameManifest) -> None:
+    """Save ``manifest``; folders that cannot be written to just keep it in memory."""
+    path = folder / MANIFEST_DIR_NAME / MANIFEST_FILE_NAME
+    try:
+        tmp_path = path.with_name(path.name + ".tmp")
+        payload = {
+            "version": _VERSION,
+            "dir_mtime_ns": manifest.dir_mtime_ns,
+            "names": manifest.names,
+            "sizes": manifest.sizes,
+            "mtimes_ns": manifest.mtimes_ns,
+            "widths": manifest.widths,
+            "heights": manifest.heights,
+        }
+        tmp_path.write_text(json.dumps(payload), encoding="utf-8")
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
@@ -0,0 +1,151 @@
+"""Indexed access to a sequence's encoded frames, whether loose files or a packed archive."""
+from pathlib import Path
+from typing import Protocol
+
+import numpy as np
+
+from utils.frame_archive import FrameArchive, open_frame_archive
+from utils.frame_manifest import frame_manifest
+from utils.image_header import read_image_size, read_image_size_from_bytes
+
+
+class FrameSource(Protocol):
+    def __len__(self) -> int: ...
+
+    def file_path(self, idx: int) -> Path | None:
+        """The frame's own file on disk, or None when it only exists inside a container."""
+        ...
+
+    def file_span(self, idx: int) -> tuple[Path, int, int] | None:
+        """(file, offset, length) holding the encoded frame; length 0 means the whole file.
+
+        None when the frame has no standalone encoding (e.g. a video frame).
+        """
+        ...
+
+    def decoded_frame(self, idx: int) -> np.ndarray | None:
+        """BGR pixels for sources that decode frames themselves; None for encoded frames."""
+        ...
+
+    def read_bytes(self, idx: int) -> bytes: ...
+
+    def image_size(self, idx: int) -> tuple[int, int] | None: ...
+
+    def frame_file(self, idx: int, scratch_dir: Path) -> Path:
+        """A path to the encoded frame for APIs that need one, written to ``scratch_dir`` if packed."""
+        ...
+
+    def close(self) -> None: ...
+
+
+class FolderFrameSource:
+    """One image file per frame, in natural sort order.
+
+    ``image_sizes`` (from the folder's manifest) saves reading each file's
+    header; frames without an entry are read on demand.
+    """
+
+    def __init__(self, files: list[Path], image_sizes: list[tuple[int, int] | None] | None = None):
+        self._files = files
+        self._image_sizes = image_sizes or []
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+    def extend(self, files: list[Path]) -> None:
+        """Append frames written after the source was opened (e.g. by a running extraction)."""
+        self._files.extend(files)
+
+    def file_path(self, idx: int) -> Path | None:
+        return self._files[idx]
+
+    def file_span(self, idx: int) -> tuple[Path, int, int] | None:
+        return self._files[idx], 0, 0
+
+    def decoded_frame(self, idx: int) -> np.ndarray | None:
+        return None
+
+    def read_bytes(self, idx: int) -> bytes:
+        return self._files[idx].read_bytes()
+
+    def image_size(self, idx: int) -> tuple[int, int] | None:
+        if idx < len(self._image_sizes) and self._image_sizes[idx] is not None:
+            return self._image_sizes[idx]
+        return read_image_size(self._files[idx])
+
+    def frame_file(self, idx: int, scratch_dir: Path) -> Path:
+        return self._files[idx]
+
+    def close(self) -> None:
+        pass
+
+
+class ArchiveFrameSource:
+    """Frames packed in a memory-mapped FrameArchive.
+
+    ``close`` unmaps the archive. Workers that are still reading afterwards
+    get empty bytes, None, or no span, the same as for an unreadable frame.
+    """
+
+    def __init__(self, archive: FrameArchive):
+        self._archive = archive
+
+    def __len__(self) -> int:
+        return len(self._archive)
+
+    def file_path(self, idx: int) -> Path | None:
+        return None
+
+    def file_span(self, idx: int) -> tuple[Path, int, int] | None:
+        try:
+            offset, length = self._archive.frame_span(idx)
+        except ValueError:
+            return None
+        return self._archive.path, offset, length
+
+    def decoded_frame(self, idx: int) -> np.ndarray | None:
+        return None
+
+    def read_bytes(self, idx: int) -> bytes:
+        try:
+            return bytes(self._archive.frame_bytes(idx))
+        except ValueError:
+            return b""
+
+    def image_size(self, idx: int) -> tuple[int, int] | None:
+        try:
+            return read_image_size_from_bytes(self._archive.frame_bytes(idx))
+        except ValueError:
+            return None
+
+    def frame_file(self, idx: int, scratch_dir: Path) -> Path:
+        target = scratch_dir / f"frame_{idx:06d}{self._archive.suffix}"
+        if not target.is_file():
+            scratch_dir.mkdir(parents=True, exist_ok=True)
+            target.write_bytes(self._archive.frame_bytes(idx))
+        return target
+
+    def close(self) -> None:
+        self._archive.close()
+
+
+def open_frame_source(folder: str | Path) -> FrameSource:
+    """Open a frames folder, preferring a packed archive over loose image files."""
+    folder = Path(folder)
+    archive = open_frame_archive(folder)
+    if archive is not None:
+        return ArchiveFrameSource(archive)
+    manifest = frame_manifest(folder)
+    return FolderFrameSource(manifest.files(folder), manifest.image_sizes())
+
+
+def frame_file_name(frame_idx: int) -> str:
+    """File name extraction gives frame ``frame_idx``."""
+    return f"frame_{frame_idx:06d}.jpg"
+
+
+def scan_frame_files(folder: Path) -> list[Path]:
+    """Image files of ``folder`` in natural sort order, from its frame manifest."""
+    if not folder.is_dir():
+        return []
+    return frame_manifest(folder).files(folder)
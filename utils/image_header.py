@@ -0,0 +1,77 @@
+"""Read image dimensions from file headers without decoding pixels."""
+import io
+from pathlib import Path
+
+_JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+
+def read_image_size(path: str | Path) -> tuple[int, int] | None:
+    """Return (width, height) for PNG, BMP and JPEG files, or None if unknown."""
+    try:
+        with open(path, "rb") as fh:
+            return _read_size(fh)
+    except OSError:
+        return None
+
+
+def read_image_size_from_bytes(data: bytes | memoryview) -> tuple[int, int] | None:
+    """Same as ``read_image_size`` for an encoded image already in memory."""
+    return _read_size(io.BytesIO(data))
+
+
+def _read_size(fh) -> tuple[int, int] | None:
+    header = fh.read(32)
+    if header.startswith(b"\x89PNG\r\n\x1a\n") and len(header) >= 24:
+        return _positive(int.from_bytes(header[16:20], "big"), int.from_bytes(header[20:24], "big"))
+
+    if header.startswith(b"BM") and len(header) >= 26:
+        width = int.from_bytes(header[18:22], "little", signed=True)
+        height = int.from_bytes(header[22:26], "little", signed=True)
+        return _positive(width, abs(height))
+
+    if header.startswith(b"\xff\xd8"):
+        fh.seek(2)
+        return _jpeg_size(fh)
+    return None
+
+
+def _jpeg_size(fh) -> tuple[int, int] | None:
+    while True:
+        byte = fh.read(1)
+        if not byte:
+            return None
+        if byte != b"\xff":
+            continue
+
+        marker = fh.read(1)
+        while marker == b"\xff":
+            marker = fh.read(1)
+        if not marker:
+            return None
+
+        code = marker[0]
+        if code in {0xD8, 0xD9, 0x01} or 0xD0 <= code <= 0xD7:
+            continue
+
+        length_bytes = fh.read(2)
+        if len(length_bytes) < 2:
+            return None
+        segment_length = int.from_bytes(length_bytes, "big")
+        if segment_length < 2:
+            return None
+
+        if code in _JPEG_SOF_MARKERS:
+            sof = fh.read(5)
+            if len(sof) < 5:
+                return None
+            height = int.from_bytes(sof[1:3], "big")
+            width = int.from_bytes(sof[3:5], "big")
+            return _positive(width, height)
+
+        fh.seek(segment_length - 2, 1)
+
+
+def _positive(width: int, height: int) -> tuple[int, int] | None:
+    if width > 0 and height > 0:
+        return width, height
+    return None
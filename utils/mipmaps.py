@@ -0,0 +1,135 @@
+"""Reduced-size copies of a sequence's frames (mipmap levels) for resolution-adaptive display.
+
+Each level holds every frame scaled so its longer side is the level size, as
+loose JPEGs in ``<frames>/.mipmaps/<size>/`` named by frame index. Levels at
+or above the source resolution are not written. The viewer decodes the
+smallest level that still covers its on-screen size, so decode and upload
+cost follow the viewer rather than the source; the 320px proxies stay the
+level used while scrubbing.
+"""
+import os
+from collections.abc import Callable
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from utils.frame_source import FolderFrameSource, FrameSource, scan_frame_files
+
+MIPMAP_DIR_NAME = ".mipmaps"
+MIPMAP_LEVELS = (160, 480, 960)
+
+_REDUCED_READS = ((8, cv2.IMREAD_REDUCED_COLOR_8), (4, cv2.IMREAD_REDUCED_COLOR_4), (2, cv2.IMREAD_REDUCED_COLOR_2))
+
+
+def mipmap_root(frames_dir: Path) -> Path:
+    return frames_dir / MIPMAP_DIR_NAME
+
+
+def mipmap_dir(frames_dir: Path, level: int) -> Path:
+    return mipmap_root(frames_dir) / str(level)
+
+
+def mipmap_file_name(frame_idx: int) -> str:
+    return f"frame_{frame_idx:06d}.jpg"
+
+
+def level_size(width: int, height: int, level: int) -> tuple[int, int]:
+    """Size of a ``width`` x ``height`` frame scaled so its longer side is ``level``."""
+    scale = min(1.0, level / max(1, width, height))
+    return max(1, int(round(width * scale))), max(1, int(round(height * scale)))
+
+
+def levels_for(width: int, height: int) -> list[int]:
+    """Levels worth writing for frames of this size (smaller than the source), smallest first."""
+    return [level for level in MIPMAP_LEVELS if level < max(width, height)]
+
+
+def prepare_mipmap_dirs(frames_dir: Path, width: int, height: int) -> None:
+    for level in levels_for(width, height):
+        mipmap_dir(frames_dir, level).mkdir(parents=True, exist_ok=True)
+
+
+def write_mipmaps(frame, frame_idx: int, frames_dir: Path) -> None:
+    """Write BGR ``frame`` to every level below its resolution (see ``prepare_mipmap_dirs``).
+
+    Each level is resized from the next larger one, which is cheaper than
+    going back to the source every time and looks the same with INTER_AREA.
+    """
+    h, w = frame.shape[:2]
+    for level in reversed(levels_for(w, h)):
+        frame = cv2.resize(frame, level_size(w, h, level), interpolation=cv2.INTER_AREA)
+        cv2.imwrite(str(mipmap_dir(frames_dir, level) / mipmap_file_name(frame_idx)), frame)
+
+
+def open_mipmap_levels(frames_dir: Path, frame_count: int) -> list[tuple[int, FrameSource]]:
+    """(level, source) for every complete level of a ``frame_count``-frame sequence, smallest first."""
+    levels: list[tuple[int, FrameSource]] = []
+    for level in MIPMAP_LEVELS:
+        files = scan_frame_files(mipmap_dir(frames_dir, level))
+        if frame_count > 0 and len(files) == frame_count:
+            levels.append((level, FolderFrameSource(files)))
+    return levels
+
+
+def missing_mipmap_levels(frames_dir: Path, frame_count: int, width: int, height: int) -> list[int]:
+    complete = {level for level, _ in open_mipmap_levels(frames_dir, frame_count)}
+    return [level for level in levels_for(width, height) if level not in complete]
+
+
+def build_mipmaps(
+    frames: FrameSource,
+    frames_dir: Path,
+    levels: list[int],
+    should_cancel: Callable[[], bool] | None = None,
+) -> int:
+    """Write ``levels`` for every frame of ``frames``; returns the frames written.
+
+    Frames that already have a file in every level are skipped, so an
+    interrupted build picks up where it stopped. Files are written under a
+    temporary name and renamed, so a level never holds a truncated frame.
+    Frames are decoded at a reduced size when the largest level allows it.
+    """
+    if not levels:
+        return 0
+    for level in levels:
+        mipmap_dir(frames_dir, level).mkdir(parents=True, exist_ok=True)
+
+    written = 0
+    largest = max(levels)
+    for idx in range(len(frames)):
+        if should_cancel is not None and should_cancel():
+            break
+        name = mipmap_file_name(idx)
+        targets = [level for level in levels if not (mipmap_dir(frames_dir, level) / name).is_file()]
+        if not targets:
+            continue
+        frame = decode_for_level(frames, idx, largest)
+        if frame is None:
+            continue
+
+        h, w = frame.shape[:2]
+        for level in sorted(targets, reverse=True):
+            resized = cv2.resize(frame, level_size(w, h, level), interpolation=cv2.INTER_AREA)
+            ok, encoded = cv2.imencode(".jpg", resized)
+            if not ok:
+                continue
+            target = mipmap_dir(frames_dir, level) / name
+            tmp_path = target.with_name(target.name + ".part")
+            tmp_path.write_bytes(encoded.tobytes())
+            os.replace(tmp_path, target)
+        written += 1
+    return written
+
+
+def decode_for_level(frames: FrameSource, idx: int, level: int):
+    """Decode frame ``idx`` as BGR, at the largest reduction that still leaves ``level`` pixels."""
+    data = np.frombuffer(frames.read_bytes(idx), dtype=np.uint8)
+    size = frames.image_size(idx)
+    flags = cv2.IMREAD_COLOR
+    if size is not None:
+        for factor, reduced in _REDUCED_READS:
+            if max(size) // factor >= level:
+                flags = reduced
+                break
+    return cv2.imdecode(data, flags)
@@ -0,0 +1,40 @@
+"""320px proxy frames generated for folders that came without any.
+
+Proxies are written into ``<frames>/.proxies/``, one JPEG per frame named
+after the frame's file, so they are matched to frames by name like the
+ones an extraction writes to ``low_frames/``.
+"""
+import os
+from pathlib import Path
+
+import cv2
+
+from utils.frame_source import FrameSource
+from utils.mipmaps import decode_for_level, level_size
+
+PROXY_MAX_DIM = 320
+GENERATED_PROXY_DIR_NAME = ".proxies"
+
+
+def generated_proxy_dir(frames_dir: Path) -> Path:
+    return frames_dir / GENERATED_PROXY_DIR_NAME
+
+
+def generated_proxy_path(frames_dir: Path, frame_file: Path) -> Path:
+    return generated_proxy_dir(frames_dir) / f"{frame_file.stem}.jpg"
+
+
+def write_proxy(frames: FrameSource, idx: int, target: Path) -> bool:
+    """Write frame ``idx`` scaled to ``PROXY_MAX_DIM`` as a JPEG at ``target``; False if it did not decode."""
+    frame = decode_for_level(frames, idx, PROXY_MAX_DIM)
+    if frame is None:
+        return False
+    h, w = frame.shape[:2]
+    resized = cv2.resize(frame, level_size(w, h, PROXY_MAX_DIM), interpolation=cv2.INTER_AREA)
+    ok, encoded = cv2.imencode(".jpg", resized)
+    if not ok:
+        return False
+    tmp_path = target.with_name(target.name + ".part")
+    tmp_path.write_bytes(encoded.tobytes())
+    os.replace(tmp_path, target)
+    return True
@@ -0,0 +1,195 @@
+"""Single-file proxy atlas: every proxy frame as raw RGB888 rows at a fixed stride.
+
+Layout (little endian)::
+
+    magic "DTATLAS1" | version u16 | pixel format u16 | frame count u32
+    width u32 | height u32 | stride u32 | data offset u32 | padding to 64 bytes
+    frame 0 rows | frame 1 rows | ...
+
+Frame ``i`` starts at ``data_offset + i * stride * height``. Strides are
+4-byte aligned so readers can wrap a frame in an image without copying it.
+"""
+import mmap
+import os
+import struct
+from pathlib import Path
+
+ATLAS_FILE_NAME = "low_frames.atlas"
+FORMAT_RGB888 = 1
+
+_MAGIC = b"DTATLAS1"
+_VERSION = 1
+_HEADER = struct.Struct("<8sHHIIIII")
+_DATA_OFFSET = 64
+
+
+def atlas_stride(width: int) -> int:
+    return (width * 3 + 3) & ~3
+
+
+class ProxyAtlasWriter:
+    """Appends RGB888 frames to ``<path>.tmp`` and renames it into place on ``close``.
+
+    With ``reserve_frames`` the file is pre-sized for that many frames, which
+    other processes can fill in any order through ``ProxyAtlasSlotWriter``.
+    ``resume_frames`` reopens the ``.tmp`` left by an interrupted run instead
+    of starting over: appending continues after that many frames, and a
+    reserved file is kept as is. Raises ValueError if it is too short.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        width: int,
+        height: int,
+        reserve_frames: int = 0,
+        resume_frames: int | None = None,
+    ):
+        self._path = Path(path)
+        self.tmp_path = self._path.with_name(self._path.name + ".tmp")
+        self._width = width
+        self._height = height
+        self._stride = atlas_stride(width)
+        self._count = 0
+        frame_bytes = self._stride * height
+        if resume_frames is not None:
+            self._file = open(self.tmp_path, "r+b")
+            kept_frames = max(reserve_frames, resume_frames)
+            if self._file.seek(0, os.SEEK_END) < _DATA_OFFSET + kept_frames * frame_bytes:
+                self._file.close()
+                raise ValueError(f"cannot resume {self.tmp_path}: too short")
+            if reserve_frames == 0:
+                self._file.truncate(_DATA_OFFSET + resume_frames * frame_bytes)
+                self._file.seek(0, os.SEEK_END)
+                self._count = resume_frames
+            return
+
+        self._file = open(self.tmp_path, "wb")
+        self._file.write(b"\0" * _DATA_OFFSET)
+        if reserve_frames > 0:
+            self._file.truncate(_DATA_OFFSET + reserve_frames * frame_bytes)
+
+    @property
+    def size(self) -> tuple[int, int]:
+        return self._width, self._height
+
+    def append(self, rgb_rows: bytes | memoryview) -> None:
+        """Write one frame given as ``height`` packed rows of ``width * 3`` bytes."""
+        _write_rows(self._file, rgb_rows, self._width, self._height, self._stride)
+        self._count += 1
+
+    def flush(self) -> None:
+        """Make appended frames durable, e.g. before recording a checkpoint."""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self, frame_count: int | None = None) -> None:
+        """Finish the atlas; pass ``frame_count`` when frames were written into reserved slots."""
+        count = self._count if frame_count is None else frame_count
+        self._file.truncate(_DATA_OFFSET + count * self._stride * self._height)
+        self._file.seek(0)
+        self._file.write(
+            _HEADER.pack(
+                _MAGIC, _VERSION, FORMAT_RGB888, count,
+                self._width, self._height, self._stride, _DATA_OFFSET,
+            )
+        )
+        self._file.close()
+        os.replace(self.tmp_path, self._path)
+
+    def abort(self) -> None:
+        self._file.close()
+        self.tmp_path.unlink(missing_ok=True)
+
+
+class ProxyAtlasSlotWriter:
+    """Writes frames at their final positions in an atlas reserved by a ProxyAtlasWriter."""
+
+    def __init__(self, tmp_path: str | Path, width: int, height: int):
+        self._width = width
+        self._height = height
+        self._stride = atlas_stride(width)
+        self._file = open(tmp_path, "r+b")
+
+    def write(self, idx: int, rgb_rows: bytes | memoryview) -> None:
+        self._file.seek(_DATA_OFFSET + idx * self._stride * self._height)
+        _write_rows(self._file, rgb_rows, self._width, self._height, self._stride)
+
+    def close(self) -> None:
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+
+
+def _write_rows(file, rgb_rows: bytes | memoryview, width: int, height: int, stride: int) -> None:
+    row_bytes = width * 3
+    data = memoryview(rgb_rows).cast("B")
+    if len(data) != row_bytes * height:
+        raise ValueError("frame does not match the atlas size")
+    if stride == row_bytes:
+        file.write(data)
+        return
+    padding = b"\0" * (stride - row_bytes)
+    for y in range(height):
+        file.write(data[y * row_bytes : (y + 1) * row_bytes])
+        file.write(padding)
+
+
+class ProxyAtlas:
+    """Read-only memory map of an atlas file.
+
+    ``frame_view`` slices the map without copying. The map stays open for as
+    long as this object (or anything holding a view) is referenced.
+    """
+
+    def __init__(self, path: str | Path):
+        with open(path, "rb") as fh:
+            self._map = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            header = _HEADER.unpack_from(self._map, 0)
+        except struct.error as exc:
+            self._map.close()
+            raise ValueError(f"not a proxy atlas: {path}") from exc
+
+        magic, version, pixel_format, count, width, height, stride, data_offset = header
+        frame_bytes = stride * height
+        if (
+            magic != _MAGIC
+            or version != _VERSION
+            or pixel_format != FORMAT_RGB888
+            or stride < width * 3
+            or len(self._map) < data_offset + count * frame_bytes
+        ):
+            self._map.close()
+            raise ValueError(f"not a proxy atlas: {path}")
+
+        self.frame_count = count
+        self.width = width
+        self.height = height
+        self.stride = stride
+        self._data_offset = data_offset
+        self._frame_bytes = frame_bytes
+
+    def frame_view(self, idx: int) -> memoryview:
+        if not 0 <= idx < self.frame_count:
+            raise IndexError(idx)
+        start = self._data_offset + idx * self._frame_bytes
+        return memoryview(self._map)[start : start + self._frame_bytes]
+
+    def close(self) -> None:
+        """Unmap the atlas; it reads as empty afterwards."""
+        self.frame_count = 0
+        try:
+            self._map.close()
+        except BufferError:
+            # A frame view is still exported (e.g. an image on screen); the map is released with the last one.
+            pass
+
+
+def open_proxy_atlas(path: str | Path, expected_frames: int) -> ProxyAtlas | None:
+    """Open ``path`` if it is a valid atlas with ``expected_frames`` frames, else None."""
+    try:
+        atlas = ProxyAtlas(path)
+    except (OSError, ValueError):
+        return None
+    return atlas if atlas.frame_count == expected_frames else None
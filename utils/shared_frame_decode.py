@@ -0,0 +1,38 @@
+"""Child-process side of the process-pool frame decoder.
+
+Kept free of Qt imports so spawned workers start quickly. The parent owns the
+shared memory block (it knows the size from the image header); workers only
+attach, decode straight into it as packed RGB888 rows and detach. Frames
+packed in an archive are read by offset, so only the path crosses processes.
+"""
+from multiprocessing.shared_memory import SharedMemory
+
+import cv2
+import numpy as np
+
+_READ_FLAGS = cv2.IMREAD_COLOR | cv2.IMREAD_IGNORE_ORIENTATION
+
+
+def decode_into_shared_memory(
+    path: str, shm_name: str, width: int, height: int, stride: int, offset: int = 0, length: int = 0
+) -> bool:
+    """Decode ``path`` (or ``length`` bytes at ``offset`` inside it) into the named block."""
+    if length > 0:
+        with open(path, "rb") as fh:
+            fh.seek(offset)
+            encoded = np.frombuffer(fh.read(length), dtype=np.uint8)
+        frame = cv2.imdecode(encoded, _READ_FLAGS)
+    else:
+        frame = cv2.imread(path, _READ_FLAGS)
+    if frame is None or frame.shape[0] != height or frame.shape[1] != width:
+        return False
+
+    shm = SharedMemory(name=shm_name)
+    try:
+        rows = np.ndarray((height, stride), dtype=np.uint8, buffer=shm.buf)
+        pixels = rows[:, : width * 3].reshape(height, width, 3)
+        cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=pixels)
+        del pixels, rows
+    finally:
+        shm.close()
+    return True
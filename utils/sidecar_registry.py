@@ -0,0 +1,132 @@
+"""Shared lookup of the sidecar JSON that describes a frames folder.
+
+A sidecar (``<video>.dance_tracker.json``, or any ``*.json`` next to the
+frames folder with a ``frames`` entry) is found by listing the folder's
+parent and matching the resolved ``frames`` path. The listing is cached
+per directory and reused while the directory's mtime is unchanged; parsed
+sidecars are cached per file and reused while the file's size and mtime are
+unchanged. Bookmark operations, proxy lookup and video resolution therefore
+cost a few ``stat`` calls instead of a glob plus a JSON parse of every
+candidate. Other JSON files met on the way (e.g. a legacy
+``detections.json``) are only remembered as not being sidecars; their
+payload is never kept.
+
+Payloads returned here are shared; callers that modify one take a copy.
+"""
+import json
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+
+SIDECAR_SUFFIX = ".dance_tracker.json"
+
+
+@dataclass(frozen=True)
+class _Sidecar:
+    size: int
+    mtime_ns: int
+    payload: dict | None
+    frames: Path | None
+    # The file is not a sidecar and its payload was not kept; read it again if needed.
+    dropped: bool = False
+
+
+_lock = threading.Lock()
+_listings: dict[Path, tuple[int, list[str]]] = {}
+_sidecars: dict[Path, _Sidecar] = {}
+
+
+def find_sidecar(frames_folder: Path, suffix: str = ".json") -> tuple[Path, dict] | None:
+    """(path, payload) of the first sidecar by name whose ``frames`` entry is ``frames_folder``."""
+    parent = frames_folder.parent
+    target = frames_folder.resolve()
+    for name in _json_names(parent):
+        if not name.endswith(suffix):
+            continue
+        path = parent / name
+        sidecar = _sidecar(path, need_payload=False)
+        if sidecar is not None and sidecar.frames == target:
+            return path, sidecar.payload
+    return None
+
+
+def read_sidecar(path: Path) -> dict | None:
+    """Parsed ``path`` if it holds a JSON object, from the cache while the file is unchanged."""
+    sidecar = _sidecar(path)
+    return sidecar.payload if sidecar is not None else None
+
+
+def remember_sidecar(path: Path, payload: dict) -> None:
+    """Record a payload just written to ``path`` so the next read does not parse it back."""
+    try:
+        stat = path.stat()
+    except OSError:
+        return
+    frames = resolve_sidecar_path(payload.get("frames") or payload.get("frames_path"), path.parent)
+    with _lock:
+        _sidecars[path] = _Sidecar(stat.st_size, stat.st_mtime_ns, payload, frames)
+
+
+def resolve_sidecar_path(value: object, root: Path) -> Path | None:
+    """A path stored in a sidecar: absolute as written, relative to the sidecar's folder otherwise."""
+    if not isinstance(value, str) or not value.strip():
+        return None
+    candidate = Path(value).expanduser()
+    if not candidate.is_absolute():
+        candidate = (root / candidate).resolve()
+    return candidate
+
+
+def _json_names(directory: Path) -> list[str]:
+    try:
+        mtime_ns = directory.stat().st_mtime_ns
+    except OSError:
+        return []
+    with _lock:
+        cached = _listings.get(directory)
+    if cached is not None and cached[0] == mtime_ns:
+        return cached[1]
+
+    try:
+        with os.scandir(directory) as listing:
+            names = sorted(item.name for item in listing if item.name.lower().endswith(".json") and item.is_file())
+    except OSError:
+        return []
+    with _lock:
+        _listings[directory] = (mtime_ns, names)
+    return names
+
+
+def _sidecar(path: Path, need_payload: bool = True) -> _Sidecar | None:
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    with _lock:
+        cached = _sidecars.get(path)
+    if (
+        cached is not None
+        and (cached.size, cached.mtime_ns) == (stat.st_size, stat.st_mtime_ns)
+        and not (cached.dropped and need_payload)
+    ):
+        return cached
+
+    try:
+        payload = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, UnicodeDecodeError, json.JSONDecodeError):
+        payload = None
+    if not isinstance(payload, dict):
+        payload = None
+    frames = None
+    if payload is not None:
+        frames = resolve_sidecar_path(payload.get("frames") or payload.get("frames_path"), path.parent)
+    sidecar = _Sidecar(stat.st_size, stat.st_mtime_ns, payload, frames)
+    if frames is None and not path.name.endswith(SIDECAR_SUFFIX):
+        # Not a sidecar: possibly a large unrelated JSON that must not stay in memory.
+        cached = _Sidecar(stat.st_size, stat.st_mtime_ns, None, None, dropped=True)
+    else:
+        cached = sidecar
+    with _lock:
+        _sidecars[path] = cached
+    return sidecar
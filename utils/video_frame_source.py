@@ -0,0 +1,302 @@
+"""Random-access frames decoded straight from a video file.
+
+The keyframe/PTS index is built once with a demux-only pass (packets are read
+but not decoded) and persisted next to the video, so later opens skip the scan.
+
+Index layout (little endian)::
+
+    magic "DTVINDEX" | version u16 | video size u64 | video mtime ns i64 | fps f64
+    width u32 | height u32 | frame count u32 | keyframe count u32
+    keyframes: keyframe count x u32 | pts: frame count x f64 (milliseconds)
+"""
+import bisect
+import os
+import struct
+import threading
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+VIDEO_INDEX_SUFFIX = ".frame_index"
+
+_MAGIC = b"DTVINDEX"
+_VERSION = 1
+_HEADER = struct.Struct("<8sHQqdIIII")
+
+
+@dataclass
+class VideoFrameIndex:
+    video_size: int
+    video_mtime_ns: int
+    fps: float
+    width: int
+    height: int
+    keyframes: array
+    pts_ms: array
+
+    @property
+    def frame_count(self) -> int:
+        return len(self.pts_ms)
+
+    def keyframe_before(self, idx: int) -> int:
+        """The last keyframe at or before ``idx`` (decoding can start there)."""
+        pos = bisect.bisect_right(self.keyframes, idx)
+        return self.keyframes[pos - 1] if pos > 0 else 0
+
+    def matches(self, video_path: Path) -> bool:
+        stat = video_path.stat()
+        return stat.st_size == self.video_size and stat.st_mtime_ns == self.video_mtime_ns
+
+
+def video_index_path(video_path: str | Path) -> Path:
+    return Path(video_path).with_suffix(VIDEO_INDEX_SUFFIX)
+
+
+def build_video_index(video_path: str | Path) -> VideoFrameIndex:
+    """Scan ``video_path`` for frame timestamps and keyframes without decoding pixels.
+
+    Backends without raw packet access fall back to the container's frame count
+    and treat every frame as seekable, leaving seeking to the backend.
+    """
+    video_path = Path(video_path)
+    stat = video_path.stat()
+    capture = cv2.VideoCapture(str(video_path))
+    try:
+        if not capture.isOpened():
+            raise ValueError(f"cannot open video: {video_path}")
+        fps = float(capture.get(cv2.CAP_PROP_FPS)) or 30.0
+        width = int(capture.get(cv2.CAP_PROP_FRAME_WIDTH))
+        height = int(capture.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        keyframes = array("I")
+        pts_ms = array("d")
+
+        if capture.set(cv2.CAP_PROP_FORMAT, -1):
+            while capture.grab():
+                if capture.get(cv2.CAP_PROP_LRF_HAS_KEY_FRAME):
+                    keyframes.append(len(pts_ms))
+                pts_ms.append(capture.get(cv2.CAP_PROP_POS_MSEC))
+        else:
+            count = max(0, int(capture.get(cv2.CAP_PROP_FRAME_COUNT)))
+            keyframes.extend(range(count))
+            pts_ms.extend(i * 1000.0 / fps for i in range(count))
+    finally:
+        capture.release()
+
+    if not pts_ms or width <= 0 or height <= 0:
+        raise ValueError(f"no frames in video: {video_path}")
+    if not keyframes or keyframes[0] != 0:
+        keyframes.insert(0, 0)
+    return VideoFrameIndex(stat.st_size, stat.st_mtime_ns, fps, width, height, keyframes, pts_ms)
+
+
+def read_video_index(path: str | Path) -> VideoFrameIndex | None:
+    try:
+        data = Path(path).read_bytes()
+        magic, version, size, mtime_ns, fps, width, height, count, key_count = _HEADER.unpack_from(data, 0)
+    except (OSError, struct.error):
+        return None
+    if magic != _MAGIC or version != _VERSION or len(data) != _HEADER.size + key_count * 4 + count * 8:
+        return None
+
+    keyframes = array("I")
+    keyframes.frombytes(data[_HEADER.size : _HEADER.size + key_count * 4])
+    pts_ms = array("d")
+    pts_ms.frombytes(data[_HEADER.size + key_count * 4 :])
+    return VideoFrameIndex(size, mtime_ns, fps, width, height, keyframes, pts_ms)
+
+
+def write_video_index(path: str | Path, index: VideoFrameIndex) -> None:
+    path = Path(path)
+    tmp_path = path.with_name(path.name + ".tmp")
+    header = _HEADER.pack(
+        _MAGIC, _VERSION, index.video_size, index.video_mtime_ns, index.fps,
+        index.width, index.height, index.frame_count, len(index.keyframes),
+    )
+    with open(tmp_path, "wb") as fh:
+        fh.write(header)
+        fh.write(index.keyframes.tobytes())
+        fh.write(index.pts_ms.tobytes())
+    os.replace(tmp_path, path)
+
+
+def load_video_index(video_path: str | Path) -> VideoFrameIndex:
+    """Read the persisted index if it still matches the video, else rebuild and save it."""
+    video_path = Path(video_path)
+    index_path = video_index_path(video_path)
+    index = read_video_index(index_path)
+    if index is not None and index.matches(video_path):
+        return index
+
+    index = build_video_index(video_path)
+    try:
+        write_video_index(index_path, index)
+    except OSError:
+        pass
+    return index
+
+
+class VideoFrameSource:
+    """Decodes frames from a video on demand (BGR arrays).
+
+    A request seeks to the nearest keyframe at or before the target, unless the
+    capture can reach it by decoding forward, and keeps up to
+    ``BUFFER_FRAMES // 2`` frames before it. After each request a background
+    thread decodes ``DECODE_AHEAD`` frames past it, so sequential playback
+    mostly hits the buffer.
+    """
+
+    DECODE_AHEAD = 6
+    BUFFER_MB = 128
+    BUFFER_FRAMES = 32
+
+    def __init__(self, video_path: str | Path, index: VideoFrameIndex | None = None):
+        self.path = Path(video_path)
+        self.index = index or load_video_index(self.path)
+        self._capture = cv2.VideoCapture(str(self.path))
+        if not self._capture.isOpened():
+            raise ValueError(f"cannot open video: {self.path}")
+
+        frame_bytes = max(1, self.index.width * self.index.height * 3)
+        self._buffer_limit = max(
+            self.DECODE_AHEAD * 2, min(self.BUFFER_FRAMES, self.BUFFER_MB * 1024 * 1024 // frame_bytes)
+        )
+        self._buffer: OrderedDict[int, np.ndarray] = OrderedDict()
+        self._next_pos = 0
+        self._ahead_from = 0
+        self._requests = 0
+        self._closed = False
+        self._capture_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._wake = threading.Condition(self._lock)
+        self._ahead_thread = threading.Thread(target=self._decode_ahead, daemon=True)
+        self._ahead_thread.start()
+
+    def __len__(self) -> int:
+        return self.index.frame_count
+
+    def file_path(self, idx: int) -> Path | None:
+        return None
+
+    def file_span(self, idx: int) -> tuple[Path, int, int] | None:
+        return None
+
+    def decoded_frame(self, idx: int) -> np.ndarray | None:
+        return self.read_frame(idx)
+
+    def read_bytes(self, idx: int) -> bytes:
+        frame = self.read_frame(idx)
+        if frame is None:
+            return b""
+        ok, encoded = cv2.imencode(".jpg", frame)
+        return encoded.tobytes() if ok else b""
+
+    def image_size(self, idx: int) -> tuple[int, int] | None:
+        return self.index.width, self.index.height
+
+    def frame_file(self, idx: int, scratch_dir: Path) -> Path:
+        target = scratch_dir / f"frame_{idx:06d}.jpg"
+        if not target.is_file():
+            scratch_dir.mkdir(parents=True, exist_ok=True)
+            target.write_bytes(self.read_bytes(idx))
+        return target
+
+    def timestamp_ms(self, idx: int) -> float:
+        return self.index.pts_ms[idx]
+
+    def read_frame(self, idx: int) -> np.ndarray | None:
+        if not 0 <= idx < len(self):
+            return None
+
+        with self._lock:
+            frame = self._buffer.get(idx)
+            if frame is not None:
+                self._buffer.move_to_end(idx)
+                self._request_ahead(idx)
+                return frame
+            self._requests += 1
+
+        try:
+            with self._capture_lock:
+                with self._lock:
+                    frame = self._buffer.get(idx)
+                if frame is None and not self._closed:
+                    frame = self._decode(idx)
+        finally:
+            with self._lock:
+                self._requests -= 1
+                if frame is not None:
+                    self._request_ahead(idx)
+                self._wake.notify_all()
+        return frame
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            self._buffer.clear()
+            self._wake.notify_all()
+        self._ahead_thread.join(timeout=0.5)
+        with self._capture_lock:
+            self._capture.release()
+
+    def _request_ahead(self, idx: int) -> None:
+        self._ahead_from = idx + 1
+        self._wake.notify_all()
+
+    def _next_missing_ahead(self) -> int | None:
+        end = min(len(self), self._ahead_from + self.DECODE_AHEAD)
+        for idx in range(self._ahead_from, end):
+            if idx not in self._buffer:
+                return idx
+        return None
+
+    def _decode_ahead(self) -> None:
+        while True:
+            with self._lock:
+                while not self._closed and (self._requests > 0 or self._next_missing_ahead() is None):
+                    self._wake.wait()
+                if self._closed:
+                    return
+                target = self._next_missing_ahead()
+
+            with self._capture_lock:
+                if self._closed or self._requests > 0:
+                    continue
+                if self._decode(target) is None:
+                    with self._lock:
+                        self._ahead_from = len(self)
+
+    def _decode(self, idx: int) -> np.ndarray | None:
+        """Decode frame ``idx``; the caller holds the capture lock."""
+        keyframe = self.index.keyframe_before(idx)
+        if idx < self._next_pos or keyframe > self._next_pos:
+            if not self._capture.set(cv2.CAP_PROP_POS_FRAMES, keyframe):
+                self._next_pos = len(self)
+                return None
+            self._next_pos = keyframe
+
+        keep_from = idx - self._buffer_limit // 2
+        frame = None
+        while self._next_pos <= idx:
+            pos = self._next_pos
+            if pos < keep_from:
+                ok, frame = self._capture.grab(), None
+            else:
+                ok, frame = self._capture.read()
+            if not ok:
+                self._next_pos = len(self)
+                return None
+            self._next_pos += 1
+            if frame is not None:
+                self._store(pos, frame)
+        return frame
+
+    def _store(self, idx: int, frame: np.ndarray) -> None:
+        with self._lock:
+            self._buffer[idx] = frame
+            self._buffer.move_to_end(idx)
+            while len(self._buffer) > self._buffer_limit:
+                self._buffer.popitem(last=False)